@@ -1,11 +1,17 @@
 from sklearn.feature_extraction.text import TfidfVectorizer
 from sklearn.metrics.pairwise import cosine_similarity
+from scipy.sparse import csr_matrix
+from collections import Counter
 import numpy as np
 from typing import Dict, List
+import math
 import logging
+from algorithms.tfidf_model import TfidfModel, VECTORIZER_PARAMS
+from algorithms.scoring_engine import (ResumeFeatures, ScoringEngine, RECOMMENDATIONS, EDUCATION_MATCHES,
+                                       extract_years, section_mask, education_mask)
 class ATSScorer:
     """Advanced ATS scoring algorithm with multiple scoring factors"""
-    def __init__(self):
+    def __init__(self, tfidf_model: TfidfModel = None):
         self.weights = {
             'skills_match': 0.35,
             'keyword_density': 0.25,
@@ -13,52 +19,95 @@ class ATSScorer:
             'education_match': 0.10,
             'format_score': 0.10
         }
-        self.vectorizer = TfidfVectorizer(
-            ngram_range=(1, 3),
-            stop_words='english',
-            max_features=5000,
-            lowercase=True,
-            token_pattern=r'\b[a-zA-Z]{2,}\b'
-        )
+        self.vectorizer = TfidfVectorizer(max_features=5000, **VECTORIZER_PARAMS)
+        # Corpus-fitted vocabulary and IDF; without it each pair is fitted on its own
+        self.tfidf_model = tfidf_model
+        self.engine = ScoringEngine(self.weights)
     def calculate_ats_score(self, resume_data: Dict, job_data: Dict) -> Dict:
         """Calculate comprehensive ATS score"""
         try:
-            scores = {}
-            # Skills matching score
-            scores['skills_match'] = self._calculate_skills_match(
-                resume_data.get('skills', []),
-                job_data.get('skills', [])
-            )
             # Keyword density score
-            scores['keyword_density'] = self._calculate_keyword_density(
+            keyword_density = self._calculate_keyword_density(
                 resume_data.get('text', ''),
-                job_data.get('description', '')
-            )
-            # Experience matching score
-            scores['experience_match'] = self._calculate_experience_match(
-                resume_data.get('experience', []),
-                job_data.get('min_experience', 0)
-            )
-            # Education matching score
-            scores['education_match'] = self._calculate_education_match(
-                resume_data.get('education', []),
-                job_data.get('required_education', [])
-            )
-            # Format score (ATS readability)
-            scores['format_score'] = self._calculate_format_score(resume_data.get('text', ''))
-            # Calculate weighted total score
-            total_score = sum(
-                scores[component] * self.weights[component]
-                for component in scores.keys()
+                job_data.get('description', ''),
+                job_data.get('tfidf_vector'),
+                job_data.get('terms')
             )
-            return {
-                'total_score': round(total_score * 100, 2),
-                'component_scores': {k: round(v * 100, 2) for k, v in scores.items()},
-                'recommendations': self._generate_recommendations(scores)
-            }
+            scores = self._calculate_component_scores(resume_data, job_data, keyword_density)
+            return self._build_result(scores)
         except Exception as e:
             logging.error(f"Error calculating ATS score: {e}")
             return {'total_score': 0, 'component_scores': {}, 'recommendations': []}
+    def rank_many(self, resumes: List[Dict], job_data: Dict) -> List[Dict]:
+        """Score many resumes against one job and return them ranked by total score
+
+        The components of all resumes are computed as arrays by the scoring
+        engine; resumes it cannot reduce to features are scored one by one.
+        """
+        densities = self._calculate_keyword_density_many(
+            [resume.get('text', '') for resume in resumes],
+            job_data.get('description', ''),
+            job_data.get('tfidf_vector'),
+            job_data.get('terms')
+        )
+        features = ResumeFeatures.from_resumes(resumes)
+        try:
+            results = self.engine.results(self.engine.score(features, job_data, densities))
+            failed = np.flatnonzero(features.failed).tolist()
+        except Exception as e:
+            logging.error(f"Error calculating batch ATS scores, scoring resumes one by one: {e}")
+            results = [None] * len(resumes)
+            failed = range(len(resumes))
+        for index in failed:
+            try:
+                scores = self._calculate_component_scores(resumes[index], job_data, float(densities[index]))
+                results[index] = self._build_result(scores)
+            except Exception as e:
+                logging.error(f"Error calculating ATS score for resume {index}: {e}")
+                results[index] = {'total_score': 0, 'component_scores': {}, 'recommendations': []}
+        rankings = []
+        for index, (resume_data, result) in enumerate(zip(resumes, results)):
+            result['index'] = index
+            result['resume_id'] = resume_data.get('id')
+            rankings.append(result)
+        rankings.sort(key=lambda result: result['total_score'], reverse=True)
+        for rank, result in enumerate(rankings, 1):
+            result['rank'] = rank
+        return rankings
+    def _calculate_component_scores(self, resume_data: Dict, job_data: Dict, keyword_density: float) -> Dict[str, float]:
+        """Calculate every component score given a precomputed keyword density"""
+        scores = {}
+        # Skills matching score
+        scores['skills_match'] = self._calculate_skills_match(
+            resume_data.get('skills', []),
+            job_data.get('skills', [])
+        )
+        scores['keyword_density'] = keyword_density
+        # Experience matching score
+        scores['experience_match'] = self._calculate_experience_match(
+            resume_data.get('experience', []),
+            job_data.get('min_experience', 0)
+        )
+        # Education matching score
+        scores['education_match'] = self._calculate_education_match(
+            resume_data.get('education', []),
+            job_data.get('required_education', [])
+        )
+        # Format score (ATS readability)
+        scores['format_score'] = self._calculate_format_score(resume_data.get('text', ''))
+        return scores
+    def _build_result(self, scores: Dict[str, float]) -> Dict:
+        """Combine component scores into the weighted total and recommendations"""
+        # Calculate weighted total score
+        total_score = sum(
+            scores[component] * self.weights[component]
+            for component in scores.keys()
+        )
+        return {
+            'total_score': round(total_score * 100, 2),
+            'component_scores': {k: round(v * 100, 2) for k, v in scores.items()},
+            'recommendations': self._generate_recommendations(scores)
+        }
     def _calculate_skills_match(self, resume_skills: List[str], job_skills: List[str]) -> float:
         """Calculate skills matching score"""
         if not job_skills:
@@ -67,11 +116,18 @@ class ATSScorer:
         job_skills_lower = [skill.lower() for skill in job_skills]
         matched_skills = set(resume_skills_lower) & set(job_skills_lower)
         return len(matched_skills) / len(job_skills_lower)
-    def _calculate_keyword_density(self, resume_text: str, job_description: str) -> float:
-        """Calculate keyword density using TF-IDF"""
+    def _calculate_keyword_density(self, resume_text: str, job_description: str, job_vector=None,
+                                   job_terms: Dict[str, int] = None) -> float:
+        """Calculate keyword density using TF-IDF, from a job profile's vector or term counts when given"""
         if not resume_text or not job_description:
             return 0.0
         try:
+            if self.tfidf_model is not None:
+                if job_vector is not None:
+                    return float(self.tfidf_model.similarity_to([resume_text], job_vector)[0])
+                return float(self.tfidf_model.similarity([resume_text], job_description)[0])
+            if job_terms is not None:
+                return float(self._calculate_keyword_density_many([resume_text], job_description, job_terms=job_terms)[0])
             documents = [resume_text, job_description]
             tfidf_matrix = self.vectorizer.fit_transform(documents)
             similarity = cosine_similarity(tfidf_matrix[0], tfidf_matrix[1])[0][0]
@@ -79,15 +135,60 @@ class ATSScorer:
         except Exception as e:
             logging.error(f"Error calculating keyword density: {e}")
             return 0.0
+    def _calculate_keyword_density_many(self, resume_texts: List[str], job_description: str, job_vector=None,
+                                        job_terms: Dict[str, int] = None) -> np.ndarray:
+        """Keyword density of many resumes against one job description
+
+        With a corpus model every resume is transformed as one sparse matrix.
+        Otherwise the result matches fitting the vectorizer on each (resume, job) pair: with two
+        documents a term shared by both has IDF 1 and any other term IDF
+        ln(3/2) + 1, so every pairwise cosine follows from raw term counts.
+        The job is analyzed once and all resumes are projected onto its terms
+        as one sparse matrix. A job profile supplies the job's transformed
+        vector or analyzed term counts, so the description is not analyzed again.
+        """
+        densities = np.zeros(len(resume_texts))
+        if not resume_texts or not job_description:
+            return densities
+        try:
+            if self.tfidf_model is not None:
+                if job_vector is not None:
+                    return self.tfidf_model.similarity_to(resume_texts, job_vector)
+                return self.tfidf_model.similarity(resume_texts, job_description)
+            analyzer = self.vectorizer.build_analyzer()
+            job_counts = job_terms if job_terms is not None else Counter(analyzer(job_description))
+            if not job_counts:
+                return densities
+            vocabulary = {term: column for column, term in enumerate(job_counts)}
+            job_vector = np.fromiter(job_counts.values(), dtype=float, count=len(job_counts))
+            resume_squares = np.zeros(len(resume_texts))
+            indptr, indices, data = [0], [], []
+            for row, text in enumerate(resume_texts):
+                counts = Counter(analyzer(text)) if text else {}
+                resume_squares[row] = sum(count * count for count in counts.values())
+                for term, count in counts.items():
+                    column = vocabulary.get(term)
+                    if column is not None:
+                        indices.append(column)
+                        data.append(count)
+                indptr.append(len(indices))
+            shared = csr_matrix((data, indices, indptr), shape=(len(resume_texts), len(vocabulary)), dtype=float)
+            unshared_weight = (math.log(1.5) + 1) ** 2
+            dot = shared @ job_vector
+            resume_norms = unshared_weight * resume_squares - (unshared_weight - 1) * np.asarray(shared.power(2).sum(axis=1)).ravel()
+            job_norms = unshared_weight * float(job_vector @ job_vector) - (unshared_weight - 1) * (shared.sign() @ (job_vector ** 2))
+            norms = np.sqrt(resume_norms * job_norms)
+            np.divide(dot, norms, out=densities, where=norms > 0)
+            return densities
+        except Exception as e:
+            logging.error(f"Error calculating keyword density: {e}")
+            return densities
     def _calculate_experience_match(self, resume_experience: List[str], required_years: int) -> float:
         """Calculate experience matching score"""
         if required_years == 0:
             return 1.0
         # Simple heuristic: count years mentioned in experience
-        total_years = 0
-        for exp in resume_experience:
-            years = self._extract_years_from_text(exp)
-            total_years += years
+        total_years = sum(extract_years(exp) for exp in resume_experience)
         return min(total_years / required_years, 1.0)
     def _calculate_education_match(self, resume_education: List[str], required_education: List[str]) -> float:
         """Calculate education matching score"""
@@ -96,62 +197,18 @@ class ATSScorer:
         if not resume_education:
             return 0.0
         # Simple matching based on keywords
-        education_keywords = ['bachelor', 'master', 'phd', 'degree', 'certification']
-        resume_edu_text = ' '.join(resume_education).lower()
-        matches = sum(1 for keyword in education_keywords if keyword in resume_edu_text)
+        matches = int(EDUCATION_MATCHES[education_mask(resume_education)])
         return min(matches / len(required_education), 1.0)
     def _calculate_format_score(self, resume_text: str) -> float:
         """Calculate format score based on ATS readability"""
         if not resume_text:
             return 0.0
-        score = 0.0
         # Check for proper sections
-        sections = ['experience', 'education', 'skills', 'contact']
-        for section in sections:
-            if section in resume_text.lower():
-                score += 0.25
+        score = 0.25 * bin(section_mask(resume_text)).count('1')
         return min(score, 1.0)
     def _extract_years_from_text(self, text: str) -> int:
         """Extract years of experience from text"""
-        import re
-        year_patterns = [
-            r'(\d+)\s*years?',
-            r'(\d+)\s*yrs?',
-            r'(\d{4})\s*-\s*(\d{4})',
-            r'(\d{4})\s*to\s*(\d{4})'
-        ]
-        total_years = 0
-        for pattern in year_patterns:
-            matches = re.findall(pattern, text.lower())
-            for match in matches:
-                if isinstance(match, tuple):
-                    if len(match) == 2: # Date range
-                        try:
-                            years = int(match[1]) - int(match[0])
-                            total_years += max(0, years)
-                        except ValueError:
-                            continue
-                    else:
-                        try:
-                            total_years += int(match[0])
-                        except ValueError:
-                            continue
-                else:
-                    try:
-                        total_years += int(match)
-                    except ValueError:
-                        continue
-        return total_years
+        return extract_years(text)
     def _generate_recommendations(self, scores: Dict[str, float]) -> List[str]:
         """Generate recommendations based on scores"""
-        recommendations = []
-        if scores['skills_match'] < 0.5:
-            recommendations.append("Add more relevant skills mentioned in the job description.")
-        if scores['keyword_density'] < 0.3:
-            recommendations.append("Include more keywords from the job description in your resume.")
-        if scores['format_score'] < 0.7:
-            recommendations.append("Improve resume structure with clear sections (Experience, Education, Skills, Contact).")
-        if scores['experience_match'] < 0.6:
-            recommendations.append("Highlight more relevant work experience or years of experience.")
-        return recommendations
-
+        return [message for component, threshold, message in RECOMMENDATIONS if scores[component] < threshold]
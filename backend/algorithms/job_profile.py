@@ -0,0 +1,132 @@
+import hashlib
+import re
+from collections import Counter
+import numpy as np
+from scipy.sparse import csr_matrix
+from sklearn.feature_extraction.text import TfidfVectorizer
+from typing import Dict, List, Optional
+from algorithms.tfidf_model import TfidfModel, VECTORIZER_PARAMS
+# Bump when parsing changes, so stored and cached profiles are parsed again
+PARSER_VERSION = '1'
+# "5+ years", "3-5 years", "2 to 4 yrs": the lower bound of each stated requirement
+REQUIRED_YEARS_PATTERN = re.compile(
+    r'(?<![\d.])(?P<years>\d{1,2})\s*\+?\s*(?:(?:-|–|to)\s*\d{1,2}\s*\+?\s*)?(?:years?|yrs?)\b', re.IGNORECASE
+)
+# Degree levels from lowest to highest, each with the EDUCATION_KEYWORDS entry the scorer matches on
+DEGREE_LEVELS = (
+    ('bachelor', re.compile(r"\b(?:bachelor|b\.s\.|b\.sc|b\.tech|undergraduate degree)", re.IGNORECASE)),
+    ('master', re.compile(r"\b(?:master'?s?\s+(?:degree|of|in)|m\.s\.|m\.sc|mba|m\.tech|graduate degree)", re.IGNORECASE)),
+    ('phd', re.compile(r"\b(?:ph\.?\s?d|doctorate|doctoral)", re.IGNORECASE)),
+)
+# Without a named degree, a generic requirement
+OTHER_EDUCATION = (
+    ('degree', re.compile(r"\bdegree\b", re.IGNORECASE)),
+    ('certification', re.compile(r"\bcertifi(?:cation|ed)\b", re.IGNORECASE)),
+)
+_analyzer = TfidfVectorizer(**VECTORIZER_PARAMS).build_analyzer()
+def description_hash(description: str) -> str:
+    """Hash of a job description's text, the key its parsed profile is cached under"""
+    return hashlib.sha256(description.encode('utf-8')).hexdigest()
+def required_years(description: str) -> int:
+    """Years of experience a job description asks for: the largest stated lower bound, 0 if none"""
+    return max((int(match.group('years')) for match in REQUIRED_YEARS_PATTERN.finditer(description)), default=0)
+def education_level(description: str) -> Optional[str]:
+    """Lowest degree a job description accepts ("bachelor's or master's" is bachelor), or a generic requirement"""
+    for level, pattern in DEGREE_LEVELS + OTHER_EDUCATION:
+        if pattern.search(description):
+            return level
+    return None
+class JobProfile:
+    """Everything the ATS scorer reads from a job description, parsed once
+
+    Skills come from the taxonomy scanner, so only real skills count
+    against a resume. The minimum years and education level are read from
+    the text unless a posting sets them. For keyword density the profile
+    holds either the description's row of the corpus TF-IDF model or,
+    without one, its analyzed term counts, so scoring never touches the
+    description again.
+    """
+    def __init__(self, content_hash: str, description: str, skills: List[str], min_experience: int,
+                 education_level: Optional[str], required_education: Optional[List[str]] = None,
+                 terms: Optional[Dict[str, int]] = None, tfidf_vector: Optional[csr_matrix] = None,
+                 version: str = '', job_id: Optional[str] = None, title: Optional[str] = None):
+        self.content_hash = content_hash
+        self.description = description
+        self.skills = skills
+        self.min_experience = min_experience
+        self.education_level = education_level
+        self.required_education = required_education if required_education is not None else (
+            [education_level] if education_level else []
+        )
+        self.terms = terms
+        self.tfidf_vector = tfidf_vector
+        self.version = version
+        self.job_id = job_id
+        self.title = title
+    @classmethod
+    def parse(cls, description: str, scanner, tfidf_model: Optional[TfidfModel] = None,
+              version: str = '') -> 'JobProfile':
+        """Profile of a job description, with skills found by scanner"""
+        if tfidf_model is not None:
+            terms, tfidf_vector = None, tfidf_model.transform([description])
+        else:
+            terms, tfidf_vector = dict(Counter(_analyzer(description))), None
+        return cls(
+            description_hash(description), description, scanner.find_skills(description),
+            required_years(description), education_level(description),
+            terms=terms, tfidf_vector=tfidf_vector, version=version
+        )
+    def for_posting(self, job_id: str, title: Optional[str] = None, min_experience: Optional[int] = None,
+                    required_education: Optional[List[str]] = None) -> 'JobProfile':
+        """This profile as a registered posting, with the requirements the posting sets itself"""
+        return JobProfile(
+            self.content_hash, self.description, self.skills,
+            self.min_experience if min_experience is None else min_experience,
+            self.education_level, self.required_education if required_education is None else required_education,
+            terms=self.terms, tfidf_vector=self.tfidf_vector, version=self.version, job_id=job_id, title=title
+        )
+    def job_data(self, min_experience: Optional[int] = None, required_education: Optional[List[str]] = None) -> Dict:
+        """job_data for the ATS scorer; requirements given here replace the parsed ones"""
+        return {
+            'id': self.job_id,
+            'description': self.description,
+            'skills': self.skills,
+            'min_experience': self.min_experience if min_experience is None else min_experience,
+            'required_education': self.required_education if required_education is None else required_education,
+            'terms': self.terms,
+            'tfidf_vector': self.tfidf_vector
+        }
+    def summary(self) -> Dict:
+        """The parsed requirements, as the API reports them"""
+        return {
+            'job_id': self.job_id,
+            'title': self.title,
+            'content_hash': self.content_hash,
+            'skills': self.skills,
+            'min_experience': self.min_experience,
+            'education_level': self.education_level,
+            'required_education': self.required_education,
+            'terms': len(self.terms) if self.terms is not None else None,
+            'tfidf_terms': self.tfidf_vector.nnz if self.tfidf_vector is not None else None,
+            'version': self.version
+        }
+    def to_dict(self) -> Dict:
+        """JSON-serializable form, for storage"""
+        document = {key: value for key, value in vars(self).items() if key != 'tfidf_vector'}
+        if self.tfidf_vector is not None:
+            document['tfidf_vector'] = {
+                'size': self.tfidf_vector.shape[1],
+                'indices': self.tfidf_vector.indices.tolist(),
+                'data': self.tfidf_vector.data.tolist()
+            }
+        return document
+    @classmethod
+    def from_dict(cls, document: Dict) -> 'JobProfile':
+        document = dict(document)
+        vector = document.pop('tfidf_vector', None)
+        if vector is not None:
+            indices = np.asarray(vector['indices'], dtype=np.int32)
+            document['tfidf_vector'] = csr_matrix(
+                (np.asarray(vector['data']), indices, np.array([0, len(indices)])), shape=(1, vector['size'])
+            )
+        return cls(**document)
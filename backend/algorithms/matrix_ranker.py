@@ -0,0 +1,377 @@
+import argparse
+import csv
+import io
+import json
+import logging
+import math
+import multiprocessing
+import os
+import sys
+from collections import Counter, deque
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+from scipy.sparse import csr_matrix, vstack
+from sklearn.feature_extraction.text import TfidfVectorizer
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence
+from algorithms.scoring_engine import COMPONENTS, EDUCATION_MATCHES, SECTION_SCORES, ResumeFeatures
+from algorithms.tfidf_model import TfidfModel, VECTORIZER_PARAMS
+# IDF of a term in only one document of a (resume, job) pair, squared; see ATSScorer._calculate_keyword_density_many
+UNSHARED_WEIGHT = (math.log(1.5) + 1) ** 2
+FORMATS = ('jsonl', 'csv')
+CSV_FIELDS = ('by', 'job_id', 'resume_id', 'rank', 'total_score') + COMPONENTS
+def job_data_from(record: Dict) -> Dict:
+    """Scorer job data of a job record, keeping the TF-IDF vector or term counts of a job profile"""
+    return {
+        'id': str(record.get('id', '')),
+        'description': record.get('description') or record.get('job_description') or '',
+        'skills': record.get('skills') or [],
+        'min_experience': record.get('min_experience') or 0,
+        'required_education': record.get('required_education') or [],
+        'terms': record.get('terms'),
+        'tfidf_vector': record.get('tfidf_vector')
+    }
+def profile_jobs(records: Iterable[Dict], scanner, tfidf_model: Optional[TfidfModel] = None) -> List[Dict]:
+    """Job records with what their descriptions ask for filled in where a record does not set it"""
+    from algorithms.job_profile import JobProfile
+    jobs = []
+    for record in records:
+        description = record.get('description') or record.get('job_description') or ''
+        profile = JobProfile.parse(description, scanner, tfidf_model).job_data()
+        profile.pop('id')
+        jobs.append({**profile, **{key: value for key, value in record.items() if value not in (None, [], '')}})
+    return jobs
+def load_scanner(skills_file: str):
+    """Skill scanner over the taxonomy in skills_file"""
+    from data_structures.skill_trie import SkillTrie
+    trie = SkillTrie()
+    trie.load_skills_from_file(skills_file, strict=True)
+    return trie.scanner()
+def _binary_rows(rows: Iterable[Iterable[int]], columns: int) -> csr_matrix:
+    indptr, indices = [0], []
+    for row in rows:
+        indices.extend(row)
+        indptr.append(len(indices))
+    return csr_matrix(
+        (np.ones(len(indices), dtype=np.int32), np.asarray(indices, dtype=np.int32), np.asarray(indptr, dtype=np.int64)),
+        shape=(len(indptr) - 1, columns)
+    )
+class JobMatrix:
+    """Columnar form of M jobs, prepared once and reused for every block of resumes
+
+    Holds the lowercased job skill vocabulary with a job x skill membership
+    matrix, the experience and education requirements as arrays, and the
+    job descriptions either as rows of the corpus TF-IDF model or, without
+    one, as raw term counts from which every pairwise-fitted cosine follows.
+    """
+    def __init__(self, jobs: Sequence[Dict], tfidf_model: Optional[TfidfModel] = None):
+        self.ids = [job['id'] for job in jobs]
+        self.tfidf_model = tfidf_model
+        self.skill_vocabulary = {}
+        skill_rows = [
+            {self.skill_vocabulary.setdefault(skill.lower(), len(self.skill_vocabulary)) for skill in job['skills']}
+            for job in jobs
+        ]
+        # skill x job, so a resume x skill block times it counts matched skills per job
+        self.skills = _binary_rows(skill_rows, len(self.skill_vocabulary)).T.tocsr()
+        self.skill_counts = np.array([len(job['skills']) for job in jobs], dtype=float)
+        self.min_experience = np.array([job['min_experience'] for job in jobs], dtype=float)
+        self.education_counts = np.array([len(job['required_education']) for job in jobs], dtype=float)
+        if tfidf_model is not None:
+            # Profiled jobs carry their rows already
+            vectors = [job.get('tfidf_vector') for job in jobs]
+            if all(vector is not None for vector in vectors):
+                self.queries = vstack(vectors).T.tocsr()
+            else:
+                self.queries = tfidf_model.transform([job['description'] for job in jobs]).T.tocsr()
+            return
+        self.analyzer = TfidfVectorizer(**VECTORIZER_PARAMS).build_analyzer()
+        self.terms = {}
+        indptr, indices, data = [0], [], []
+        for job in jobs:
+            if job.get('terms') is not None:
+                counts = job['terms']
+            else:
+                counts = Counter(self.analyzer(job['description'])) if job['description'] else {}
+            for term, count in counts.items():
+                indices.append(self.terms.setdefault(term, len(self.terms)))
+                data.append(count)
+            indptr.append(len(indices))
+        counts = csr_matrix((data, indices, indptr), shape=(len(jobs), len(self.terms)), dtype=float)
+        # term x job transposes of the counts, their squares and their support
+        self.counts = counts.T.tocsr()
+        self.squared_counts = counts.power(2).T.tocsr()
+        self.term_support = counts.sign().T.tocsr()
+        self.job_squares = np.asarray(counts.power(2).sum(axis=1)).ravel()
+    def __len__(self) -> int:
+        return len(self.ids)
+    def keyword_density(self, texts: List[str]) -> np.ndarray:
+        """resume x job TF-IDF cosine, equal to ATSScorer's keyword density of every pair"""
+        if self.tfidf_model is not None:
+            return (self.tfidf_model.transform(texts) @ self.queries).toarray()
+        resume_squares = np.zeros(len(texts))
+        indptr, indices, data = [0], [], []
+        for row, text in enumerate(texts):
+            counts = Counter(self.analyzer(text)) if text else {}
+            resume_squares[row] = sum(count * count for count in counts.values())
+            for term, count in counts.items():
+                column = self.terms.get(term)
+                if column is not None:
+                    indices.append(column)
+                    data.append(count)
+            indptr.append(len(indices))
+        shared = csr_matrix((data, indices, indptr), shape=(len(texts), len(self.terms)), dtype=float)
+        # Terms in both documents weigh 1 and the rest UNSHARED_WEIGHT, so each norm is a full sum minus the shared part
+        dot = (shared @ self.counts).toarray()
+        shared_resume_squares = (shared.power(2) @ self.term_support).toarray()
+        shared_job_squares = (shared.sign() @ self.squared_counts).toarray()
+        resume_norms = UNSHARED_WEIGHT * resume_squares[:, None] - (UNSHARED_WEIGHT - 1) * shared_resume_squares
+        job_norms = UNSHARED_WEIGHT * self.job_squares[None, :] - (UNSHARED_WEIGHT - 1) * shared_job_squares
+        norms = np.sqrt(resume_norms * job_norms)
+        density = np.zeros_like(dot)
+        np.divide(dot, norms, out=density, where=norms > 0)
+        return density
+def score_block(jobs: JobMatrix, resumes: Sequence[Dict], weights: Dict[str, float]) -> Dict[str, np.ndarray]:
+    """Component scores (0-1) and 'total' of every resume x job pair of a block, as resume x job arrays
+
+    Components are evaluated with the same operations, in the same order,
+    as ScoringEngine; resumes whose data cannot be reduced total -inf.
+    """
+    features = ResumeFeatures.from_resumes(resumes)
+    shape = (len(resumes), len(jobs))
+    scores = {}
+    vocabulary = jobs.skill_vocabulary
+    skill_rows = _binary_rows(
+        (() if failed else {vocabulary[skill] for skill in map(str.lower, resume.get('skills', [])) if skill in vocabulary}
+         for resume, failed in zip(resumes, features.failed)),
+        len(vocabulary)
+    )
+    matched = (skill_rows @ jobs.skills).toarray()
+    scores['skills_match'] = np.ones(shape)
+    wanted = jobs.skill_counts > 0
+    scores['skills_match'][:, wanted] = matched[:, wanted] / jobs.skill_counts[wanted]
+    scores['keyword_density'] = jobs.keyword_density([resume.get('text', '') for resume in resumes])
+    scores['experience_match'] = np.ones(shape)
+    wanted = jobs.min_experience != 0
+    scores['experience_match'][:, wanted] = np.minimum(features.years[:, None] / jobs.min_experience[wanted], 1.0)
+    scores['education_match'] = np.ones(shape)
+    wanted = jobs.education_counts > 0
+    matches = EDUCATION_MATCHES[features.education][:, None]
+    scores['education_match'][:, wanted] = np.minimum(matches / jobs.education_counts[wanted], 1.0)
+    scores['format_score'] = np.broadcast_to(SECTION_SCORES[features.sections][:, None], shape)
+    total = np.zeros(shape)
+    for component in COMPONENTS:
+        total = total + scores[component] * weights[component]
+    total[features.failed] = -np.inf
+    scores['total'] = total
+    return scores
+def rank_block(jobs: JobMatrix, resumes: Sequence[Dict], weights: Dict[str, float], top_k: int,
+               per_candidate: int = 0) -> Dict:
+    """Best top_k resumes of a block for every job, and the best per_candidate jobs of every resume in rank order
+
+    Only these pairs, with their component scores, leave the block, so its
+    full score matrix is dropped as soon as it has been reduced.
+    """
+    scores = score_block(jobs, resumes, weights)
+    names = ('total',) + COMPONENTS
+    rows = _top(scores['total'], top_k, axis=0)
+    block = {'rows': rows, 'scores': np.stack([np.take_along_axis(scores[name], rows, axis=0) for name in names])}
+    if per_candidate:
+        columns = _top(scores['total'], per_candidate, axis=1)
+        # Highest total first, earlier jobs first among ties
+        columns = np.take_along_axis(
+            columns, np.lexsort((columns, -np.take_along_axis(scores['total'], columns, axis=1)), axis=1), axis=1
+        )
+        block['candidate_jobs'] = columns
+        block['candidate_scores'] = np.stack([np.take_along_axis(scores[name], columns, axis=1) for name in names])
+    return block
+def _top(values: np.ndarray, k: int, axis: int) -> np.ndarray:
+    """Positions of the k largest values along axis, unordered"""
+    size = values.shape[axis]
+    if k >= size:
+        positions = np.arange(size).reshape((-1, 1) if axis == 0 else (1, -1))
+        return np.broadcast_to(positions, values.shape).copy()
+    return np.argpartition(-values, k - 1, axis=axis).take(range(k), axis=axis)
+def _worker_setup(jobs, weights, top_k, per_candidate, skills_file):
+    """What every block needs: the jobs, the ranking settings and a skill scanner for resumes without skills"""
+    scanner = load_scanner(skills_file) if skills_file else None
+    return jobs, weights, top_k, per_candidate, scanner
+# Block ranking state of a pool worker process, set once by _init_worker
+_worker_state = None
+def _init_worker(*args):
+    global _worker_state
+    _worker_state = _worker_setup(*args)
+def _rank_block_with(state, resumes):
+    jobs, weights, top_k, per_candidate, scanner = state
+    if scanner is not None:
+        for resume in resumes:
+            if 'skills' not in resume:
+                resume['skills'] = scanner.find_skills(resume.get('text', ''))
+    return rank_block(jobs, resumes, weights, top_k, per_candidate)
+def _rank_block_task(resumes):
+    """Pool task: rank one block of resumes against every job"""
+    return _rank_block_with(_worker_state, resumes)
+def _result(by, job_id, resume_id, rank, values):
+    row = {'by': by, 'job_id': job_id, 'resume_id': resume_id, 'rank': rank, 'total_score': round(values[0] * 100, 2)}
+    row.update({component: round(value * 100, 2) for component, value in zip(COMPONENTS, values[1:].tolist())})
+    return row
+class MatrixRanker:
+    """Ranks N resumes against M jobs in blocks of resumes, with bounded memory
+
+    Each block of `block_size` resumes is scored against every job as a few
+    sparse products (about 60 bytes per pair while it is scored) and reduced
+    at once to its best `top_k` resumes per job and best `per_candidate`
+    jobs per resume. Blocks run on `workers` processes, at most two per
+    worker in flight, so memory does not grow with N. Per-candidate rows
+    are yielded as their block finishes; per-job rows once every block has
+    been merged. Totals match ATSScorer.rank_many with the same TF-IDF model.
+    """
+    def __init__(self, jobs: Sequence[Dict], weights: Dict[str, float], tfidf_model: Optional[TfidfModel] = None,
+                 top_k: int = 50, per_candidate: int = 0, block_size: int = 1024, workers: int = 1,
+                 skills_file: Optional[str] = None):
+        self.jobs = JobMatrix([job_data_from(job) for job in jobs], tfidf_model)
+        self.weights = weights
+        self.top_k = top_k
+        self.per_candidate = per_candidate
+        self.block_size = block_size
+        self.workers = workers
+        self.skills_file = skills_file
+    def rank(self, resumes: Iterable[Dict]) -> Iterator[Dict]:
+        """Result rows: 'candidate' rows while ranking, then the 'job' rows of every job in rank order"""
+        resume_ids = []
+        best_rows = np.empty((0, len(self.jobs)), dtype=np.int64)
+        best_scores = np.empty((len(COMPONENTS) + 1, 0, len(self.jobs)))
+        for start, ids, block in self._blocks(resumes):
+            if self.per_candidate:
+                for row, resume_id in enumerate(ids):
+                    rank = 0
+                    for position, column in enumerate(block['candidate_jobs'][row].tolist()):
+                        values = block['candidate_scores'][:, row, position]
+                        if values[0] != -np.inf:
+                            rank += 1
+                            yield _result('candidate', self.jobs.ids[column], resume_id, rank, values)
+            resume_ids.extend(ids)
+            # Merge the block's best with the running best and keep top_k per job
+            best_rows = np.concatenate([best_rows, block['rows'] + start])
+            best_scores = np.concatenate([best_scores, block['scores']], axis=1)
+            if len(best_rows) > self.top_k:
+                keep = _top(best_scores[0], self.top_k, axis=0)
+                best_rows = np.take_along_axis(best_rows, keep, axis=0)
+                best_scores = np.take_along_axis(best_scores, keep[None], axis=1)
+        for column, job_id in enumerate(self.jobs.ids):
+            # Highest total first, earlier resumes first among ties
+            order = np.lexsort((best_rows[:, column], -best_scores[0, :, column]))
+            rank = 0
+            for position in order.tolist():
+                if best_scores[0, position, column] != -np.inf:
+                    rank += 1
+                    yield _result('job', job_id, resume_ids[best_rows[position, column]], rank,
+                                  best_scores[:, position, column])
+    def _chunks(self, resumes):
+        """(first resume index, resume ids, resumes) of each block"""
+        start, block = 0, []
+        for resume in resumes:
+            block.append(resume)
+            if len(block) == self.block_size:
+                yield start, self._ids(start, block), block
+                start, block = start + len(block), []
+        if block:
+            yield start, self._ids(start, block), block
+    @staticmethod
+    def _ids(start, block):
+        return [str(resume.get('id', start + index)) for index, resume in enumerate(block)]
+    def _blocks(self, resumes):
+        """(first resume index, resume ids, ranked block) of each block, in input order"""
+        settings = (self.jobs, self.weights, self.top_k, self.per_candidate, self.skills_file)
+        if self.workers <= 1:
+            state = _worker_setup(*settings)
+            for start, ids, chunk in self._chunks(resumes):
+                yield start, ids, _rank_block_with(state, chunk)
+            return
+        with ProcessPoolExecutor(
+            max_workers=self.workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_worker,
+            initargs=settings
+        ) as executor:
+            pending = deque()
+            for start, ids, chunk in self._chunks(resumes):
+                pending.append((start, ids, executor.submit(_rank_block_task, chunk)))
+                if len(pending) >= 2 * self.workers:
+                    start, ids, future = pending.popleft()
+                    yield start, ids, future.result()
+            while pending:
+                start, ids, future = pending.popleft()
+                yield start, ids, future.result()
+def format_rows(rows: Iterable[Dict], output_format: str = 'jsonl') -> Iterator[str]:
+    """Result rows as JSON lines, or as CSV lines after a header, one string per row"""
+    if output_format == 'jsonl':
+        for row in rows:
+            yield json.dumps(row) + "\n"
+        return
+    if output_format != 'csv':
+        raise ValueError(f"Unsupported output format: {output_format}")
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=CSV_FIELDS, lineterminator="\n")
+    writer.writeheader()
+    for row in rows:
+        writer.writerow(row)
+        yield buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue()
+def iter_jsonl(path: str) -> Iterator[Dict]:
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            if line.strip():
+                yield json.loads(line)
+def iter_store_resumes(config) -> Iterator[Dict]:
+    """Scoring data of every resume in the configured resume store"""
+    from services.resume_store import SCORING_FIELDS, create_resume_store, scoring_data
+    for document in create_resume_store(config).iter_resumes(SCORING_FIELDS):
+        yield scoring_data(document)
+def main():
+    parser = argparse.ArgumentParser(description="Rank many resumes against many job descriptions")
+    parser.add_argument('--jobs', required=True, help="JSONL of jobs: id, description, skills, min_experience, required_education")
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument('--resumes', help="JSONL of resumes: id, text, skills, experience, education")
+    source.add_argument('--from-store', action='store_true', help="Rank every resume in the configured resume store")
+    parser.add_argument('--out', default='-', help="Output file, '-' for stdout")
+    parser.add_argument('--format', default='jsonl', choices=FORMATS)
+    parser.add_argument('--top-k', type=int, default=50, help="Resumes kept per job")
+    parser.add_argument('--per-candidate', type=int, default=0, help="Jobs kept per resume; 0 for none")
+    parser.add_argument('--block-size', type=int, default=1024, help="Resumes scored against every job at once")
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1)
+    parser.add_argument('--tfidf-model', default=os.getenv('TFIDF_MODEL_PATH', 'models/tfidf'))
+    parser.add_argument('--skills-file', default=None,
+                        help="Skill taxonomy to find skills of resumes listing none (jobs default to SKILLS_FILE)")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(name)s %(message)s")
+    from algorithms.ats_scorer import ATSScorer
+    tfidf_model = TfidfModel.load(args.tfidf_model) if TfidfModel.exists(args.tfidf_model) else None
+    jobs = list(iter_jsonl(args.jobs))
+    if not jobs:
+        parser.error("No jobs found")
+    if any(not job.get('skills') for job in jobs):
+        jobs = profile_jobs(jobs, load_scanner(args.skills_file or os.getenv('SKILLS_FILE', 'data/skills.json')), tfidf_model)
+    ranker = MatrixRanker(
+        jobs, ATSScorer().weights, tfidf_model, top_k=args.top_k, per_candidate=args.per_candidate,
+        block_size=args.block_size, workers=args.workers, skills_file=args.skills_file
+    )
+    if args.from_store:
+        from config import Config
+        resumes = iter_store_resumes({key: value for key, value in vars(Config).items() if key.isupper()})
+    else:
+        resumes = iter_jsonl(args.resumes)
+    stream = sys.stdout if args.out == '-' else open(args.out, 'w', encoding='utf-8', newline='')
+    rows = 0
+    try:
+        for line in format_rows(ranker.rank(resumes), args.format):
+            stream.write(line)
+            rows += 1
+    finally:
+        if stream is not sys.stdout:
+            stream.close()
+    logging.info(f"Ranked resumes against {len(jobs)} jobs and wrote {rows} rows to {args.out}")
+if __name__ == "__main__":
+    main()
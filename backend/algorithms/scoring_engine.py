@@ -0,0 +1,130 @@
+import numpy as np
+from scipy.sparse import csr_matrix
+from typing import Dict, List, Sequence
+from algorithms.text_patterns import years_of_experience
+SECTIONS = ('experience', 'education', 'skills', 'contact')
+EDUCATION_KEYWORDS = ('bachelor', 'master', 'phd', 'degree', 'certification')
+# (component, threshold, message) in the order recommendations are reported
+RECOMMENDATIONS = (
+    ('skills_match', 0.5, "Add more relevant skills mentioned in the job description."),
+    ('keyword_density', 0.3, "Include more keywords from the job description in your resume."),
+    ('format_score', 0.7, "Improve resume structure with clear sections (Experience, Education, Skills, Contact)."),
+    ('experience_match', 0.6, "Highlight more relevant work experience or years of experience.")
+)
+COMPONENTS = ('skills_match', 'keyword_density', 'experience_match', 'education_match', 'format_score')
+# Score for every section bitmask: 0.25 per section present
+SECTION_SCORES = np.array([min(0.25 * bin(mask).count('1'), 1.0) for mask in range(1 << len(SECTIONS))])
+EDUCATION_MATCHES = np.array([bin(mask).count('1') for mask in range(1 << len(EDUCATION_KEYWORDS))])
+def extract_years(text: str) -> int:
+    """Years of experience mentioned in text: explicit counts plus the length of date ranges"""
+    return years_of_experience(text)
+def section_mask(text: str) -> int:
+    """Bitmask of the SECTIONS named in text"""
+    if not text:
+        return 0
+    text = text.lower()
+    return sum(1 << bit for bit, section in enumerate(SECTIONS) if section in text)
+def education_mask(education: List[str]) -> int:
+    """Bitmask of the EDUCATION_KEYWORDS found in the education entries"""
+    text = ' '.join(education).lower()
+    return sum(1 << bit for bit, keyword in enumerate(EDUCATION_KEYWORDS) if keyword in text)
+class ResumeFeatures:
+    """Columnar scoring features of a batch of resumes
+
+    Everything ATSScorer reads from a resume except its text similarity,
+    reduced once per resume: a sparse resume x skill membership matrix over
+    the batch's lowercased skill vocabulary, total years of experience, a
+    bitmask of format sections and a bitmask of education keywords. Rows
+    whose resume data could not be reduced are flagged in `failed` and left
+    empty.
+    """
+    def __init__(self, skills: csr_matrix, vocabulary: Dict[str, int], years: np.ndarray,
+                 sections: np.ndarray, education: np.ndarray, failed: np.ndarray):
+        self.skills = skills
+        self.vocabulary = vocabulary
+        self.years = years
+        self.sections = sections
+        self.education = education
+        self.failed = failed
+    def __len__(self) -> int:
+        return len(self.years)
+    @classmethod
+    def from_resumes(cls, resumes: Sequence[Dict]) -> 'ResumeFeatures':
+        count = len(resumes)
+        vocabulary = {}
+        indptr, indices = [0], []
+        years = np.zeros(count, dtype=np.int64)
+        sections = np.zeros(count, dtype=np.uint8)
+        education = np.zeros(count, dtype=np.uint8)
+        failed = np.zeros(count, dtype=bool)
+        for row, resume_data in enumerate(resumes):
+            try:
+                columns = {vocabulary.setdefault(skill.lower(), len(vocabulary)) for skill in resume_data.get('skills', [])}
+                years[row] = sum(extract_years(exp) for exp in resume_data.get('experience', []))
+                sections[row] = section_mask(resume_data.get('text', ''))
+                education[row] = education_mask(resume_data.get('education', []))
+            except Exception:
+                failed[row] = True
+                columns = ()
+            indices.extend(columns)
+            indptr.append(len(indices))
+        skills = csr_matrix(
+            (np.ones(len(indices), dtype=np.int32), np.asarray(indices, dtype=np.int32), np.asarray(indptr, dtype=np.int64)),
+            shape=(count, len(vocabulary))
+        )
+        return cls(skills, vocabulary, years, sections, education, failed)
+class ScoringEngine:
+    """Array form of the ATSScorer components over ResumeFeatures
+
+    Every component, the weighted total and the recommendation thresholds are
+    evaluated for all rows at once, with the same floating point operations
+    in the same order as the per-resume scorer, so totals are identical.
+    """
+    def __init__(self, weights: Dict[str, float]):
+        self.weights = weights
+    def score(self, features: ResumeFeatures, job_data: Dict, keyword_density: np.ndarray) -> Dict[str, np.ndarray]:
+        """Component scores (0-1) of every resume against one job"""
+        count = len(features)
+        scores = {}
+        job_skills = [skill.lower() for skill in job_data.get('skills', [])]
+        if job_skills:
+            wanted = np.zeros(features.skills.shape[1], dtype=np.int32)
+            wanted[[features.vocabulary[skill] for skill in set(job_skills) if skill in features.vocabulary]] = 1
+            scores['skills_match'] = (features.skills @ wanted) / len(job_skills)
+        else:
+            scores['skills_match'] = np.ones(count)
+        scores['keyword_density'] = np.asarray(keyword_density, dtype=float)
+        required_years = job_data.get('min_experience', 0)
+        if required_years == 0:
+            scores['experience_match'] = np.ones(count)
+        else:
+            scores['experience_match'] = np.minimum(features.years / required_years, 1.0)
+        required_education = job_data.get('required_education', [])
+        if required_education:
+            scores['education_match'] = np.minimum(EDUCATION_MATCHES[features.education] / len(required_education), 1.0)
+        else:
+            scores['education_match'] = np.ones(count)
+        scores['format_score'] = SECTION_SCORES[features.sections]
+        return scores
+    def totals(self, scores: Dict[str, np.ndarray]) -> np.ndarray:
+        """Weighted total (0-1), accumulated in component order"""
+        total = np.zeros(len(scores['format_score']))
+        for component in COMPONENTS:
+            total = total + scores[component] * self.weights[component]
+        return total
+    def results(self, scores: Dict[str, np.ndarray]) -> List[Dict]:
+        """Per-resume results in the ATSScorer.calculate_ats_score format"""
+        totals = [round(total, 2) for total in (self.totals(scores) * 100).tolist()]
+        components = {
+            component: [round(value, 2) for value in (scores[component] * 100).tolist()] for component in COMPONENTS
+        }
+        flags = [(scores[component] < threshold).tolist() for component, threshold, _ in RECOMMENDATIONS]
+        messages = [message for _, _, message in RECOMMENDATIONS]
+        return [
+            {
+                'total_score': totals[row],
+                'component_scores': {component: components[component][row] for component in COMPONENTS},
+                'recommendations': [message for message, flag in zip(messages, flags) if flag[row]]
+            }
+            for row in range(len(totals))
+        ]
@@ -0,0 +1,83 @@
+import re
+from collections import namedtuple
+from typing import Dict, Iterable, Iterator, List, Optional
+from algorithms.text_patterns import clean_text
+# One line of a document as laid out, with its 0-based page (DOCX and TXT are one page)
+Line = namedtuple('Line', ['page', 'text'])
+Section = namedtuple('Section', ['name', 'heading', 'page', 'lines'])
+# Heading phrases (lowercased, letters and spaces only) of each section
+SECTION_HEADINGS = {
+    'contact': ('contact', 'contact information', 'contact details', 'personal information', 'personal details'),
+    'summary': ('summary', 'professional summary', 'profile', 'professional profile', 'objective', 'career objective',
+                'about', 'about me'),
+    'experience': ('experience', 'work experience', 'professional experience', 'employment', 'employment history',
+                   'work history', 'career history', 'relevant experience'),
+    'education': ('education', 'academic background', 'academics', 'education and training', 'qualifications',
+                  'academic qualifications'),
+    'skills': ('skills', 'technical skills', 'core skills', 'key skills', 'skills and abilities', 'competencies',
+               'core competencies', 'technologies', 'tools and technologies'),
+    'projects': ('projects', 'personal projects', 'key projects', 'selected projects'),
+    'certifications': ('certifications', 'certificates', 'licenses and certifications', 'courses', 'training'),
+    'other': ('awards', 'honors', 'honors and awards', 'achievements', 'languages', 'publications', 'interests',
+              'hobbies', 'volunteering', 'references'),
+}
+HEADINGS = {phrase: name for name, phrases in SECTION_HEADINGS.items() for phrase in phrases}
+# Lines before the first heading are the name and contact block at the top of the page
+HEADER = 'contact'
+MAX_HEADING_WORDS = 4
+NON_LETTERS = re.compile(r'[^a-z]+')
+# Extractors each section is sent to; 'other' covers headings not listed above
+SECTION_EXTRACTORS = {
+    'contact': ('contact', 'names'),
+    'summary': ('skills',),
+    'experience': ('skills', 'names', 'experience'),
+    'education': ('education',),
+    'skills': ('skills',),
+    'projects': ('skills',),
+    'certifications': ('skills', 'education'),
+    'other': ('skills',),
+}
+def heading_of(line: str) -> Optional[str]:
+    """Section a heading line opens ("WORK EXPERIENCE", "Skills:"), or None for a content line"""
+    words = line.split()
+    if not words or len(words) > MAX_HEADING_WORDS:
+        return None
+    phrase = NON_LETTERS.sub(' ', line.lower().replace('&', ' and ')).strip()
+    return HEADINGS.get(phrase)
+def iter_sections(lines: Iterable[Line]) -> Iterator[Section]:
+    """Group a stream of lines into sections, yielding each one as soon as the next heading starts
+
+    Holds only the lines of the current section itself; what the consumer
+    keeps is up to it (route_sections keeps them all).
+    """
+    name, heading, page, current = HEADER, None, 0, []
+    for line in lines:
+        opened = heading_of(line.text)
+        if opened is None:
+            if line.text.strip():
+                current.append(line.text)
+            continue
+        if current or heading is not None:
+            yield Section(name, heading, page, current)
+        name, heading, page, current = opened, line.text.strip(), line.page, []
+    if current or heading is not None:
+        yield Section(name, heading, page, current)
+def route_sections(sections: Iterable[Section]) -> Dict[str, List[str]]:
+    """Lines of the sections each extractor needs, by extractor name, plus 'all' for every line in order
+
+    Buffers the whole document: every section is routed before any
+    extractor runs, and 'all' holds every line for the stored text.
+    'sections' lists the names of the sections found, so an extractor can
+    tell its own section apart from others routed to it as well.
+    """
+    routed = {'all': [], 'sections': []}
+    for section in sections:
+        lines = ([section.heading] if section.heading else []) + section.lines
+        routed['all'].extend(lines)
+        routed['sections'].append(section.name)
+        for extractor in SECTION_EXTRACTORS.get(section.name, SECTION_EXTRACTORS['other']):
+            routed.setdefault(extractor, []).extend(section.lines)
+    return routed
+def document_text(lines: Iterable[str]) -> str:
+    """The cleaned text FileService.extract_text returns for the same lines"""
+    return clean_text('\n'.join(lines))
@@ -0,0 +1,58 @@
+import re
+from collections import namedtuple
+from typing import Dict, Iterator, List
+Span = namedtuple('Span', ['kind', 'start', 'end', 'text'])
+# Every pattern as one alternation, so a document is scanned once. At a given
+# position the earlier alternative wins and matched text is consumed, so spans
+# never overlap: "2016 - 2021 years" is one YEAR_RANGE, not also "2021 years".
+# The cheap (?=\d) and (?<!\w) guards come first so most positions fail fast.
+SPAN_PATTERN = re.compile(r'''
+    (?=\d)(?:
+        \b(?P<PHONE>\d{3}[-.]?\d{3}[-.]?\d{4}\b)                          # US format
+      | (?P<YEAR_RANGE>(?P<range_start>\d{4})\s*(?i:-|to)\s*(?P<range_end>\d{4}))
+      | (?P<YEARS>(?P<years>\d+)\s*(?i:years?|yrs?))
+    )
+  | (?<!\w)(?:
+        (?P<EMAIL>[A-Za-z0-9._%+-]++@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b)
+      | (?P<PREFIXED_PHONE>
+            \(\d{3}\)\s?\d{3}[-.]?\d{4}\b                                  # (123) 456-7890
+          | \+\d{1,3}[-.\s]?\d{3,4}[-.\s]?\d{3,4}[-.\s]?\d{3,4}\b          # International
+        )
+    )
+  | (?P<LINKEDIN>[lL](?i:inkedin\.com/in/)[\w-]+)
+''', re.VERBOSE)
+# Group names that report as another span kind
+KIND_OF_GROUP = {'PREFIXED_PHONE': 'PHONE'}
+CONTACT_KINDS = ('EMAIL', 'PHONE', 'LINKEDIN')
+# Runs of whitespace and special characters other than essential punctuation
+CLEAN_PATTERN = re.compile(r'[^\w@.-]+')
+def iter_spans(text: str) -> Iterator[Span]:
+    """Typed spans (EMAIL, LINKEDIN, PHONE, YEAR_RANGE, YEARS) in text order"""
+    for match in SPAN_PATTERN.finditer(text):
+        kind = match.lastgroup
+        yield Span(KIND_OF_GROUP.get(kind, kind), match.start(), match.end(), match.group())
+def extract_spans(text: str) -> List[Span]:
+    return list(iter_spans(text))
+def contact_info(text: str) -> Dict[str, List[str]]:
+    """Emails, phone numbers and lowercased LinkedIn profile paths found in text"""
+    found = {kind: [] for kind in CONTACT_KINDS}
+    for match in SPAN_PATTERN.finditer(text):
+        kind = KIND_OF_GROUP.get(match.lastgroup, match.lastgroup)
+        if kind == 'LINKEDIN':
+            found[kind].append(match.group().lower())
+        elif kind in found:
+            found[kind].append(match.group())
+    return found
+def years_of_experience(text: str) -> int:
+    """Explicit "N years" counts plus the length of every year range in text"""
+    total_years = 0
+    for match in SPAN_PATTERN.finditer(text):
+        kind = match.lastgroup
+        if kind == 'YEARS':
+            total_years += int(match.group('years'))
+        elif kind == 'YEAR_RANGE':
+            total_years += max(0, int(match.group('range_end')) - int(match.group('range_start')))
+    return total_years
+def clean_text(text: str) -> str:
+    """Collapse whitespace and special characters other than @ . - into single spaces"""
+    return CLEAN_PATTERN.sub(' ', text).strip()
@@ -0,0 +1,145 @@
+import argparse
+import hashlib
+import json
+import logging
+import os
+import numpy as np
+from sklearn.feature_extraction.text import CountVectorizer, TfidfVectorizer
+from sklearn.preprocessing import normalize
+from typing import Dict, Iterable, Iterator, List, Tuple
+# Analyzer settings shared by the per-request scorer and the corpus model
+VECTORIZER_PARAMS = {
+    'ngram_range': (1, 3),
+    'stop_words': 'english',
+    'lowercase': True,
+    'token_pattern': r'\b[a-zA-Z]{2,}\b'
+}
+CORPUS_EXTENSIONS = {'pdf', 'docx', 'doc', 'txt'}
+class TfidfModel:
+    """TF-IDF vocabulary and IDF weights fitted once on a resume/JD corpus
+
+    Saved as a plain-text term list, a float32 IDF array and a small JSON
+    header. The IDF array is memory-mapped on load, so workers forked from
+    one parent share its pages.
+    """
+    FORMAT_VERSION = 1
+    TERMS_FILE = 'terms.txt'
+    IDF_FILE = 'idf.npy'
+    META_FILE = 'meta.json'
+    def __init__(self, vocabulary: Dict[str, int], idf: np.ndarray, meta: Dict):
+        self.vocabulary = vocabulary
+        self.idf = idf
+        self.meta = meta
+        self._counter = CountVectorizer(
+            vocabulary=vocabulary,
+            ngram_range=tuple(meta['params']['ngram_range']),
+            stop_words=meta['params']['stop_words'],
+            lowercase=meta['params']['lowercase'],
+            token_pattern=meta['params']['token_pattern']
+        )
+    @property
+    def version(self) -> str:
+        """Identifier of the fitted artifact, stable across workers"""
+        return self.meta['fingerprint']
+    @classmethod
+    def fit(cls, documents: Iterable[str], max_features: int = 50000, min_df: int = 2) -> 'TfidfModel':
+        """Fit vocabulary and IDF weights on a corpus of resumes and job descriptions"""
+        documents = list(documents)
+        vectorizer = TfidfVectorizer(max_features=max_features, min_df=min_df, **VECTORIZER_PARAMS)
+        vectorizer.fit(documents)
+        terms = vectorizer.get_feature_names_out()
+        vocabulary = {term: column for column, term in enumerate(terms)}
+        idf = vectorizer.idf_.astype(np.float32)
+        meta = {
+            'format_version': cls.FORMAT_VERSION,
+            'documents': len(documents),
+            'terms': len(terms),
+            'params': {**VECTORIZER_PARAMS, 'max_features': max_features, 'min_df': min_df},
+            'fingerprint': hashlib.sha1(idf.tobytes() + '\n'.join(terms).encode('utf-8')).hexdigest()[:16]
+        }
+        return cls(vocabulary, idf, meta)
+    def save(self, directory: str) -> None:
+        """Write the artifact; meta.json is written last so a partial save never loads"""
+        os.makedirs(directory, exist_ok=True)
+        terms = sorted(self.vocabulary, key=self.vocabulary.get)
+        with open(os.path.join(directory, self.TERMS_FILE), 'w', encoding='utf-8') as f:
+            f.write('\n'.join(terms))
+        np.save(os.path.join(directory, self.IDF_FILE), np.asarray(self.idf, dtype=np.float32))
+        with open(os.path.join(directory, self.META_FILE), 'w', encoding='utf-8') as f:
+            json.dump(self.meta, f, indent=2)
+    @classmethod
+    def load(cls, directory: str) -> 'TfidfModel':
+        """Load an artifact written by save, memory-mapping the IDF weights"""
+        with open(os.path.join(directory, cls.META_FILE), 'r', encoding='utf-8') as f:
+            meta = json.load(f)
+        if meta.get('format_version') != cls.FORMAT_VERSION:
+            raise ValueError(f"Unsupported TF-IDF model format: {meta.get('format_version')}")
+        with open(os.path.join(directory, cls.TERMS_FILE), 'r', encoding='utf-8') as f:
+            terms = f.read().split('\n')
+        idf = np.load(os.path.join(directory, cls.IDF_FILE), mmap_mode='r')
+        if len(terms) != meta['terms'] or idf.shape != (meta['terms'],):
+            raise ValueError(f"TF-IDF model in {directory} is inconsistent with its meta.json")
+        vocabulary = {term: column for column, term in enumerate(terms)}
+        logging.info(f"Loaded TF-IDF model with {len(terms)} terms from {directory}")
+        return cls(vocabulary, idf, meta)
+    @classmethod
+    def exists(cls, directory: str) -> bool:
+        """Whether a saved artifact is present in directory"""
+        return os.path.exists(os.path.join(directory, cls.META_FILE))
+    def transform(self, texts: List[str]):
+        """L2-normalized TF-IDF rows for texts, without refitting anything"""
+        counts = self._counter.transform(texts)
+        return normalize(counts.multiply(np.asarray(self.idf)).tocsr(), norm='l2', copy=False)
+    def similarity(self, texts: List[str], query: str) -> np.ndarray:
+        """Cosine similarity of every text to the query"""
+        if not texts or not query:
+            return np.zeros(len(texts))
+        matrix = self.transform(list(texts) + [query])
+        return np.asarray((matrix[:-1] @ matrix[-1].T).todense()).ravel()
+    def similarity_to(self, texts: List[str], query_vector) -> np.ndarray:
+        """Cosine similarity of every text to a query already transformed by this model"""
+        if not texts:
+            return np.zeros(0)
+        return np.asarray((self.transform(list(texts)) @ query_vector.T).todense()).ravel()
+def iter_corpus(paths: Iterable[str]) -> Iterator[Tuple[str, str]]:
+    """Yield (document id, text) from resume files, directories and JSONL files
+
+    JSONL lines are objects with a "text" or "description" field and an
+    optional "id"; files and directories are read through FileService.
+    """
+    from services.file_service import FileService
+    for path in paths:
+        if os.path.isdir(path):
+            for root, _, filenames in os.walk(path):
+                yield from iter_corpus(os.path.join(root, name) for name in sorted(filenames))
+            continue
+        extension = path.rsplit('.', 1)[-1].lower() if '.' in path else ''
+        if extension == 'jsonl':
+            with open(path, 'r', encoding='utf-8') as f:
+                for line_number, line in enumerate(f, 1):
+                    if not line.strip():
+                        continue
+                    record = json.loads(line)
+                    text = record.get('text') or record.get('description') or ''
+                    yield str(record.get('id', f"{path}:{line_number}")), text
+        elif extension in CORPUS_EXTENSIONS:
+            try:
+                yield path, FileService.extract_text(path, extension)
+            except Exception as e:
+                logging.warning(f"Skipping {path}: {e}")
+def main():
+    parser = argparse.ArgumentParser(description="Fit the ATS TF-IDF model on a resume/JD corpus")
+    parser.add_argument('corpus', nargs='+', help="Resume files, directories or JSONL files")
+    parser.add_argument('--out', default=os.getenv('TFIDF_MODEL_PATH', 'models/tfidf'))
+    parser.add_argument('--max-features', type=int, default=50000)
+    parser.add_argument('--min-df', type=int, default=2)
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(name)s %(message)s")
+    texts = [text for _, text in iter_corpus(args.corpus) if text]
+    if not texts:
+        parser.error("No documents found in the corpus")
+    model = TfidfModel.fit(texts, max_features=args.max_features, min_df=args.min_df)
+    model.save(args.out)
+    logging.info(f"Fitted {model.meta['terms']} terms on {len(texts)} documents into {args.out}")
+if __name__ == "__main__":
+    main()
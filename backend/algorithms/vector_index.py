@@ -0,0 +1,169 @@
+import argparse
+import json
+import logging
+import os
+import numpy as np
+from sklearn.decomposition import TruncatedSVD
+from typing import Dict, List, Optional, Sequence
+from algorithms.tfidf_model import TfidfModel, iter_corpus
+def normalize_rows(matrix: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return (matrix / norms).astype(np.float32)
+def spherical_kmeans(vectors: np.ndarray, clusters: int, iterations: int = 10, seed: int = 0) -> np.ndarray:
+    """Unit-norm centroids of L2-normalized vectors, by cosine k-means"""
+    rng = np.random.default_rng(seed)
+    centroids = vectors[rng.choice(len(vectors), clusters, replace=False)].copy()
+    for _ in range(iterations):
+        assignment = assign(vectors, centroids)
+        sums = np.zeros_like(centroids)
+        np.add.at(sums, assignment, vectors)
+        counts = np.bincount(assignment, minlength=clusters)
+        # Reseed empty clusters from random points so every list stays in use
+        empty = np.flatnonzero(counts == 0)
+        sums[empty] = vectors[rng.choice(len(vectors), len(empty), replace=False)]
+        centroids = normalize_rows(sums)
+    return centroids
+def assign(vectors: np.ndarray, centroids: np.ndarray, chunk: int = 8192) -> np.ndarray:
+    """Index of the most similar centroid for every vector"""
+    return np.concatenate([
+        np.argmax(vectors[start:start + chunk] @ centroids.T, axis=1) for start in range(0, len(vectors), chunk)
+    ]) if len(vectors) else np.empty(0, dtype=np.int64)
+class VectorIndex:
+    """Approximate nearest-neighbour index over reduced TF-IDF vectors
+
+    Documents are embedded with the corpus TF-IDF model, reduced to `dims`
+    dense float32 dimensions (TruncatedSVD, or a Gaussian random projection)
+    and L2-normalized, so a dot product is cosine similarity. An inverted
+    file (IVF) groups them under spherical k-means centroids; a query scores
+    the centroids and then only the vectors of its `nprobe` closest lists,
+    a fraction nprobe / lists of the corpus. Vectors are stored sorted by
+    list and memory-mapped on load.
+    """
+    FORMAT_VERSION = 1
+    META_FILE = 'meta.json'
+    ARRAYS = ('components', 'centroids', 'offsets', 'vectors')
+    IDS_FILE = 'ids.txt'
+    def __init__(self, components: np.ndarray, centroids: np.ndarray, offsets: np.ndarray,
+                 vectors: np.ndarray, ids: List[str], meta: Dict):
+        self.components = components
+        self.centroids = centroids
+        self.offsets = offsets
+        self.vectors = vectors
+        self.ids = ids
+        self.meta = meta
+    @property
+    def size(self) -> int:
+        return len(self.ids)
+    @classmethod
+    def build(cls, tfidf_model: TfidfModel, documents: Sequence[str], ids: Sequence[str], dims: int = 128,
+              lists: Optional[int] = None, method: str = 'svd', sample_size: int = 20000, seed: int = 0,
+              batch_size: int = 5000) -> 'VectorIndex':
+        """Embed, reduce and cluster a corpus"""
+        if len(documents) != len(ids) or not documents:
+            raise ValueError("Need one id per document and at least one document")
+        rng = np.random.default_rng(seed)
+        vocabulary_size = len(tfidf_model.vocabulary)
+        dims = min(dims, vocabulary_size - 1) if method == 'svd' else dims
+        if method == 'svd':
+            # Fit the projection on a sample; the components then embed everything
+            sample = rng.choice(len(documents), min(sample_size, len(documents)), replace=False)
+            svd = TruncatedSVD(n_components=dims, random_state=seed)
+            svd.fit(tfidf_model.transform([documents[i] for i in sample]))
+            components = svd.components_.astype(np.float32)
+        elif method == 'random':
+            components = (rng.standard_normal((dims, vocabulary_size)) / np.sqrt(dims)).astype(np.float32)
+        else:
+            raise ValueError(f"Unknown reduction method: {method}")
+        vectors = np.vstack([
+            normalize_rows(tfidf_model.transform(list(documents[start:start + batch_size])) @ components.T)
+            for start in range(0, len(documents), batch_size)
+        ])
+        lists = lists or max(1, int(4 * np.sqrt(len(documents))))
+        lists = min(lists, len(documents))
+        training = vectors[rng.choice(len(vectors), min(len(vectors), 64 * lists), replace=False)]
+        centroids = spherical_kmeans(training, lists, seed=seed)
+        assignment = assign(vectors, centroids)
+        order = np.argsort(assignment, kind='stable')
+        offsets = np.concatenate([[0], np.cumsum(np.bincount(assignment, minlength=lists))]).astype(np.int64)
+        meta = {
+            'format_version': cls.FORMAT_VERSION,
+            'documents': len(documents),
+            'dims': int(components.shape[0]),
+            'lists': int(lists),
+            'method': method,
+            'tfidf_fingerprint': tfidf_model.version
+        }
+        return cls(components, centroids, offsets, vectors[order], [ids[i] for i in order], meta)
+    def save(self, directory: str) -> None:
+        """Write the index; meta.json is written last so a partial save never loads"""
+        os.makedirs(directory, exist_ok=True)
+        for name in self.ARRAYS:
+            np.save(os.path.join(directory, f"{name}.npy"), getattr(self, name))
+        with open(os.path.join(directory, self.IDS_FILE), 'w', encoding='utf-8') as f:
+            f.write('\n'.join(self.ids))
+        with open(os.path.join(directory, self.META_FILE), 'w', encoding='utf-8') as f:
+            json.dump(self.meta, f, indent=2)
+    @classmethod
+    def load(cls, directory: str) -> 'VectorIndex':
+        """Load an index written by save, memory-mapping the arrays"""
+        with open(os.path.join(directory, cls.META_FILE), 'r', encoding='utf-8') as f:
+            meta = json.load(f)
+        if meta.get('format_version') != cls.FORMAT_VERSION:
+            raise ValueError(f"Unsupported vector index format: {meta.get('format_version')}")
+        arrays = {name: np.load(os.path.join(directory, f"{name}.npy"), mmap_mode='r') for name in cls.ARRAYS}
+        with open(os.path.join(directory, cls.IDS_FILE), 'r', encoding='utf-8') as f:
+            ids = f.read().split('\n')
+        if len(ids) != meta['documents'] or arrays['vectors'].shape != (meta['documents'], meta['dims']):
+            raise ValueError(f"Vector index in {directory} is inconsistent with its meta.json")
+        logging.info(f"Loaded vector index of {len(ids)} documents from {directory}")
+        return cls(ids=ids, meta=meta, **arrays)
+    @classmethod
+    def exists(cls, directory: str) -> bool:
+        return os.path.exists(os.path.join(directory, cls.META_FILE))
+    def embed(self, tfidf_model: TfidfModel, texts: List[str]) -> np.ndarray:
+        """Reduced, normalized query vectors for texts"""
+        return normalize_rows(tfidf_model.transform(texts) @ np.asarray(self.components).T)
+    def search(self, query: np.ndarray, top_k: int = 10, nprobe: int = 8) -> List[Dict]:
+        """Top-k (id, cosine) from the vectors of the nprobe lists closest to the query"""
+        if top_k <= 0 or not self.size:
+            return []
+        nprobe = max(1, min(nprobe, len(self.centroids)))
+        centroid_scores = self.centroids @ query
+        probed = np.argpartition(-centroid_scores, nprobe - 1)[:nprobe]
+        ranges = [(self.offsets[i], self.offsets[i + 1]) for i in probed if self.offsets[i + 1] > self.offsets[i]]
+        if not ranges:
+            return []
+        rows = np.concatenate([np.arange(start, end) for start, end in ranges])
+        return self._top(rows, self.vectors[rows] @ query, top_k)
+    def search_exact(self, query: np.ndarray, top_k: int = 10) -> List[Dict]:
+        """Brute-force top-k over every vector, the reference for recall"""
+        if top_k <= 0 or not self.size:
+            return []
+        return self._top(np.arange(self.size), np.asarray(self.vectors) @ query, top_k)
+    def _top(self, rows: np.ndarray, scores: np.ndarray, top_k: int) -> List[Dict]:
+        if len(scores) > top_k:
+            best = np.argpartition(-scores, top_k - 1)[:top_k]
+        else:
+            best = np.arange(len(scores))
+        best = best[np.argsort(-scores[best], kind='stable')]
+        return [{'id': self.ids[rows[i]], 'score': round(float(scores[i]), 4)} for i in best]
+def main():
+    parser = argparse.ArgumentParser(description="Build the ANN vector index over a resume corpus")
+    parser.add_argument('corpus', nargs='+', help="Resume files, directories or JSONL files")
+    parser.add_argument('--tfidf', default=os.getenv('TFIDF_MODEL_PATH', 'models/tfidf'), help="Fitted TF-IDF model")
+    parser.add_argument('--out', default=os.getenv('VECTOR_INDEX_PATH', 'models/vectors'))
+    parser.add_argument('--dims', type=int, default=128)
+    parser.add_argument('--lists', type=int, default=None, help="IVF lists (default 4 * sqrt(N))")
+    parser.add_argument('--method', choices=['svd', 'random'], default='svd')
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(name)s %(message)s")
+    records = [(doc_id, text) for doc_id, text in iter_corpus(args.corpus) if text]
+    if not records:
+        parser.error("No documents found in the corpus")
+    index = VectorIndex.build(TfidfModel.load(args.tfidf), [text for _, text in records], [doc_id for doc_id, _ in records],
+                              dims=args.dims, lists=args.lists, method=args.method)
+    index.save(args.out)
+    logging.info(f"Indexed {index.size} documents in {index.meta['lists']} lists into {args.out}")
+if __name__ == "__main__":
+    main()
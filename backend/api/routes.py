@@ -1,84 +1,583 @@
-from flask import Blueprint, request, jsonify, current_app
+from flask import Blueprint, Response, request, jsonify, current_app, stream_with_context
 from werkzeug.utils import secure_filename
-import os
+import hmac
 import uuid
 import logging
-from datetime import datetime
+from functools import wraps
+from itertools import chain
+from algorithms.matrix_ranker import FORMATS, MatrixRanker, format_rows
+from algorithms.sections import document_text, iter_sections, route_sections
 from services.file_service import FileService
-from algorithms.ats_scorer import ATSScorer
+from services.cache_service import ExtractionCache
+from services.extraction_pool import ExtractionTimeout
+from services.ingestion_queue import QueueFull, UploadTooLarge, unpack_upload
+from services.metrics import DOCUMENT_BYTES, DOCUMENT_CHARS, stage
+from services.resume_store import SCORING_FIELDS, resume_document, scoring_data
+from services.taxonomy_service import ConcurrentChange, InvalidChange
 api_bp = Blueprint("api", __name__)
+# Path segments under /postings that are routes of their own, not posting ids
+RESERVED_POSTING_IDS = ("stats",)
 @api_bp.route("/upload", methods=["POST"])
 def upload_resume():
     """Upload and process resume file"""
     try:
-        # Check if file is present
-        if "resume" not in request.files:
+        # Check if file is present; parsing the form spools the upload
+        with stage("receive"):
+            files = request.files
+        if "resume" not in files:
             return jsonify({"error": "No file provided"}), 400
-        file = request.files["resume"]
+        file = files["resume"]
         if file.filename == "":
             return jsonify({"error": "No file selected"}), 400
         # Validate file
         is_valid, message = FileService.validate_file(file.filename)
         if not is_valid:
             return jsonify({"error": message}), 400
-        # Generate unique filename
         file_extension = file.filename.rsplit(".", 1)[1].lower()
-        unique_filename = f"{uuid.uuid4()}.{file_extension}"
-        file_path = os.path.join(current_app.config["UPLOAD_FOLDER"], unique_filename)
-        # Save file
-        file.save(file_path)
-        # Extract text
-        text = FileService.extract_text(file_path, file_extension)
+        # The upload stays in memory, spooled to disk only above UPLOAD_SPOOL_MAX_MEMORY
+        stream = file.stream
+        # Re-uploads of the same bytes are served from the extraction cache
+        with stage("hash"):
+            content_hash = ExtractionCache.stream_hash(stream)
+        with stage("cache_get"):
+            cache_version = _extraction_version(current_app.config["SECTION_SEGMENTATION"])
+            cached = current_app.extraction_cache.get(content_hash, cache_version)
+        if cached is not None:
+            text, entities = cached["text"], cached["entities"]
+        else:
+            DOCUMENT_BYTES.labels(file_extension).observe(stream.seek(0, 2))
+            text, entities = _extract_upload(stream, file_extension)
+            with stage("cache_set"):
+                current_app.extraction_cache.set(content_hash, cache_version, {"text": text, "entities": entities})
+        resume_id = str(uuid.uuid4())
+        # Stored resumes can be scored by id, without the client sending them back
+        with stage("store"):
+            stored = _store_resume(resume_document(resume_id, file.filename, text, entities, content_hash))
+        with stage("index"):
+            _index_resume(resume_id, entities.get("SKILL", []))
+        with stage("serialize"):
+            return jsonify({
+                "success": True,
+                "resume_id": resume_id,
+                "stored": stored,
+                "cached": cached is not None,
+                "entities": entities,
+                "text_preview": text[:500] + "..." if len(text) > 500 else text
+            })
+    except ExtractionTimeout as e:
+        logging.error(f"Timed out processing resume upload: {e}")
+        return jsonify({"error": "Text extraction timed out"}), 504
+    except Exception as e:
+        logging.error(f"Error processing resume upload: {e}")
+        return jsonify({"error": "Internal server error"}), 500
+def _extract_upload(stream, file_extension):
+    """Text and entities of an uploaded document"""
+    if not current_app.config["SECTION_SEGMENTATION"]:
+        # Extract text, waiting on the extraction pool for large PDFs
+        with stage("extract"):
+            text = current_app.extraction_pool.extract_text(stream, file_extension)
+        DOCUMENT_CHARS.labels(file_extension).observe(len(text))
         # Process with NLP
-        entities = current_app.nlp_service.extract_entities(text)
-        # Store in database (simplified for this example)
-        resume_data = {
-            "id": str(uuid.uuid4()),
-            "filename": file.filename,
-            "unique_filename": unique_filename,
-            "text": text,
-            "entities": entities,
-            "created_at": str(datetime.utcnow())
-        }
-        # Clean up uploaded file
-        os.remove(file_path)
+        with stage("entities"):
+            entities = current_app.nlp_service.extract_entities(text)
+        return text, entities
+    # Lines keep the layout that cleaning flattens; the whole document is routed before extraction starts
+    with stage("extract"):
+        routed = route_sections(iter_sections(current_app.extraction_pool.extract_lines(stream, file_extension)))
+        text = document_text(routed["all"])
+    DOCUMENT_CHARS.labels(file_extension).observe(len(text))
+    # Each extractor sees only the sections it needs
+    with stage("entities"):
+        entities = current_app.nlp_service.extract_entities_from_sections(routed)
+    return text, entities
+def _store_resume(document):
+    """Save a processed resume and return whether it was; storage failures never fail the upload"""
+    try:
+        current_app.resume_store.add(document)
+        return True
+    except Exception as e:
+        logging.error(f"Could not store resume {document['resume_id']}: {e}")
+        return False
+def _index_resume(resume_id, skills):
+    """Add a processed resume to the skill index; indexing failures never fail the upload"""
+    try:
+        current_app.skill_index.add(resume_id, skills)
+    except Exception as e:
+        logging.error(f"Could not index resume {resume_id}: {e}")
+def _extraction_version(sectioned=False):
+    """Version of everything that shapes an extraction, used to key the cache"""
+    parts = [
+        current_app.config["EXTRACTION_CACHE_VERSION"],
+        current_app.skill_trie.fingerprint(),
+        getattr(current_app.nlp_service, "model_version", "unknown")
+    ]
+    # Sectioned extraction finds entities differently, so its entries are kept apart
+    return ":".join(parts + ["sections"] if sectioned else parts)
+@api_bp.route("/ingest", methods=["POST"])
+def ingest_resumes():
+    """Queue a zip archive or several resume files for background processing"""
+    try:
+        uploads = [file for file in request.files.getlist("files") if file.filename]
+        if not uploads:
+            return jsonify({"error": "No files provided"}), 400
+        max_files = current_app.config["INGEST_MAX_FILES"]
+        max_total_size = current_app.config["INGEST_MAX_CONTENT_LENGTH"]
+        documents = []
+        total_size = 0
+        for file in uploads:
+            # Archives count by their unpacked size, against the same limit as the request
+            for document in unpack_upload(file.filename, file.stream, current_app.config["MAX_CONTENT_LENGTH"],
+                                          max_total_size - total_size):
+                documents.append(document)
+                total_size += len(document[1] or b"")
+                if len(documents) > max_files:
+                    return jsonify({"error": f"Too many files, at most {max_files} per job"}), 400
+        if not documents:
+            return jsonify({"error": "No files found in upload"}), 400
+        job_id = current_app.ingestion_queue.submit(documents, _extraction_version())
         return jsonify({
             "success": True,
-            "resume_id": resume_data["id"],
-            "entities": entities,
-            "text_preview": text[:500] + "..." if len(text) > 500 else text
-        })
+            "job_id": job_id,
+            "total": len(documents),
+            "status_url": f"/api/jobs/{job_id}"
+        }), 202
+    except UploadTooLarge as e:
+        return jsonify({"error": str(e)}), 413
+    except QueueFull as e:
+        logging.warning(f"Rejected ingestion job: {e}")
+        response = jsonify({"error": "Ingestion queue is full, retry later"})
+        response.headers["Retry-After"] = "30"
+        return response, 429
     except Exception as e:
-        logging.error(f"Error processing resume upload: {e}")
+        logging.error(f"Error queueing ingestion job: {e}")
+        return jsonify({"error": "Internal server error"}), 500
+@api_bp.route("/jobs/<job_id>", methods=["GET"])
+def get_ingestion_job(job_id):
+    """Status and per-file results of a bulk ingestion job"""
+    try:
+        job = current_app.ingestion_queue.get_job(job_id)
+        if job is None:
+            return jsonify({"error": "Job not found"}), 404
+        return jsonify(job)
+    except Exception as e:
+        logging.error(f"Error reading ingestion job {job_id}: {e}")
+        return jsonify({"error": "Internal server error"}), 500
+@api_bp.route("/ingest/stats", methods=["GET"])
+def ingest_stats():
+    """Ingestion worker pool occupancy"""
+    return jsonify(current_app.ingestion_queue.stats())
+@api_bp.route("/resumes/<resume_id>", methods=["GET"])
+def get_resume(resume_id):
+    """A stored resume; ?fields=text,entities.SKILL returns only those fields"""
+    try:
+        fields = request.args.get("fields")
+        document = current_app.resume_store.get(resume_id, fields.split(",") if fields else None)
+        if document is None:
+            return jsonify({"error": "Resume not found"}), 404
+        return jsonify(document)
+    except Exception as e:
+        logging.error(f"Error reading resume {resume_id}: {e}")
         return jsonify({"error": "Internal server error"}), 500
 @api_bp.route("/score", methods=["POST"])
 def calculate_score():
     """Calculate ATS score for resume against job description"""
     try:
-        data = request.get_json()
+        with stage("parse"):
+            data = request.get_json()
         if not data:
             return jsonify({"error": "No data provided"}), 400
         resume_data = data.get("resume_data", {})
         job_description = data.get("job_description", "")
-        if not resume_data or not job_description:
+        if data.get("resume_id") and not resume_data:
+            with stage("load"):
+                document = current_app.resume_store.get(str(data["resume_id"]), SCORING_FIELDS)
+            if document is None:
+                return jsonify({"error": "Resume not found"}), 404
+            resume_data = scoring_data(document)
+        # The job description is parsed once and served from the profile cache after that
+        with stage("job_profile"):
+            profile = _job_profile(job_description, data.get("job_id"))
+        if data.get("job_id") and not job_description and profile is None:
+            return jsonify({"error": "Job not found"}), 404
+        if not resume_data or profile is None:
             return jsonify({"error": "Missing resume data or job description"}), 400
-        # Prepare job data
-        job_data = {
-            "description": job_description,
-            "skills": job_description.split(), # Simplified skill extraction
-            "min_experience": data.get("min_experience", 0),
-            "required_education": data.get("required_education", [])
-        }
+        job_data = profile.job_data(data.get("min_experience"), data.get("required_education"))
         # Calculate ATS score
-        scorer = ATSScorer()
-        score_result = scorer.calculate_ats_score(resume_data, job_data)
+        with stage("score"):
+            scorer = current_app.ats_scorer(tfidf_model=current_app.tfidf_model)
+            score_result = scorer.calculate_ats_score(resume_data, job_data)
+        with stage("serialize"):
+            return jsonify({
+                "success": True,
+                "ats_score": score_result
+            })
+    except Exception as e:
+        logging.error(f"Error calculating ATS score: {e}")
+        return jsonify({"error": "Internal server error"}), 500
+@api_bp.route("/score/batch", methods=["POST"])
+def calculate_batch_scores():
+    """Rank many resumes against one job description"""
+    try:
+        with stage("parse"):
+            data = request.get_json()
+        if not data:
+            return jsonify({"error": "No data provided"}), 400
+        resumes = data.get("resumes", [])
+        resume_ids = data.get("resume_ids", [])
+        job_description = data.get("job_description", "")
+        if not (resumes or resume_ids) or not (job_description or data.get("job_id")):
+            return jsonify({"error": "Missing resumes or job description"}), 400
+        if not isinstance(resumes, list) or not all(isinstance(resume, dict) for resume in resumes):
+            return jsonify({"error": "Resumes must be a list of resume data objects"}), 400
+        if not isinstance(resume_ids, list):
+            return jsonify({"error": "resume_ids must be a list of resume ids"}), 400
+        max_resumes = current_app.config["BATCH_SCORE_MAX_RESUMES"]
+        if len(resumes) + len(resume_ids) > max_resumes:
+            return jsonify({"error": f"Too many resumes, at most {max_resumes} per batch"}), 400
+        try:
+            top_k = _int_field(data, "top_k", None, minimum=1) if data.get("top_k") is not None else None
+        except ValueError as e:
+            return jsonify({"error": str(e)}), 400
+        missing = []
+        if resume_ids:
+            # One projected read for every stored resume; ids not found are reported, not scored
+            with stage("load"):
+                documents = current_app.resume_store.get_many([str(resume_id) for resume_id in resume_ids],
+                                                               SCORING_FIELDS)
+            missing = [resume_id for resume_id in resume_ids if str(resume_id) not in documents]
+            resumes = resumes + [scoring_data(documents[str(resume_id)]) for resume_id in resume_ids
+                                 if str(resume_id) in documents]
+        with stage("job_profile"):
+            profile = _job_profile(job_description, data.get("job_id"))
+        if profile is None:
+            return jsonify({"error": "Job not found"}), 404
+        with stage("entities"):
+            _annotate_resumes(resumes)
+        job_data = profile.job_data(data.get("min_experience"), data.get("required_education"))
+        with stage("score_batch"):
+            rankings = current_app.ats_scorer(tfidf_model=current_app.tfidf_model).rank_many(resumes, job_data)
+        if top_k is not None:
+            rankings = rankings[:top_k]
+        with stage("serialize"):
+            return jsonify({
+                "success": True,
+                "total": len(resumes),
+                "missing": missing,
+                "rankings": rankings
+            })
+    except Exception as e:
+        logging.error(f"Error calculating batch ATS scores: {e}")
+        return jsonify({"error": "Internal server error"}), 500
+@api_bp.route("/score/matrix", methods=["POST"])
+def calculate_matrix_scores():
+    """Rank many resumes against many jobs, streaming the top-k of every job (and optionally of every resume)"""
+    try:
+        with stage("parse"):
+            data = request.get_json()
+        if not data:
+            return jsonify({"error": "No data provided"}), 400
+        jobs = data.get("jobs", [])
+        resumes = data.get("resumes", [])
+        resume_ids = data.get("resume_ids", [])
+        output_format = data.get("format", "jsonl")
+        if not jobs or not (resumes or resume_ids):
+            return jsonify({"error": "Missing jobs or resumes"}), 400
+        if not isinstance(jobs, list) or not all(isinstance(job, dict) for job in jobs):
+            return jsonify({"error": "Jobs must be a list of job objects"}), 400
+        if not all(job.get("description") or job.get("job_description") or job.get("job_id") for job in jobs):
+            return jsonify({"error": "Every job needs a description or a registered job_id"}), 400
+        if not isinstance(resumes, list) or not all(isinstance(resume, dict) for resume in resumes):
+            return jsonify({"error": "Resumes must be a list of resume data objects"}), 400
+        if not isinstance(resume_ids, list):
+            return jsonify({"error": "resume_ids must be a list of resume ids"}), 400
+        if output_format not in FORMATS:
+            return jsonify({"error": f"format must be one of {', '.join(FORMATS)}"}), 400
+        max_pairs = current_app.config["MATRIX_MAX_PAIRS"]
+        if len(jobs) * (len(resumes) + len(resume_ids)) > max_pairs:
+            return jsonify({"error": f"Too many job and resume pairs, at most {max_pairs} per request"}), 400
+        try:
+            top_k = _int_field(data, "top_k", 10, minimum=1)
+            per_candidate = _int_field(data, "per_candidate", 0, minimum=0)
+        except ValueError as e:
+            return jsonify({"error": str(e)}), 400
+        with stage("job_profile"):
+            jobs, missing_jobs = _matrix_jobs(jobs)
+        if missing_jobs:
+            return jsonify({"error": "Jobs not found", "missing_jobs": missing_jobs}), 404
+        block_size = current_app.config["MATRIX_BLOCK_SIZE"]
+        resume_ids = list(dict.fromkeys(str(resume_id) for resume_id in resume_ids))
+        missing = 0
+        if resume_ids:
+            # Only the ids are read up front; the scoring fields are read block by block while ranking
+            with stage("load"):
+                found = current_app.resume_store.get_many(resume_ids, ())
+            missing = len(resume_ids) - len(found)
+            resume_ids = [resume_id for resume_id in resume_ids if resume_id in found]
+        with stage("entities"):
+            _annotate_resumes(resumes)
+        ranker = MatrixRanker(
+            jobs, current_app.ats_scorer().weights, current_app.tfidf_model,
+            top_k=top_k, per_candidate=per_candidate, block_size=block_size
+        )
+        stored = _stored_resumes(current_app.resume_store, resume_ids, block_size)
+        # Rows are written as they are ranked, candidate rows block by block and job rows at the end
+        response = Response(
+            stream_with_context(format_rows(ranker.rank(chain(resumes, stored)), output_format)),
+            mimetype="application/x-ndjson" if output_format == "jsonl" else "text/csv"
+        )
+        response.headers["X-Missing-Resumes"] = str(missing)
+        return response
+    except Exception as e:
+        logging.error(f"Error calculating matrix ATS scores: {e}")
+        return jsonify({"error": "Internal server error"}), 500
+def _annotate_resumes(resumes):
+    """Fill in skills, education and experience of raw-text resumes with one batched NLP call"""
+    pending = [resume for resume in resumes if "skills" not in resume and resume.get("text")]
+    if not pending:
+        return
+    entities = current_app.nlp_service.extract_entities_batch([resume["text"] for resume in pending])
+    for resume, resume_entities in zip(pending, entities):
+        resume["skills"] = resume_entities["SKILL"]
+        resume.setdefault("education", resume_entities["EDUCATION"])
+        resume.setdefault("experience", resume_entities["EXPERIENCE"])
+def _stored_resumes(resume_store, resume_ids, block_size):
+    """Scoring data of stored resumes, read block_size ids per query; ids deleted meanwhile are skipped"""
+    for start in range(0, len(resume_ids), block_size):
+        block = resume_ids[start:start + block_size]
+        documents = resume_store.get_many(block, SCORING_FIELDS)
+        for resume_id in block:
+            if resume_id in documents:
+                yield scoring_data(documents[resume_id])
+def _int_field(data, name, default, minimum):
+    """data[name] as an integer of at least minimum, default when absent; ValueError otherwise"""
+    value = data.get(name, default)
+    if isinstance(value, bool) or not isinstance(value, int) or value < minimum:
+        raise ValueError(f"{name} must be an integer of at least {minimum}")
+    return value
+def _job_profile(job_description, job_id=None):
+    """Cached profile of a job description, else of the registered posting job_id; None if there is neither"""
+    if job_description:
+        return current_app.job_profiles.profile(job_description)
+    if job_id:
+        return current_app.job_profiles.get(str(job_id))
+    return None
+def _matrix_jobs(jobs):
+    """Scorer job data of every job of a matrix request, and the job_ids that are not registered"""
+    prepared, missing = [], []
+    for index, job in enumerate(jobs):
+        profile = _job_profile(job.get("description") or job.get("job_description"), job.get("job_id"))
+        if profile is None:
+            missing.append(job.get("job_id"))
+            continue
+        job_data = profile.job_data(job.get("min_experience"), job.get("required_education"))
+        job_data["id"] = str(job.get("id") or job.get("job_id") or index)
+        # Skills listed with the job replace the ones found in its description
+        if job.get("skills"):
+            job_data["skills"] = job["skills"]
+        prepared.append(job_data)
+    return prepared, missing
+@api_bp.route("/postings", methods=["POST"])
+def register_job():
+    """Parse and store a job posting, so it can be scored against by job_id"""
+    try:
+        data = request.get_json()
+        if not data:
+            return jsonify({"error": "No data provided"}), 400
+        description = data.get("description") or data.get("job_description", "")
+        if not description:
+            return jsonify({"error": "Missing job description"}), 400
+        job_id = str(data["id"]) if data.get("id") else None
+        if job_id is not None and (job_id in RESERVED_POSTING_IDS or "/" in job_id):
+            return jsonify({"error": f"Invalid posting id {job_id!r}"}), 400
+        profile = current_app.job_profiles.register(
+            description,
+            job_id=job_id,
+            title=data.get("title"),
+            min_experience=data.get("min_experience"),
+            required_education=data.get("required_education")
+        )
         return jsonify({
             "success": True,
-            "ats_score": score_result
+            "job_id": profile.job_id,
+            "profile": profile.summary()
+        }), 201
+    except Exception as e:
+        logging.error(f"Error registering job posting: {e}")
+        return jsonify({"error": "Internal server error"}), 500
+@api_bp.route("/postings", methods=["GET"])
+def list_jobs():
+    """Most recently registered job postings; ?limit=100"""
+    try:
+        limit = min(int(request.args.get("limit", 100)), 1000)
+        return jsonify({"jobs": current_app.job_profiles.list(limit)})
+    except ValueError:
+        return jsonify({"error": "limit must be an integer"}), 400
+    except Exception as e:
+        logging.error(f"Error listing job postings: {e}")
+        return jsonify({"error": "Internal server error"}), 500
+@api_bp.route("/postings/<job_id>/profile", methods=["GET"])
+def get_job_profile(job_id):
+    """Parsed requirements of a registered job posting"""
+    try:
+        profile = current_app.job_profiles.get(job_id)
+        if profile is None:
+            return jsonify({"error": "Job not found"}), 404
+        return jsonify(profile.summary())
+    except Exception as e:
+        logging.error(f"Error reading job profile {job_id}: {e}")
+        return jsonify({"error": "Internal server error"}), 500
+@api_bp.route("/candidates/search", methods=["POST"])
+def search_candidates():
+    """Retrieve the top-k indexed resumes for a job's skills, before full ATS scoring"""
+    try:
+        data = request.get_json()
+        if not data:
+            return jsonify({"error": "No data provided"}), 400
+        skills = data.get("skills", [])
+        required = data.get("required_skills", [])
+        # A string would be searched character by character
+        for name, value in (("skills", skills), ("required_skills", required)):
+            if not isinstance(value, list) or not all(isinstance(skill, str) for skill in value):
+                return jsonify({"error": f"{name} must be a list of skills"}), 400
+        try:
+            top_k = min(_int_field(data, "top_k", 50, minimum=1), current_app.config["CANDIDATE_SEARCH_MAX_K"])
+        except ValueError as e:
+            return jsonify({"error": str(e)}), 400
+        skills = list(skills)
+        job_description = data.get("job_description", "")
+        if job_description:
+            skills += current_app.skill_trie.scanner().find_skills(job_description)
+        if not skills and not required:
+            return jsonify({"error": "Missing skills or job description"}), 400
+        candidates = current_app.skill_index.search(skills, required=required, weights=data.get("weights"), top_k=top_k)
+        return jsonify({
+            "success": True,
+            "skills": list(dict.fromkeys(skills)),
+            "candidates": candidates
         })
     except Exception as e:
-        logging.error(f"Error calculating ATS score: {e}")
+        logging.error(f"Error searching candidates: {e}")
+        return jsonify({"error": "Internal server error"}), 500
+@api_bp.route("/search", methods=["POST"])
+def semantic_search():
+    """Resumes most similar to a job description, from the approximate nearest-neighbour index"""
+    try:
+        data = request.get_json()
+        if not data:
+            return jsonify({"error": "No data provided"}), 400
+        query = data.get("job_description") or data.get("query", "")
+        if not query:
+            return jsonify({"error": "Missing job description"}), 400
+        index = current_app.vector_index
+        if index is None:
+            return jsonify({"error": "Vector index not built"}), 503
+        try:
+            top_k = min(_int_field(data, "top_k", 10, minimum=1), current_app.config["CANDIDATE_SEARCH_MAX_K"])
+            nprobe = _int_field(data, "nprobe", current_app.config["VECTOR_SEARCH_NPROBE"], minimum=1)
+        except ValueError as e:
+            return jsonify({"error": str(e)}), 400
+        # Probing more lists than the index has is an exact search
+        nprobe = min(nprobe, len(index.centroids))
+        vector = index.embed(current_app.tfidf_model, [query])[0]
+        return jsonify({
+            "success": True,
+            "results": index.search(vector, top_k=top_k, nprobe=nprobe)
+        })
+    except Exception as e:
+        logging.error(f"Error running semantic search: {e}")
+        return jsonify({"error": "Internal server error"}), 500
+def taxonomy_writer(view):
+    """Allow a taxonomy change only with the TAXONOMY_ADMIN_TOKEN header; without a token configured, refuse all"""
+    @wraps(view)
+    def guarded(*args, **kwargs):
+        token = current_app.config["TAXONOMY_ADMIN_TOKEN"]
+        value = request.headers.get(current_app.config["TAXONOMY_ADMIN_HEADER"])
+        if not token:
+            return jsonify({"error": "Taxonomy changes are disabled; set TAXONOMY_ADMIN_TOKEN"}), 403
+        if value is None or not hmac.compare_digest(value, token):
+            return jsonify({"error": "Missing or invalid taxonomy admin token"}), 403
+        return view(*args, **kwargs)
+    return guarded
+@api_bp.route("/taxonomy", methods=["GET"])
+def taxonomy_stats():
+    """Live skill taxonomy version and size in this worker"""
+    return jsonify(current_app.taxonomy.stats())
+@api_bp.route("/taxonomy/deltas", methods=["GET"])
+def taxonomy_deltas():
+    """Taxonomy deltas logged after version `since`"""
+    try:
+        since = int(request.args.get("since", 0))
+        return jsonify({
+            "version": current_app.taxonomy.version,
+            "deltas": current_app.taxonomy.log.read(max(0, since))
+        })
+    except ValueError:
+        return jsonify({"error": "since must be an integer"}), 400
+    except Exception as e:
+        logging.error(f"Error reading taxonomy deltas: {e}")
+        return jsonify({"error": "Internal server error"}), 500
+@api_bp.route("/taxonomy/changes", methods=["POST"])
+@taxonomy_writer
+def change_taxonomy():
+    """Apply a batch of add, remove and alias changes as one taxonomy version"""
+    data = request.get_json(silent=True) or {}
+    return _submit_taxonomy_changes(data.get("changes"))
+@api_bp.route("/taxonomy/skills", methods=["POST"])
+@taxonomy_writer
+def add_skills():
+    """Add one skill ({"skill", "category"}) or several ({"skills": [...]})"""
+    data = request.get_json(silent=True) or {}
+    skills = data.get("skills", [data] if data.get("skill") else [])
+    if not isinstance(skills, list) or not all(isinstance(skill, dict) for skill in skills):
+        return jsonify({"error": "skills must be a list of objects"}), 400
+    return _submit_taxonomy_changes([{"op": "add", **skill} for skill in skills])
+@api_bp.route("/taxonomy/skills/<path:skill>", methods=["DELETE"])
+@taxonomy_writer
+def remove_skill(skill):
+    """Remove a skill or alias from the taxonomy"""
+    return _submit_taxonomy_changes([{"op": "remove", "skill": skill}])
+@api_bp.route("/taxonomy/aliases", methods=["POST"])
+@taxonomy_writer
+def add_alias():
+    """Make `alias` resolve to an existing `skill`"""
+    data = request.get_json(silent=True) or {}
+    return _submit_taxonomy_changes([{"op": "alias", "skill": data.get("alias"), "alias_of": data.get("skill")}])
+def _submit_taxonomy_changes(changes):
+    try:
+        delta = current_app.taxonomy.submit(changes)
+        return jsonify({
+            "success": True,
+            "version": delta["version"],
+            "changes": delta["changes"],
+            "skills": current_app.taxonomy.trie.skill_count
+        })
+    except InvalidChange as e:
+        return jsonify({"error": str(e)}), 400
+    except ConcurrentChange as e:
+        return jsonify({"error": str(e)}), 409
+    except Exception as e:
+        logging.error(f"Error changing the skill taxonomy: {e}")
         return jsonify({"error": "Internal server error"}), 500
+@api_bp.route("/index/stats", methods=["GET"])
+def index_stats():
+    """Skill index size"""
+    return jsonify(current_app.skill_index.stats())
+@api_bp.route("/cache/stats", methods=["GET"])
+def cache_stats():
+    """Extraction cache hit/miss counters and occupancy, and the NLP service's skill resolution cache"""
+    stats = current_app.extraction_cache.stats()
+    # Only report the resolution cache of a loaded service; asking must not load spaCy
+    if current_app.models.is_loaded("nlp_service") and hasattr(current_app.nlp_service, "skill_cache"):
+        stats["skill_resolution"] = current_app.nlp_service.skill_cache.stats()
+    return jsonify(stats)
+@api_bp.route("/postings/stats", methods=["GET"])
+def job_profile_stats():
+    """Job profile cache hit/miss counters and the number of registered postings"""
+    return jsonify(current_app.job_profiles.stats())
+@api_bp.route("/models", methods=["GET"])
+def model_stats():
+    """Load state and cold-start time of the shared models in this worker"""
+    return jsonify(current_app.models.stats())
 @api_bp.route("/health", methods=["GET"])
 def health_check():
     """Health check endpoint"""
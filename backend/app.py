@@ -1,67 +1,201 @@
 
-from flask import Flask
+from flask import Flask, Request, Response, abort, current_app, g, request
 from flask_cors import CORS
 import os
 import logging
+import tempfile
+import time
 from config import Config
 from data_structures.skill_trie import SkillTrie
+from data_structures.frozen_trie import FrozenSkillTrie
+from services.cache_service import create_extraction_cache
+from services.extraction_pool import ExtractionPool
+from services.simple_nlp_service import SimpleNLPService
+from services.ingestion_queue import IngestionQueue
+from services.metrics import REQUEST_SECONDS, render_metrics, server_timing
+from services.model_registry import ModelRegistry
+from services.profiler import RequestProfiler
+from services.job_store import JobProfiles
+from services.resume_store import create_resume_store
+from services.skill_index import SkillIndex
+from services.taxonomy_service import TaxonomyManager
 from api.routes import api_bp
 # Configure logging
 logging.basicConfig(
     level=logging.INFO,
     format="%(asctime)s %(levelname)s %(name)s %(message)s"
 )
+def endpoint_content_length(config, endpoint):
+    """Request size limit of an endpoint"""
+    # Bulk ingestion accepts whole archives; every other route keeps the single-file limit
+    if endpoint == "api.ingest_resumes":
+        return config["INGEST_MAX_CONTENT_LENGTH"]
+    return config["MAX_CONTENT_LENGTH"]
+class SpooledRequest(Request):
+    """Request that keeps uploaded files in memory up to UPLOAD_SPOOL_MAX_MEMORY"""
+    @property
+    def max_content_length(self):
+        if current_app:
+            return endpoint_content_length(current_app.config, self.endpoint)
+        return super().max_content_length
+    def _get_file_stream(self, total_content_length, content_type, filename=None, content_length=None):
+        # Only oversize uploads spill, as anonymous temporary files in the upload folder
+        return tempfile.SpooledTemporaryFile(
+            max_size=current_app.config["UPLOAD_SPOOL_MAX_MEMORY"],
+            mode="rb+",
+            dir=current_app.config["UPLOAD_FOLDER"]
+        )
+def load_skill_trie(config):
+    """Map the skill trie snapshot if one is configured, else build the trie from the skills file
+
+    Raises if the skills file cannot be loaded; the taxonomy manager decides what to fall back to.
+    """
+    snapshot = config["SKILL_TRIE_SNAPSHOT"]
+    if snapshot and os.path.exists(snapshot):
+        try:
+            return FrozenSkillTrie.load(snapshot)
+        except Exception as e:
+            logging.warning(f"Could not load skill trie snapshot: {e}")
+    skill_trie = SkillTrie()
+    skill_trie.load_skills_from_file(config["SKILLS_FILE"], strict=True)
+    return skill_trie
+def swap_skill_trie(app, skill_trie):
+    """Point everything that reads the taxonomy at a new trie; plain reference swaps, so requests never wait"""
+    app.models.set("skill_trie", skill_trie)
+    if app.models.is_loaded("nlp_service"):
+        app.nlp_service.skill_trie = skill_trie
+    if app.models.is_loaded("ingestion_queue"):
+        # Process pool workers hold a pickled copy of the old taxonomy
+        app.ingestion_queue.retire_workers()
+def load_tfidf_model(config):
+    """Load the corpus-fitted TF-IDF model, if one has been built"""
+    from algorithms.tfidf_model import TfidfModel
+    if not TfidfModel.exists(config["TFIDF_MODEL_PATH"]):
+        return None
+    try:
+        return TfidfModel.load(config["TFIDF_MODEL_PATH"])
+    except Exception as e:
+        logging.warning(f"Could not load TF-IDF model: {e}")
+        return None
+def load_vector_index(app):
+    """Load the ANN vector index, if one has been built against the loaded TF-IDF model"""
+    from algorithms.vector_index import VectorIndex
+    path = app.config["VECTOR_INDEX_PATH"]
+    if app.tfidf_model is None or not VectorIndex.exists(path):
+        return None
+    try:
+        index = VectorIndex.load(path)
+    except Exception as e:
+        logging.warning(f"Could not load vector index: {e}")
+        return None
+    if index.meta["tfidf_fingerprint"] != app.tfidf_model.version:
+        logging.warning("Vector index was built with a different TF-IDF model; rebuild it")
+        return None
+    return index
+def load_nlp_service(app):
+    """NLP service selected by NLP_BACKEND; "spacy" loads the spaCy pipeline"""
+    if app.config["NLP_BACKEND"] == "spacy":
+        from services.nlp_service import NLPService
+        return NLPService.from_config(app.config, app.skill_trie)
+    # Simplified NLP service for running without spaCy
+    return SimpleNLPService(app.skill_trie)
+def load_ats_scorer():
+    """ATSScorer class; importing it pulls in scikit-learn"""
+    from algorithms.ats_scorer import ATSScorer
+    return ATSScorer
+class ResumeAIApp(Flask):
+    """Flask app whose heavy resources are built lazily by a per-process model registry"""
+    request_class = SpooledRequest
+    taxonomy = ModelRegistry.resource("taxonomy")
+    skill_trie = ModelRegistry.resource("skill_trie")
+    tfidf_model = ModelRegistry.resource("tfidf_model")
+    vector_index = ModelRegistry.resource("vector_index")
+    nlp_service = ModelRegistry.resource("nlp_service")
+    ats_scorer = ModelRegistry.resource("ats_scorer")
+    extraction_cache = ModelRegistry.resource("extraction_cache")
+    skill_index = ModelRegistry.resource("skill_index")
+    ingestion_queue = ModelRegistry.resource("ingestion_queue")
+    resume_store = ModelRegistry.resource("resume_store")
+    job_profiles = ModelRegistry.resource("job_profiles")
 def create_app():
     """Application factory pattern"""
-    app = Flask(__name__)
+    app = ResumeAIApp(__name__)
     app.config.from_object(Config)
     # Enable CORS
     CORS(app, origins=app.config["CORS_ORIGINS"])
     # Create upload folder if it doesn"t exist
     os.makedirs(app.config["UPLOAD_FOLDER"], exist_ok=True)
-    # Initialize skill trie
-    app.skill_trie = SkillTrie()
-    try:
-        app.skill_trie.load_skills_from_file("data/skills.json")
-    except Exception as e:
-        logging.warning(f"Could not load skills file: {e}")
-        # Create some default skills for testing
-        default_skills = ["python", "javascript", "react", "flask", "sql", "machine learning"]
-        for skill in default_skills:
-            app.skill_trie.insert(skill)
-    # Initialize NLP service (simplified for testing without spaCy)
-    class SimpleNLPService:
-        def __init__(self, skill_trie):
-            self.skill_trie = skill_trie
-        
-        def extract_entities(self, text):
-            import re
-            # Simple entity extraction without spaCy
-            entities = {
-                'PERSON': [],
-                'ORG': [],
-                'SKILL': [],
-                'EMAIL': re.findall(r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b', text),
-                'PHONE': re.findall(r'\b\d{3}[-.]?\d{3}[-.]?\d{4}\b', text),
-                'LINKEDIN': re.findall(r'linkedin\.com/in/[\w-]+', text.lower()),
-                'EDUCATION': [],
-                'EXPERIENCE': []
-            }
-            
-            # Simple skill extraction
-            words = text.lower().split()
-            for word in words:
-                if self.skill_trie.search(word):
-                    entities['SKILL'].append(word)
-            
-            return entities
-    
-    app.nlp_service = SimpleNLPService(app.skill_trie)
+    # Heavy resources load on first use, once per process; see PRELOAD_MODELS
+    app.models = ModelRegistry()
+    # The skill taxonomy follows its delta log and is swapped in place of skill_trie on every change
+    app.models.register("taxonomy", lambda: TaxonomyManager.from_config(
+        app.config, lambda: load_skill_trie(app.config), on_swap=lambda skill_trie: swap_skill_trie(app, skill_trie)
+    ))
+    app.models.register("skill_trie", lambda: app.taxonomy.trie)
+    app.models.register("tfidf_model", lambda: load_tfidf_model(app.config))
+    app.models.register("vector_index", lambda: load_vector_index(app))
+    app.models.register("nlp_service", lambda: load_nlp_service(app))
+    app.models.register("ats_scorer", load_ats_scorer)
+    # Cache extracted text and entities by upload content hash
+    app.models.register("extraction_cache", lambda: create_extraction_cache(app.config))
+    # Skill -> resume inverted index for candidate retrieval
+    app.models.register("skill_index", lambda: SkillIndex.from_config(app.config, lambda: app.skill_trie))
+    # Processed resumes, so scoring can take a resume id instead of the whole parsed resume
+    app.models.register("resume_store", lambda: create_resume_store(app.config))
+    # Job descriptions parsed once into profiles, cached by text and stored by posting id
+    app.models.register("job_profiles", lambda: JobProfiles.from_config(
+        app.config, app.resume_store, lambda: app.skill_trie, lambda: app.tfidf_model
+    ))
+    # Bulk ingestion jobs run on their own bounded worker pool
+    app.models.register("ingestion_queue", lambda: IngestionQueue.from_config(
+        app.config, app.nlp_service, app.extraction_cache, app.skill_index, app.resume_store
+    ))
+    # Large PDFs are extracted in parallel page ranges by a per-worker process pool
+    app.extraction_pool = ExtractionPool.from_config(app.config)
+    if app.config["PRELOAD_MODELS"]:
+        # Under gunicorn --preload this runs in the master, before workers fork
+        app.models.preload()
+    @app.before_request
+    def follow_taxonomy():
+        # Watcher threads do not survive the fork, so each worker starts its own
+        app.taxonomy.ensure_watching()
+    # Opt-in cProfile dumps of single requests; see PROFILE_ENABLED
+    profiler = RequestProfiler.from_config(app.config)
+    @app.before_request
+    def start_request():
+        g.request_start = time.perf_counter()
+        if profiler.wanted(request.headers):
+            g.profile = profiler.start()
+    @app.after_request
+    def finish_request(response):
+        profile = g.pop("profile", None)
+        if profile is not None:
+            profile_file = profiler.stop(profile, request.endpoint)
+            if profile_file:
+                response.headers["X-Profile-File"] = profile_file
+        if app.config["METRICS_ENABLED"]:
+            elapsed = time.perf_counter() - g.get("request_start", time.perf_counter())
+            REQUEST_SECONDS.labels(request.endpoint or "unmatched", request.method, response.status_code).observe(elapsed)
+            if g.get("stage_timings"):
+                response.headers["Server-Timing"] = server_timing(g.stage_timings)
+        return response
     # Register blueprints
     app.register_blueprint(api_bp, url_prefix="/api")
     @app.route("/health")
     def health_check():
-        return {"status": "healthy", "skills_loaded": app.skill_trie.skill_count}
+        return {
+            "status": "healthy",
+            "skills_loaded": app.skill_trie.skill_count,
+            "taxonomy_version": app.taxonomy.version,
+            "taxonomy_error": app.taxonomy.base_error
+        }
+    @app.route("/metrics")
+    def metrics():
+        """Prometheus metrics, merged across gunicorn workers"""
+        if not app.config["METRICS_ENABLED"]:
+            abort(404)
+        body, content_type = render_metrics()
+        return Response(body, content_type=content_type)
     return app
 if __name__ == "__main__":
     app = create_app()
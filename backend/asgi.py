@@ -0,0 +1,232 @@
+import asyncio
+import contextvars
+import json
+import logging
+import os
+import sys
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from werkzeug.exceptions import HTTPException
+from app import create_app, endpoint_content_length
+from services.metrics import count_rejection
+# Answered on their own threads, never queued behind uploads, so probes and scrapes stay fast under load
+PRIORITY_PATHS = ("/health", "/api/health", "/metrics")
+class BodyTooLarge(Exception):
+    """Raised when a request body exceeds the size limit of its endpoint"""
+class ClientDisconnected(Exception):
+    """Raised when the client goes away before its request body has arrived"""
+class AsyncResumeAI:
+    """ASGI front end for the Flask app
+
+    Request bodies are read on the event loop into a spooled file, so a slow
+    client holds no thread while it uploads. The Flask app then handles the
+    buffered request on a bounded pool of `max_threads` threads, with the same
+    routes and responses as under gunicorn. At most `max_pending` requests
+    are admitted at once (reading, waiting or running); beyond that requests
+    get 429. An admitted request that waits more than `queue_timeout` seconds
+    for a thread gets 503. Health checks and metrics skip both limits.
+    """
+    def __init__(self, app, max_threads=8, max_pending=64, queue_timeout=10.0, retry_after=1):
+        self.app = app
+        self.max_threads = max_threads
+        self.max_pending = max_pending
+        self.queue_timeout = queue_timeout
+        self.retry_after = retry_after
+        self.pending = 0
+        self._slots = None
+        self._executor = None
+        self._priority_executor = None
+        self._executor_pid = None
+        self._lock = threading.Lock()
+    @classmethod
+    def from_config(cls, app):
+        return cls(
+            app,
+            max_threads=app.config["ASGI_THREADS"],
+            max_pending=app.config["ASGI_MAX_PENDING"],
+            queue_timeout=app.config["ASGI_QUEUE_TIMEOUT"],
+            retry_after=app.config["ASGI_RETRY_AFTER"]
+        )
+    def _get_executors(self):
+        # Created on first use, so every worker process gets its own threads and semaphore
+        if self._executor is None or self._executor_pid != os.getpid():
+            with self._lock:
+                if self._executor is None or self._executor_pid != os.getpid():
+                    self._executor = ThreadPoolExecutor(self.max_threads, thread_name_prefix="asgi")
+                    self._priority_executor = ThreadPoolExecutor(2, thread_name_prefix="asgi-priority")
+                    self._slots = asyncio.Semaphore(self.max_threads)
+                    self.pending = 0
+                    self._executor_pid = os.getpid()
+        return self._executor, self._priority_executor
+    def shutdown(self):
+        for executor in (self._executor, self._priority_executor):
+            if executor is not None:
+                executor.shutdown(wait=False, cancel_futures=True)
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "lifespan":
+            await self._lifespan(receive, send)
+        elif scope["type"] == "http":
+            await self._http(scope, receive, send)
+        else:
+            raise ValueError(f"Unsupported ASGI scope type: {scope['type']}")
+    async def _lifespan(self, receive, send):
+        while True:
+            message = await receive()
+            if message["type"] == "lifespan.startup":
+                self._get_executors()
+                await send({"type": "lifespan.startup.complete"})
+            elif message["type"] == "lifespan.shutdown":
+                self.shutdown()
+                await send({"type": "lifespan.shutdown.complete"})
+                return
+    async def _http(self, scope, receive, send):
+        executor, priority_executor = self._get_executors()
+        if scope["path"] in PRIORITY_PATHS:
+            await self._handle(scope, receive, send, priority_executor, wait_for_slot=False)
+            return
+        if self.pending >= self.max_pending:
+            count_rejection("queue_full")
+            await self._reject(send, 429, "Too many requests in progress, retry later")
+            return
+        self.pending += 1
+        try:
+            await self._handle(scope, receive, send, executor, wait_for_slot=True)
+        finally:
+            self.pending -= 1
+    async def _handle(self, scope, receive, send, executor, wait_for_slot):
+        try:
+            body = await self._read_body(receive, self._content_limit(scope))
+        except BodyTooLarge:
+            await self._reject(send, 413, "Request entity too large", retry=False)
+            return
+        except ClientDisconnected:
+            return
+        try:
+            if not wait_for_slot:
+                await self._respond(scope, body, send, executor)
+                return
+            try:
+                await asyncio.wait_for(self._slots.acquire(), self.queue_timeout)
+            except asyncio.TimeoutError:
+                count_rejection("queue_timeout")
+                await self._reject(send, 503, "Server overloaded, retry later")
+                return
+            try:
+                await self._respond(scope, body, send, executor)
+            finally:
+                self._slots.release()
+        finally:
+            body.close()
+    def _content_limit(self, scope):
+        """Body size limit of the Flask endpoint this request is routed to"""
+        try:
+            endpoint, _ = self.app.url_map.bind("localhost").match(scope["path"], method=scope["method"])
+        except HTTPException:
+            endpoint = None
+        return endpoint_content_length(self.app.config, endpoint)
+    async def _read_body(self, receive, limit):
+        """Request body, in memory up to UPLOAD_SPOOL_MAX_MEMORY and in a temporary file beyond"""
+        body = tempfile.SpooledTemporaryFile(
+            max_size=self.app.config["UPLOAD_SPOOL_MAX_MEMORY"], mode="w+b", dir=self.app.config["UPLOAD_FOLDER"]
+        )
+        size = 0
+        more_body = True
+        try:
+            while more_body:
+                message = await receive()
+                if message["type"] == "http.disconnect":
+                    raise ClientDisconnected()
+                chunk = message.get("body", b"")
+                size += len(chunk)
+                if limit is not None and size > limit:
+                    raise BodyTooLarge(f"Request body over {limit} bytes")
+                body.write(chunk)
+                more_body = message.get("more_body", False)
+        except Exception:
+            body.close()
+            raise
+        body.seek(0)
+        return body
+    async def _respond(self, scope, body, send, executor):
+        """Run the Flask app on executor and send its response, chunk by chunk if it streams"""
+        loop = asyncio.get_running_loop()
+        # Flask's request context lives in context variables, and a streamed response pops it from its last
+        # chunk; every step of this request runs in one context, whichever executor thread picks it up
+        context = contextvars.copy_context()
+        def run(fn, *args):
+            return loop.run_in_executor(executor, context.run, fn, *args)
+        response = {}
+        def start_response(status, headers, exc_info=None):
+            response["status"] = int(status.split(" ", 1)[0])
+            response["headers"] = [(name.lower().encode("latin-1"), value.encode("latin-1")) for name, value in headers]
+        def first_chunk():
+            iterable = self.app(self._environ(scope, body), start_response)
+            chunks = iter(iterable)
+            return iterable, chunks, next(chunks, b"")
+        iterable, chunks, chunk = await run(first_chunk)
+        try:
+            await send({"type": "http.response.start", "status": response["status"], "headers": response["headers"]})
+            # Each further chunk of a streamed response is produced on the executor, never on the loop
+            while True:
+                following = await run(next, chunks, None)
+                await send({"type": "http.response.body", "body": chunk, "more_body": following is not None})
+                if following is None:
+                    break
+                chunk = following
+        finally:
+            if hasattr(iterable, "close"):
+                await run(iterable.close)
+    @staticmethod
+    def _environ(scope, body):
+        """WSGI environ for an ASGI HTTP scope with a buffered body"""
+        server = scope.get("server") or ("localhost", 80)
+        # The whole body is buffered, so its real size is known even for chunked requests
+        body.seek(0, 2)
+        content_length = body.tell()
+        body.seek(0)
+        client = scope.get("client") or ("", 0)
+        environ = {
+            "REQUEST_METHOD": scope["method"],
+            "SCRIPT_NAME": scope.get("root_path", "").encode("utf-8").decode("latin-1"),
+            "PATH_INFO": scope["path"].encode("utf-8").decode("latin-1"),
+            "QUERY_STRING": scope.get("query_string", b"").decode("latin-1"),
+            "SERVER_NAME": server[0],
+            "SERVER_PORT": str(server[1]),
+            "SERVER_PROTOCOL": f"HTTP/{scope.get('http_version', '1.1')}",
+            "REMOTE_ADDR": client[0],
+            "REMOTE_PORT": str(client[1]),
+            "wsgi.version": (1, 0),
+            "wsgi.url_scheme": scope.get("scheme", "http"),
+            "wsgi.input": body,
+            "wsgi.input_terminated": True,
+            "wsgi.errors": sys.stderr,
+            "wsgi.multithread": True,
+            "wsgi.multiprocess": True,
+            "wsgi.run_once": False,
+        }
+        for name, value in scope.get("headers", []):
+            name = name.decode("latin-1").upper().replace("-", "_")
+            value = value.decode("latin-1")
+            if name == "CONTENT_TYPE":
+                environ[name] = value
+                continue
+            if name == "CONTENT_LENGTH":
+                continue
+            key = f"HTTP_{name}"
+            environ[key] = f"{environ[key]},{value}" if key in environ else value
+        environ["CONTENT_LENGTH"] = str(content_length)
+        return environ
+    async def _reject(self, send, status, message, retry=True):
+        headers = [(b"content-type", b"application/json")]
+        if retry:
+            headers.append((b"retry-after", str(self.retry_after).encode()))
+        await send({"type": "http.response.start", "status": status, "headers": headers})
+        await send({"type": "http.response.body", "body": json.dumps({"error": message}).encode()})
+def create_asgi_app():
+    """ASGI application factory: the Flask app behind an async, backpressured front end"""
+    app = create_app()
+    logging.info(
+        f"ASGI serving with {app.config['ASGI_THREADS']} threads and {app.config['ASGI_MAX_PENDING']} pending requests"
+    )
+    return AsyncResumeAI.from_config(app)
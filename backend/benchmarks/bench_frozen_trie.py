@@ -0,0 +1,85 @@
+"""Benchmark memory, load time and lookup latency of the dict SkillTrie vs FrozenSkillTrie.
+
+Run from the backend directory:
+    python -m benchmarks.bench_frozen_trie --sizes 10000 100000
+"""
+import argparse
+import json
+import os
+import random
+import tempfile
+import time
+import tracemalloc
+from data_structures.frozen_trie import FrozenSkillTrie
+from data_structures.skill_trie import SkillTrie
+from benchmarks.harness import synthetic_skills, typo, time_call, report
+CATEGORIES = ["programming", "web", "data", "cloud", "devops", "soft skills"]
+def measure(build):
+    """Build something and return it with its load time and retained Python heap in MB"""
+    tracemalloc.start()
+    start = time.perf_counter()
+    value = build()
+    seconds = time.perf_counter() - start
+    retained, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return value, round(seconds, 4), round(retained / 1024 / 1024, 2)
+def lookups(trie, queries, fuzzy):
+    def run():
+        for query in queries:
+            trie.search(query)
+    def run_fuzzy():
+        for query in fuzzy:
+            trie.fuzzy_search(query, max_distance=1, top_k=1)
+    return run, run_fuzzy
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10000, 100000])
+    parser.add_argument("--queries", type=int, default=2000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+    rng = random.Random(0)
+    results = []
+    with tempfile.TemporaryDirectory() as directory:
+        for size in args.sizes:
+            skills = synthetic_skills(size, seed=size)
+            skills_file = os.path.join(directory, f"skills-{size}.json")
+            with open(skills_file, "w", encoding="utf-8") as f:
+                json.dump([{"skill": skill, "category": rng.choice(CATEGORIES)} for skill in skills], f)
+            def build_dict_trie():
+                trie = SkillTrie()
+                trie.load_skills_from_file(skills_file)
+                return trie
+            trie, dict_seconds, dict_mb = measure(build_dict_trie)
+            snapshot = os.path.join(directory, f"skills-{size}.trie")
+            FrozenSkillTrie.save(trie, snapshot)
+            frozen, frozen_seconds, frozen_mb = measure(lambda: FrozenSkillTrie.load(snapshot))
+            queries = [rng.choice(skills) if rng.random() < 0.5 else typo(rng.choice(skills), rng)
+                       for _ in range(args.queries)]
+            fuzzy = queries[:max(1, args.queries // 10)]
+            assert frozen.get_all_skills() == trie.get_all_skills()
+            assert all(frozen.search(query) == trie.search(query) for query in queries)
+            assert all(frozen.fuzzy_search(query, 1, 1) == trie.fuzzy_search(query, 1, 1) for query in fuzzy)
+            dict_search, dict_fuzzy = lookups(trie, queries, fuzzy)
+            frozen_search, frozen_fuzzy = lookups(frozen, queries, fuzzy)
+            results.append({
+                "skills": size,
+                "nodes": frozen.node_count,
+                "dict_trie": {
+                    "load_seconds": dict_seconds,
+                    "heap_mb": dict_mb,
+                    "search_us": round(time_call(dict_search, args.repeat)["median_ms"] * 1000 / len(queries), 3),
+                    "fuzzy_us": round(time_call(dict_fuzzy, args.repeat)["median_ms"] * 1000 / len(fuzzy), 3),
+                    "get_all_skills_ms": time_call(trie.get_all_skills, args.repeat)["median_ms"],
+                },
+                "frozen_trie": {
+                    "load_seconds": frozen_seconds,
+                    "heap_mb": frozen_mb,
+                    "mapped_mb": round(os.path.getsize(snapshot) / 1024 / 1024, 2),
+                    "search_us": round(time_call(frozen_search, args.repeat)["median_ms"] * 1000 / len(queries), 3),
+                    "fuzzy_us": round(time_call(frozen_fuzzy, args.repeat)["median_ms"] * 1000 / len(fuzzy), 3),
+                    "get_all_skills_ms": time_call(frozen.get_all_skills, args.repeat)["median_ms"],
+                },
+            })
+    report("frozen_trie", results)
+if __name__ == "__main__":
+    main()
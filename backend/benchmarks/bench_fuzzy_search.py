@@ -0,0 +1,81 @@
+"""Benchmark SkillTrie.fuzzy_search against the previous three-way DFS.
+
+Run from the backend directory:
+    python -m benchmarks.bench_fuzzy_search --sizes 1000 10000 100000
+"""
+import argparse
+import random
+from data_structures.skill_trie import SkillTrie
+from benchmarks.harness import synthetic_skills, typo, time_call, report
+def legacy_fuzzy_search(trie, term, max_distance=1):
+    """Previous implementation: branch on every edit and sort all matches"""
+    results = []
+    def dfs(node, current_word, remaining_term, distance):
+        if distance > max_distance:
+            return
+        if node.is_end and distance <= max_distance:
+            results.append((current_word, distance))
+        if not remaining_term:
+            for char, child_node in node.children.items():
+                dfs(child_node, current_word + char, "", distance + 1)
+            return
+        current_char = remaining_term[0]
+        remaining = remaining_term[1:]
+        if current_char in node.children:
+            dfs(node.children[current_char], current_word + current_char, remaining, distance)
+        for char, child_node in node.children.items():
+            if char != current_char:
+                dfs(child_node, current_word + char, remaining, distance + 1)
+        for char, child_node in node.children.items():
+            dfs(child_node, current_word + char, remaining_term, distance + 1)
+        dfs(node, current_word, remaining, distance + 1)
+    dfs(trie.root, "", term.lower(), 0)
+    return sorted(results, key=lambda x: x[1])[:5]
+def build_queries(skills, count, rng):
+    """Mix of exact skills, one-edit typos and ordinary resume words"""
+    filler = ["experience", "developed", "team", "managed", "project", "using", "senior"]
+    queries = []
+    for i in range(count):
+        kind = i % 3
+        if kind == 0:
+            queries.append(rng.choice(skills))
+        elif kind == 1:
+            queries.append(typo(rng.choice(skills), rng))
+        else:
+            queries.append(rng.choice(filler))
+    return queries
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 100000])
+    parser.add_argument("--queries", type=int, default=90)
+    parser.add_argument("--max-distances", type=int, nargs="+", default=[1, 2])
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+    rng = random.Random(42)
+    results = []
+    for size in args.sizes:
+        trie = SkillTrie()
+        skills = synthetic_skills(size, seed=size)
+        for skill in skills:
+            trie.insert(skill)
+        queries = build_queries(skills, args.queries, rng)
+        for max_distance in args.max_distances:
+            legacy = time_call(
+                lambda: [legacy_fuzzy_search(trie, q, max_distance) for q in queries],
+                repeat=args.repeat,
+            )
+            automaton = time_call(
+                lambda: [trie.fuzzy_search(q, max_distance) for q in queries],
+                repeat=args.repeat,
+            )
+            results.append({
+                "taxonomy_size": size,
+                "queries": len(queries),
+                "max_distance": max_distance,
+                "legacy_dfs": legacy,
+                "levenshtein_automaton": automaton,
+                "speedup": round(legacy["median_ms"] / automaton["median_ms"], 2),
+            })
+    report("fuzzy_search", results)
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+"""Benchmark scoring resumes against the same job description with and without its cached JobProfile.
+
+"split" is the old job data, every word of the description a required skill; "parsed" parses the description on
+every call; "cached" serves its profile from JobProfiles, as repeat requests for one posting do.
+Run from the backend directory:
+    python -m benchmarks.bench_job_profile --jobs 20 --resumes 200 --skills 2000
+"""
+import argparse
+import random
+import time
+from algorithms.ats_scorer import ATSScorer
+from algorithms.job_profile import JobProfile
+from data_structures.skill_trie import SkillTrie
+from services.job_store import JobProfiles, SQLiteJobStore
+from benchmarks.corpus import job_description, resume_text
+from benchmarks.harness import synthetic_skills, percentiles, report
+def split_job_data(description):
+    return {"description": description, "skills": description.split(), "min_experience": 0, "required_education": []}
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--jobs", type=int, default=20)
+    parser.add_argument("--resumes", type=int, default=200)
+    parser.add_argument("--skills", type=int, default=2000)
+    parser.add_argument("--output", type=argparse.FileType("w"), default=None)
+    args = parser.parse_args()
+    skills = synthetic_skills(args.skills, seed=0)
+    trie = SkillTrie()
+    for skill in skills:
+        trie.insert(skill, {"category": "synthetic"})
+    rng = random.Random(0)
+    jobs = [job_description(rng, skills) for _ in range(args.jobs)]
+    resumes = []
+    for index in range(args.resumes):
+        text = resume_text(rng.choice((30, 110)), seed=index, skills=skills)
+        resumes.append({"text": text, "skills": trie.scanner().find_skills(text), "experience": [], "education": []})
+    profiles = JobProfiles(SQLiteJobStore(":memory:"), lambda: trie, lambda: None)
+    scorer = ATSScorer()
+    modes = {
+        "split": lambda description: split_job_data(description),
+        "parsed": lambda description: JobProfile.parse(description, trie.scanner()).job_data(),
+        "cached": lambda description: profiles.profile(description).job_data(),
+    }
+    results = []
+    for mode, job_data_for in modes.items():
+        samples, skill_counts, skills_match = [], [], []
+        for job in jobs:
+            for resume in resumes:
+                start = time.perf_counter()
+                job_data = job_data_for(job["description"])
+                result = scorer.calculate_ats_score(resume, job_data)
+                samples.append((time.perf_counter() - start) * 1000)
+                skills_match.append(result["component_scores"]["skills_match"])
+            skill_counts.append(len(job_data["skills"]))
+        results.append({
+            "mode": mode,
+            "jobs": args.jobs,
+            "scores": len(samples),
+            "mean_job_skills": round(sum(skill_counts) / len(skill_counts), 1),
+            "mean_skills_match": round(sum(skills_match) / len(skills_match), 2),
+            "mean_ms": round(sum(samples) / len(samples), 4),
+            **percentiles(samples),
+        })
+    results.append({"mode": "cache_stats", **profiles.stats()})
+    report("job_profile", results, args.output)
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,204 @@
+"""Load-test the upload and scoring endpoints of create_app() with concurrent clients.
+
+Drives the app in process through the Flask test client, or a local gunicorn over HTTP. Uploads cycle through
+synthetic PDF, DOCX and TXT resumes of every length; score requests post their extracted text against synthetic
+job descriptions. Every writable path (uploads, skill index, resume store, taxonomy log, metrics) goes to a
+temporary directory.
+Run from the backend directory:
+    python -m benchmarks.bench_load --target client --requests 500 --concurrency 8
+    python -m benchmarks.bench_load --target gunicorn --workers 4 --requests 2000 --concurrency 32
+    python -m benchmarks.bench_load --target gunicorn --asgi --workers 4 --requests 2000 --concurrency 32
+"""
+import argparse
+import http.client
+import json
+import os
+import random
+import signal
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import urllib.request
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from benchmarks.corpus import FORMATS, LENGTHS, job_description, resume_file, resume_text
+from benchmarks.harness import synthetic_skills, percentiles, report
+CONTENT_TYPES = {
+    "pdf": "application/pdf",
+    "docx": "application/vnd.openxmlformats-officedocument.wordprocessingml.document",
+    "txt": "text/plain",
+}
+def isolated_env(directory, args):
+    """Environment for the app under test, writing only inside directory"""
+    os.makedirs(os.path.join(directory, "metrics"))
+    return {
+        "UPLOAD_FOLDER": os.path.join(directory, "uploads"),
+        "SKILL_INDEX_PATH": os.path.join(directory, "skill_index.db"),
+        "RESUME_STORE": "sqlite",
+        "RESUME_STORE_PATH": os.path.join(directory, "resumes.db"),
+        "TAXONOMY_BACKEND": "file",
+        "TAXONOMY_LOG_PATH": os.path.join(directory, "taxonomy_deltas.jsonl"),
+        "EXTRACTION_CACHE_BACKEND": args.cache,
+        "INGEST_JOB_STORE": "memory",
+        "NLP_BACKEND": args.nlp_backend,
+        "PROMETHEUS_MULTIPROC_DIR": os.path.join(directory, "metrics"),
+    }
+def multipart(field, filename, data, content_type):
+    """Encode one file as a multipart/form-data body"""
+    boundary = uuid.uuid4().hex
+    body = (
+        f"--{boundary}\r\nContent-Disposition: form-data; name=\"{field}\"; filename=\"{filename}\"\r\n"
+        f"Content-Type: {content_type}\r\n\r\n"
+    ).encode() + data + f"\r\n--{boundary}--\r\n".encode()
+    return body, f"multipart/form-data; boundary={boundary}"
+def workload(count, score_ratio, formats, lengths, seed=0):
+    """(endpoint, path, body, content type) requests, uploads and scores interleaved at random"""
+    rng = random.Random(seed)
+    skills = synthetic_skills(200, seed=seed)
+    jobs = [job_description(rng, skills) for _ in range(10)]
+    # A few distinct files per format and length, so cached and uncached extraction both show up
+    uploads = []
+    for length in lengths:
+        for file_format in formats:
+            for variant in range(3):
+                data = resume_file(file_format, LENGTHS[length], seed=seed + variant, skills=skills)
+                uploads.append(multipart("resume", f"resume_{length}_{variant}.{file_format}", data,
+                                         CONTENT_TYPES[file_format]))
+    texts = [resume_text(LENGTHS[length], seed=seed + variant, skills=skills) for length in lengths for variant in range(3)]
+    requests = []
+    for _ in range(count):
+        if rng.random() < score_ratio:
+            job = rng.choice(jobs)
+            text = rng.choice(texts)
+            payload = {
+                "resume_data": {"text": text, "skills": rng.sample(skills, 12), "experience": text.split("\n")[4:12]},
+                "job_description": job["description"],
+                "min_experience": job["min_experience"],
+                "required_education": job["required_education"],
+            }
+            requests.append(("score", "/api/score", json.dumps(payload).encode(), "application/json"))
+        else:
+            body, content_type = rng.choice(uploads)
+            requests.append(("upload", "/api/upload", body, content_type))
+    return requests
+class ClientTarget:
+    """create_app() in this process, one Flask test client per thread"""
+    name = "client"
+    def __init__(self, env, args):
+        # Config reads the environment when it is first imported
+        os.environ.update(env)
+        from app import create_app
+        self.app = create_app()
+        self.local = threading.local()
+    def request(self, path, body, content_type):
+        client = getattr(self.local, "client", None)
+        if client is None:
+            client = self.local.client = self.app.test_client()
+        return client.post(path, data=body, headers={"Content-Type": content_type}).status_code
+    def close(self):
+        pass
+class GunicornTarget:
+    """A local gunicorn running gunicorn.conf.py, one HTTP connection per request"""
+    def __init__(self, env, args):
+        self.name = "gunicorn_asgi" if args.asgi else "gunicorn"
+        self.host, self.port = "127.0.0.1", args.port
+        # --asgi serves asgi.py on uvicorn workers instead of the Flask app on sync workers
+        serving = ["-k", "uvicorn.workers.UvicornWorker", "asgi:create_asgi_app()"] if args.asgi else ["app:create_app()"]
+        self.server = subprocess.Popen(
+            [sys.executable, "-m", "gunicorn", "--config", "gunicorn.conf.py", *serving],
+            env=dict(os.environ, **env, GUNICORN_WORKERS=str(args.workers), GUNICORN_BIND=f"{self.host}:{self.port}"),
+            stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+        )
+        self.wait_ready(args.timeout)
+    def wait_ready(self, timeout):
+        start = time.perf_counter()
+        while time.perf_counter() - start < timeout:
+            if self.server.poll() is not None:
+                raise RuntimeError(f"gunicorn exited with status {self.server.returncode}")
+            try:
+                with urllib.request.urlopen(f"http://{self.host}:{self.port}/health", timeout=1) as response:
+                    if response.status == 200:
+                        return
+            except OSError:
+                pass
+            time.sleep(0.05)
+        raise TimeoutError(f"Server not ready after {timeout}s")
+    def request(self, path, body, content_type):
+        connection = http.client.HTTPConnection(self.host, self.port, timeout=60)
+        try:
+            connection.request("POST", path, body=body, headers={"Content-Type": content_type})
+            response = connection.getresponse()
+            response.read()
+            return response.status
+        finally:
+            connection.close()
+    def close(self):
+        self.server.send_signal(signal.SIGTERM)
+        self.server.wait(timeout=30)
+TARGETS = {"client": ClientTarget, "gunicorn": GunicornTarget}
+def timed(target, request):
+    endpoint, path, body, content_type = request
+    start = time.perf_counter()
+    try:
+        status = target.request(path, body, content_type)
+    except Exception:
+        status = 0
+    return endpoint, status, (time.perf_counter() - start) * 1000
+def summarize(target, endpoint, samples, elapsed, concurrency):
+    statuses = {}
+    for _, status, _ in samples:
+        statuses[str(status)] = statuses.get(str(status), 0) + 1
+    latencies = [latency for _, _, latency in samples]
+    return {
+        "target": target,
+        "endpoint": endpoint,
+        "concurrency": concurrency,
+        "requests": len(samples),
+        "errors": sum(status != 200 for _, status, _ in samples),
+        "statuses": statuses,
+        "requests_per_second": round(len(samples) / elapsed, 2),
+        "mean_ms": round(sum(latencies) / len(latencies), 4),
+        **percentiles(latencies),
+    }
+def run(target, requests, concurrency, warmup):
+    # Warm-up requests load the models and fill the per-thread clients; they are not measured
+    with ThreadPoolExecutor(concurrency) as executor:
+        list(executor.map(lambda request: timed(target, request), requests[:warmup]))
+        start = time.perf_counter()
+        samples = list(executor.map(lambda request: timed(target, request), requests[warmup:]))
+        elapsed = time.perf_counter() - start
+    results = [summarize(target.name, "all", samples, elapsed, concurrency)]
+    for endpoint in sorted({endpoint for endpoint, _, _ in samples}):
+        results.append(summarize(target.name, endpoint, [sample for sample in samples if sample[0] == endpoint],
+                                 elapsed, concurrency))
+    return results
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--target", default="client", choices=list(TARGETS))
+    parser.add_argument("--requests", type=int, default=500)
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 8])
+    parser.add_argument("--score-ratio", type=float, default=0.5, help="Share of requests that are /api/score")
+    parser.add_argument("--formats", nargs="+", default=list(FORMATS), choices=list(FORMATS))
+    parser.add_argument("--lengths", nargs="+", default=list(LENGTHS), choices=list(LENGTHS))
+    parser.add_argument("--cache", default="none", choices=["none", "memory", "redis", "auto"],
+                        help="EXTRACTION_CACHE_BACKEND; none measures extraction on every upload")
+    parser.add_argument("--nlp-backend", default="simple", choices=["simple", "spacy"])
+    parser.add_argument("--warmup", type=int, default=10)
+    parser.add_argument("--workers", type=int, default=2, help="gunicorn workers")
+    parser.add_argument("--asgi", action="store_true", help="gunicorn target: serve the ASGI app on uvicorn workers")
+    parser.add_argument("--port", type=int, default=5098)
+    parser.add_argument("--timeout", type=float, default=120)
+    parser.add_argument("--output", type=argparse.FileType("w"), default=None)
+    args = parser.parse_args()
+    requests = workload(args.requests + args.warmup, args.score_ratio, args.formats, args.lengths)
+    with tempfile.TemporaryDirectory(prefix="bench-load-") as directory:
+        target = TARGETS[args.target](isolated_env(directory, args), args)
+        try:
+            results = [row for concurrency in args.concurrency for row in run(target, requests, concurrency, args.warmup)]
+        finally:
+            target.close()
+    report("load", results, args.output)
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+"""Benchmark ranking M jobs against N resumes: one rank_many call per job against the blocked MatrixRanker.
+
+Resumes are generated as they are consumed, so peak memory reflects the ranker rather than the input. The
+per-job baseline runs on the first --baseline-resumes resumes only and is scaled to pairs per second.
+Run from the backend directory:
+    python -m benchmarks.bench_matrix --jobs 100 --resumes 20000 --workers 1 4
+    python -m benchmarks.bench_matrix --jobs 500 --resumes 200000 --workers 8 --baseline-resumes 0
+"""
+import argparse
+import random
+import re
+import resource
+import time
+from algorithms.ats_scorer import ATSScorer
+from algorithms.matrix_ranker import MatrixRanker, job_data_from
+from benchmarks.corpus import job_description, resume_text
+from benchmarks.harness import synthetic_skills, report
+def iter_resumes(count, skills, seed=0):
+    rng = random.Random(seed)
+    for index in range(count):
+        text = resume_text(rng.choice((30, 110)), seed=seed + index, skills=skills)
+        lines = text.split("\n")
+        yield {
+            "id": f"resume-{index}",
+            "text": text,
+            "skills": [skill for skill in skills if skill in text],
+            "experience": [line for line in lines if re.search(r"\d", line)],
+            "education": [line for line in lines if "Bachelor" in line or "Master" in line],
+        }
+def peak_rss_mb():
+    """Peak resident memory of this process in MB (Linux reports kilobytes)"""
+    return round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1)
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--jobs", type=int, default=100)
+    parser.add_argument("--resumes", type=int, default=20000)
+    parser.add_argument("--top-k", type=int, default=50)
+    parser.add_argument("--per-candidate", type=int, default=0)
+    parser.add_argument("--block-size", type=int, default=1024)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1])
+    parser.add_argument("--baseline-resumes", type=int, default=1000, help="Resumes for the per-job baseline; 0 skips it")
+    parser.add_argument("--output", type=argparse.FileType("w"), default=None)
+    args = parser.parse_args()
+    skills = synthetic_skills(200, seed=0)
+    rng = random.Random(0)
+    jobs = [{"id": f"job-{index}", **job_description(rng, skills)} for index in range(args.jobs)]
+    weights = ATSScorer().weights
+    results = []
+    if args.baseline_resumes:
+        resumes = list(iter_resumes(args.baseline_resumes, skills))
+        scorer = ATSScorer()
+        start = time.perf_counter()
+        expected = {job["id"]: scorer.rank_many([dict(resume) for resume in resumes], job_data_from(job))[:args.top_k]
+                    for job in jobs}
+        seconds = time.perf_counter() - start
+        ranked = [row for row in MatrixRanker(jobs, weights, top_k=args.top_k).rank(resumes) if row["by"] == "job"]
+        same = all(
+            [row["total_score"] for row in ranked if row["job_id"] == job_id] ==
+            [result["total_score"] for result in expected[job_id]]
+            for job_id in expected
+        )
+        results.append({
+            "mode": "rank_many_per_job",
+            "jobs": args.jobs,
+            "resumes": args.baseline_resumes,
+            "workers": 1,
+            "seconds": round(seconds, 3),
+            "pairs_per_second": round(args.jobs * args.baseline_resumes / seconds),
+            "same_top_k": same,
+        })
+    for workers in args.workers:
+        ranker = MatrixRanker(jobs, weights, top_k=args.top_k, per_candidate=args.per_candidate,
+                              block_size=args.block_size, workers=workers)
+        start = time.perf_counter()
+        rows = sum(1 for _ in ranker.rank(iter_resumes(args.resumes, skills)))
+        seconds = time.perf_counter() - start
+        results.append({
+            "mode": "matrix",
+            "jobs": args.jobs,
+            "resumes": args.resumes,
+            "workers": workers,
+            "block_size": args.block_size,
+            "rows": rows,
+            "seconds": round(seconds, 3),
+            "pairs_per_second": round(args.jobs * args.resumes / seconds),
+            "peak_rss_mb": peak_rss_mb(),
+        })
+    report("matrix", results, args.output)
+if __name__ == "__main__":
+    main()
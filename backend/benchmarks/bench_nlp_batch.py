@@ -0,0 +1,59 @@
+"""Benchmark per-document spaCy entity extraction vs batched nlp.pipe.
+
+Needs the en_core_web_sm model. Run from the backend directory:
+    python -m benchmarks.bench_nlp_batch --documents 1000 --batch-size 64 --n-process 1 2
+"""
+import argparse
+import random
+import time
+from data_structures.skill_trie import SkillTrie
+from services.nlp_service import NLPService
+from benchmarks.corpus import resume_lines
+from benchmarks.harness import report
+def normalized(entities):
+    """Entities with the set-derived lists sorted, for comparing runs"""
+    return {label: sorted(values) for label, values in entities.items()}
+def throughput(fn, documents):
+    start = time.perf_counter()
+    results = fn(documents)
+    elapsed = time.perf_counter() - start
+    return results, {"seconds": round(elapsed, 3), "docs_per_second": round(len(documents) / elapsed, 1)}
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--documents", type=int, default=1000)
+    parser.add_argument("--lines", type=int, default=40, help="Lines per synthetic resume")
+    parser.add_argument("--batch-size", type=int, default=64)
+    parser.add_argument("--n-process", type=int, nargs="+", default=[1])
+    parser.add_argument("--skills", default="data/skills.json")
+    args = parser.parse_args()
+    trie = SkillTrie()
+    trie.load_skills_from_file(args.skills)
+    rng = random.Random(0)
+    skills = trie.get_all_skills()
+    documents = ["\n".join(resume_lines(rng, skills, args.lines)) for _ in range(args.documents)]
+    service = NLPService(trie, batch_size=args.batch_size)
+    enabled = service.disabled_components
+    # Warm up the pipeline and the skill scanner
+    service.extract_entities_batch(documents[:args.batch_size])
+    service.disabled_components = []
+    baseline, full_pipeline = throughput(lambda docs: [service.extract_entities(doc) for doc in docs], documents)
+    service.disabled_components = enabled
+    _, per_document = throughput(lambda docs: [service.extract_entities(doc) for doc in docs], documents)
+    results = [
+        {"mode": "per_document_full_pipeline", **full_pipeline},
+        {"mode": "per_document", "disabled": enabled, **per_document},
+    ]
+    for n_process in args.n_process:
+        batched, timing = throughput(lambda docs: service.extract_entities_batch(docs, n_process=n_process), documents)
+        assert [normalized(entities) for entities in batched] == [normalized(entities) for entities in baseline]
+        results.append({
+            "mode": "batch",
+            "batch_size": args.batch_size,
+            "n_process": n_process,
+            "disabled": enabled,
+            **timing,
+            "speedup": round(full_pipeline["seconds"] / timing["seconds"], 2),
+        })
+    report("nlp_batch", results)
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,42 @@
+"""Benchmark sequential vs process-pool PDF extraction.
+
+Run from the backend directory:
+    python -m benchmarks.bench_pdf_extraction --pages 1 10 50 --workers 4
+"""
+import argparse
+from services.extraction_pool import ExtractionPool
+from services.file_service import FileService
+from benchmarks.corpus import resume_pdf
+from benchmarks.harness import time_call, report
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--pages", type=int, nargs="+", default=[1, 10, 50])
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--pages-per-chunk", type=int, default=5)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+    pool = ExtractionPool(backend="process", max_workers=args.workers, pages_per_chunk=args.pages_per_chunk,
+                          parallel_min_pages=2, max_pages=max(args.pages), timeout=300)
+    # Start the worker processes before timing anything
+    pool.extract_text(resume_pdf(args.workers * args.pages_per_chunk), "pdf")
+    results = []
+    try:
+        for page_count in args.pages:
+            data = resume_pdf(page_count, seed=page_count)
+            sequential_text = FileService.extract_text(data, "pdf")
+            assert pool.extract_text(data, "pdf") == sequential_text
+            sequential = time_call(lambda: FileService.extract_text(data, "pdf"), repeat=args.repeat)
+            parallel = time_call(lambda: pool.extract_text(data, "pdf"), repeat=args.repeat)
+            results.append({
+                "pages": page_count,
+                "bytes": len(data),
+                "workers": args.workers,
+                "sequential": sequential,
+                "process_pool": parallel,
+                "speedup": round(sequential["median_ms"] / parallel["median_ms"], 2),
+            })
+    finally:
+        pool.shutdown()
+    report("pdf_extraction", results)
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+"""Benchmark every stage of the upload and scoring pipeline on synthetic resumes of each format and length.
+
+Stages: extract (per format), clean, entities, trie_lookup, fuzzy_search, score and score_batch.
+Run from the backend directory:
+    python -m benchmarks.bench_pipeline --formats pdf docx txt --lengths short medium long --output pipeline.json
+"""
+import argparse
+import random
+import re
+from algorithms.ats_scorer import ATSScorer
+from algorithms.text_patterns import clean_text
+from data_structures.skill_trie import SkillTrie
+from services.file_service import FileService
+from services.simple_nlp_service import SimpleNLPService
+from benchmarks.corpus import FORMATS, LENGTHS, job_description, resume_file, resume_text
+from benchmarks.harness import synthetic_skills, typo, time_call, report
+def load_trie(skills_file, skills):
+    """The production taxonomy plus the corpus's synthetic skills, so extraction finds matches"""
+    trie = SkillTrie()
+    trie.load_skills_from_file(skills_file)
+    for skill in skills:
+        trie.insert(skill, {"category": "synthetic"})
+    # Build the scanner up front so the first entities row does not pay for it
+    trie.scanner()
+    return trie
+def load_nlp_service(backend, trie):
+    if backend == "spacy":
+        from services.nlp_service import NLPService
+        return NLPService(trie)
+    return SimpleNLPService(trie)
+def row(stage, timing, **fields):
+    return {"stage": stage, **fields, **timing}
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--formats", nargs="+", default=list(FORMATS), choices=list(FORMATS))
+    parser.add_argument("--lengths", nargs="+", default=list(LENGTHS), choices=list(LENGTHS))
+    parser.add_argument("--skills-file", default="data/skills.json")
+    parser.add_argument("--nlp-backend", default="simple", choices=["simple", "spacy"])
+    parser.add_argument("--fuzzy-terms", type=int, default=200)
+    parser.add_argument("--batch", type=int, default=200, help="Resumes ranked per score_batch call")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--output", type=argparse.FileType("w"), default=None)
+    args = parser.parse_args()
+    rng = random.Random(0)
+    skills = synthetic_skills(200, seed=0)
+    trie = load_trie(args.skills_file, skills)
+    nlp_service = load_nlp_service(args.nlp_backend, trie)
+    scorer = ATSScorer()
+    job = job_description(rng, skills)
+    results = []
+    for length in args.lengths:
+        line_count = LENGTHS[length]
+        raw = resume_text(line_count, seed=line_count, skills=skills)
+        for file_format in args.formats:
+            data = resume_file(file_format, line_count, seed=line_count, skills=skills)
+            timing = time_call(lambda: FileService.extract_text(data, file_format), args.repeat)
+            results.append(row("extract", timing, format=file_format, length=length, bytes=len(data)))
+        text = clean_text(raw)
+        results.append(row("clean", time_call(lambda: clean_text(raw), args.repeat), length=length, chars=len(raw)))
+        timing = time_call(lambda: nlp_service.extract_entities(text), args.repeat)
+        results.append(row("entities", timing, length=length, chars=len(text), backend=args.nlp_backend))
+        # Exact lookups of every one- and two-word window, the per-token path before the scanner
+        words = re.findall(r"[\w+#.-]+", text.lower())
+        windows = words + [" ".join(pair) for pair in zip(words, words[1:])]
+        timing = time_call(lambda: [trie.search(window) for window in windows], args.repeat)
+        results.append(row("trie_lookup", timing, length=length, lookups=len(windows)))
+        entities = nlp_service.extract_entities(text)
+        resume_data = {
+            "text": text,
+            "skills": entities["SKILL"],
+            "experience": [line for line in raw.split("\n") if re.search(r"\d", line)],
+            "education": [line for line in raw.split("\n") if "Bachelor" in line or "Master" in line],
+        }
+        timing = time_call(lambda: scorer.calculate_ats_score(resume_data, job), args.repeat)
+        results.append(row("score", timing, length=length, job_skills=len(job["skills"])))
+        batch = [resume_data] * args.batch
+        timing = time_call(lambda: scorer.rank_many(batch, job), args.repeat)
+        results.append(row("score_batch", timing, length=length, resumes=args.batch))
+    terms = [typo(rng.choice(skills), rng) for _ in range(args.fuzzy_terms)]
+    timing = time_call(lambda: [trie.fuzzy_search(term) for term in terms], args.repeat)
+    results.append(row("fuzzy_search", timing, terms=len(terms), skills=len(trie.get_all_skills())))
+    report("pipeline", results, args.output)
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+"""Benchmark resume store writes one by one and in bulk, and projected reads for scoring.
+
+Uses a temporary SQLite store, or MongoDB with --mongo-uri (into a scratch collection that is dropped afterwards).
+Also compares the size of an /api/score request carrying the whole parsed resume with one carrying its resume_id.
+Run from the backend directory:
+    python -m benchmarks.bench_resume_store --resumes 2000 --batch 16
+    python -m benchmarks.bench_resume_store --mongo-uri mongodb://localhost:27017/resume_ai_bench
+"""
+import argparse
+import json
+import os
+import tempfile
+import time
+import uuid
+from services.resume_store import SCORING_FIELDS, MongoResumeStore, SQLiteResumeStore, resume_document, scoring_data
+from benchmarks.corpus import LENGTHS, resume_text
+from benchmarks.harness import synthetic_skills, time_call, report
+def documents_for(count, skills):
+    documents = []
+    for index in range(count):
+        text = resume_text(LENGTHS["medium"], seed=index, skills=skills)
+        lines = text.split("\n")
+        entities = {
+            "PERSON": [lines[0]], "ORG": [], "EMAIL": [], "PHONE": [], "LINKEDIN": [],
+            "SKILL": [skill for skill in skills if skill in text][:40],
+            "EDUCATION": [line for line in lines if "Bachelor" in line or "Master" in line],
+            "EXPERIENCE": lines[4:40],
+        }
+        documents.append(resume_document(str(uuid.uuid4()), f"resume_{index}.txt", text, entities, uuid.uuid4().hex))
+    return documents
+def timed_seconds(fn):
+    start = time.perf_counter()
+    fn()
+    return time.perf_counter() - start
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--resumes", type=int, default=2000)
+    parser.add_argument("--batch", type=int, default=16, help="Resumes per bulk write, as ingestion batches them")
+    parser.add_argument("--mongo-uri", default=None)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--output", type=argparse.FileType("w"), default=None)
+    args = parser.parse_args()
+    documents = documents_for(args.resumes, synthetic_skills(200, seed=0))
+    half = len(documents) // 2
+    with tempfile.TemporaryDirectory(prefix="bench-store-") as directory:
+        if args.mongo_uri:
+            store = MongoResumeStore(args.mongo_uri, f"bench_{uuid.uuid4().hex}")
+        else:
+            store = SQLiteResumeStore(os.path.join(directory, "resumes.db"))
+        try:
+            single_seconds = timed_seconds(lambda: [store.add(document) for document in documents[:half]])
+            batches = [documents[start:start + args.batch] for start in range(half, len(documents), args.batch)]
+            bulk_seconds = timed_seconds(lambda: [store.add_many(batch) for batch in batches])
+            resume_id = documents[0]["resume_id"]
+            batch_ids = [document["resume_id"] for document in documents[:args.batch]]
+            reads = {
+                "get_full": time_call(lambda: store.get(resume_id), args.repeat, 50),
+                "get_scoring": time_call(lambda: store.get(resume_id, SCORING_FIELDS), args.repeat, 50),
+                "get_many_scoring": time_call(lambda: store.get_many(batch_ids, SCORING_FIELDS), args.repeat, 10),
+            }
+        finally:
+            if args.mongo_uri:
+                store.collection.drop()
+    full_payload = len(json.dumps({"resume_data": scoring_data(documents[0]), "job_description": ""}))
+    id_payload = len(json.dumps({"resume_id": resume_id, "job_description": ""}))
+    results = [
+        {"operation": "insert_single", "backend": store.name, "resumes": half,
+         "per_resume_us": round(single_seconds * 1e6 / half, 2)},
+        {"operation": "insert_bulk", "backend": store.name, "resumes": len(documents) - half, "batch": args.batch,
+         "per_resume_us": round(bulk_seconds * 1e6 / (len(documents) - half), 2)},
+        *({"operation": operation, "backend": store.name, **timing} for operation, timing in reads.items()),
+        {"operation": "score_request", "full_payload_bytes": full_payload, "id_payload_bytes": id_payload},
+    ]
+    report("resume_store", results, args.output)
+if __name__ == "__main__":
+    main()
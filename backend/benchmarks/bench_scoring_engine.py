@@ -0,0 +1,98 @@
+"""Benchmark the per-resume ATS component loop against the columnar scoring engine.
+
+Run from the backend directory:
+    python -m benchmarks.bench_scoring_engine --sizes 10 1000 100000
+"""
+import argparse
+import random
+import time
+import numpy as np
+from algorithms.ats_scorer import ATSScorer
+from algorithms.scoring_engine import ResumeFeatures
+from benchmarks.corpus import resume_lines
+from benchmarks.harness import synthetic_skills, report
+EXPERIENCE = [
+    "Software Engineer at Acme Corp {start} - {end}",
+    "{years} years of backend development",
+    "Data analyst, {years} yrs",
+    "Consultant from {start} to {end}",
+    "Intern at Example Labs",
+]
+EDUCATION = [
+    "Bachelor of Science in Computer Science",
+    "Master degree in Data Science",
+    "PhD in Statistics",
+    "AWS certification",
+    "High school diploma",
+]
+def synthetic_resumes(count, skills, rng):
+    """Resume data objects as produced by /api/upload"""
+    resumes = []
+    for index in range(count):
+        experience = []
+        for template in rng.sample(EXPERIENCE, rng.randint(0, 3)):
+            start = rng.randint(2000, 2020)
+            experience.append(template.format(start=start, end=start + rng.randint(0, 6), years=rng.randint(1, 12)))
+        text = "\n".join(resume_lines(rng, skills, rng.randint(8, 20)))
+        if rng.random() < 0.3:
+            # Drop a section heading so format scores vary
+            text = text.replace(rng.choice(["Experience", "Education", "Skills"]), "")
+        resumes.append({
+            "id": str(index),
+            "text": text,
+            "skills": rng.sample(skills, rng.randint(0, 15)),
+            "experience": experience,
+            "education": rng.sample(EDUCATION, rng.randint(0, 2)),
+        })
+    return resumes
+def elapsed_ms(fn):
+    start = time.perf_counter()
+    value = fn()
+    return value, round((time.perf_counter() - start) * 1000, 3)
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10, 1000, 100000])
+    parser.add_argument("--skills", type=int, default=2000)
+    args = parser.parse_args()
+    scorer = ATSScorer()
+    results = []
+    for size in args.sizes:
+        rng = random.Random(size)
+        skills = [skill.title() if rng.random() < 0.2 else skill for skill in synthetic_skills(args.skills, seed=size)]
+        resumes = synthetic_resumes(size, skills, rng)
+        job_data = {
+            "skills": rng.sample(skills, 12),
+            "min_experience": 5,
+            "required_education": ["bachelor", "degree"],
+        }
+        # Keyword density is shared by both paths, so it is fixed up front
+        densities = np.asarray([rng.random() for _ in range(size)])
+        def loop():
+            return [
+                scorer._build_result(scorer._calculate_component_scores(resume, job_data, float(density)))
+                for resume, density in zip(resumes, densities)
+            ]
+        expected, loop_ms = elapsed_ms(loop)
+        features, features_ms = elapsed_ms(lambda: ResumeFeatures.from_resumes(resumes))
+        scores, score_ms = elapsed_ms(lambda: scorer.engine.score(features, job_data, densities))
+        totals, totals_ms = elapsed_ms(lambda: scorer.engine.totals(scores))
+        actual, results_ms = elapsed_ms(lambda: scorer.engine.results(scores))
+        assert actual == expected
+        assert [round(total, 2) for total in (totals * 100).tolist()] == [result["total_score"] for result in expected]
+        engine_ms = features_ms + score_ms + results_ms
+        results.append({
+            "resumes": size,
+            "loop_ms": loop_ms,
+            "engine": {
+                "features_ms": features_ms,
+                "score_ms": score_ms,
+                "totals_ms": totals_ms,
+                "results_ms": results_ms,
+                "total_ms": round(engine_ms, 3),
+            },
+            "speedup": round(loop_ms / engine_ms, 2),
+            "speedup_from_features": round(loop_ms / (score_ms + totals_ms), 2),
+        })
+    report("scoring_engine", results)
+if __name__ == "__main__":
+    main()
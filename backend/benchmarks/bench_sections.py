@@ -0,0 +1,65 @@
+"""Benchmark flat and sectioned extraction of uploads: latency and peak memory from file bytes to entities.
+
+flat extracts and cleans the whole document, then runs the NLP backend over all of it; sectioned reads its
+lines, segments them into sections, routes the whole document and then runs each extractor only on the sections
+it needs, as uploads do with SECTION_SEGMENTATION on. first_section_ms is how soon the sectioned path has its first section in hand.
+Run from the backend directory:
+    python -m benchmarks.bench_sections --formats pdf docx txt --lengths medium long --nlp-backend simple
+"""
+import argparse
+import time
+import tracemalloc
+from algorithms.sections import iter_sections, route_sections
+from services.file_service import FileService
+from benchmarks.bench_pipeline import load_nlp_service, load_trie
+from benchmarks.corpus import FORMATS, LENGTHS, resume_file
+from benchmarks.harness import synthetic_skills, time_call, report
+def flat(nlp_service, data, file_format):
+    return nlp_service.extract_entities(FileService.extract_text(data, file_format))
+def sectioned(nlp_service, data, file_format):
+    routed = route_sections(iter_sections(FileService.iter_lines(data, file_format)))
+    return nlp_service.extract_entities_from_sections(routed)
+def peak_bytes(fn):
+    """Peak memory Python allocates while fn runs"""
+    tracemalloc.start()
+    try:
+        fn()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+def first_section_ms(data, file_format):
+    start = time.perf_counter()
+    next(iter_sections(FileService.iter_lines(data, file_format)), None)
+    return round((time.perf_counter() - start) * 1000, 4)
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--formats", nargs="+", default=list(FORMATS), choices=list(FORMATS))
+    parser.add_argument("--lengths", nargs="+", default=list(LENGTHS), choices=list(LENGTHS))
+    parser.add_argument("--skills-file", default="data/skills.json")
+    parser.add_argument("--nlp-backend", default="simple", choices=["simple", "spacy"])
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--output", type=argparse.FileType("w"), default=None)
+    args = parser.parse_args()
+    skills = synthetic_skills(200, seed=0)
+    nlp_service = load_nlp_service(args.nlp_backend, load_trie(args.skills_file, skills))
+    results = []
+    for length in args.lengths:
+        for file_format in args.formats:
+            data = resume_file(file_format, LENGTHS[length], seed=LENGTHS[length], skills=skills)
+            expected = set(flat(nlp_service, data, file_format)["SKILL"])
+            for mode, extract in (("flat", flat), ("sectioned", sectioned)):
+                run = lambda: extract(nlp_service, data, file_format)
+                results.append({
+                    "mode": mode,
+                    "format": file_format,
+                    "length": length,
+                    "backend": args.nlp_backend,
+                    "bytes": len(data),
+                    "same_skills": set(run()["SKILL"]) == expected,
+                    "peak_kb": round(peak_bytes(run) / 1024, 1),
+                    "first_section_ms": first_section_ms(data, file_format) if mode == "sectioned" else None,
+                    **time_call(run, args.repeat),
+                })
+    report("sections", results, args.output)
+if __name__ == "__main__":
+    main()
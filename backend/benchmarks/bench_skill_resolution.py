@@ -0,0 +1,71 @@
+"""Benchmark fuzzy skill resolution of resume tokens with and without the SkillResolutionCache.
+
+Run from the backend directory:
+    python -m benchmarks.bench_skill_resolution --documents 500 --skills 10000
+"""
+import argparse
+import random
+import re
+import time
+from data_structures.skill_trie import SkillTrie
+from services.cache_service import SkillResolutionCache
+from benchmarks.corpus import resume_text
+from benchmarks.harness import synthetic_skills, typo, report
+# Tokens NLPService would fuzzy match: longer than two characters, roughly what spaCy keeps after stop words
+TOKEN_PATTERN = re.compile(r"[A-Za-z][\w+#.-]{2,}")
+def documents_for(count, skills, rng):
+    documents = []
+    for index in range(count):
+        text = resume_text(rng.randint(30, 200), seed=index, skills=skills)
+        typos = " ".join(typo(rng.choice(skills), rng) for _ in range(5))
+        documents.append(TOKEN_PATTERN.findall(f"{text} {typos}"))
+    return documents
+def uncached(trie, tokens):
+    results = []
+    for token in tokens:
+        matches = trie.fuzzy_search(token, max_distance=1, top_k=1)
+        results.append(tuple(matches[0]) if matches and matches[0][1] <= 1 else None)
+    return results
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--documents", type=int, default=500)
+    parser.add_argument("--skills", type=int, default=10000)
+    parser.add_argument("--cache-size", type=int, default=100000)
+    args = parser.parse_args()
+    skills = synthetic_skills(args.skills, seed=1)
+    trie = SkillTrie()
+    for skill in skills:
+        trie.insert(skill, {"category": "synthetic"})
+    documents = documents_for(args.documents, skills, random.Random(0))
+    tokens = sum(len(document) for document in documents)
+    start = time.perf_counter()
+    expected = [uncached(trie, document) for document in documents]
+    uncached_seconds = time.perf_counter() - start
+    cache = SkillResolutionCache(args.cache_size)
+    start = time.perf_counter()
+    first = [cache.resolve_all(trie, document) for document in documents]
+    first_seconds = time.perf_counter() - start
+    first_stats = cache.stats()
+    start = time.perf_counter()
+    warm = [cache.resolve_all(trie, document) for document in documents]
+    warm_seconds = time.perf_counter() - start
+    warm_hit_ratio = round((cache.stats()["hits"] - first_stats["hits"]) / tokens, 4)
+    report("skill_resolution", [
+        {
+            "mode": mode,
+            "documents": args.documents,
+            "tokens": tokens,
+            "skills": args.skills,
+            "per_token_us": round(seconds * 1e6 / tokens, 3),
+            "speedup": round(uncached_seconds / seconds, 2),
+            "hit_ratio": hit_ratio,
+            "same_output": results == expected,
+        }
+        for mode, seconds, hit_ratio, results in (
+            ("uncached", uncached_seconds, 0.0, expected),
+            ("cold_cache", first_seconds, first_stats["hit_ratio"], first),
+            ("warm_cache", warm_seconds, warm_hit_ratio, warm),
+        )
+    ])
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+"""Benchmark gunicorn startup time and worker memory with and without --preload.
+
+Linux only (reads /proc). Run from the backend directory:
+    python -m benchmarks.bench_startup --workers 4 --nlp-backend spacy
+"""
+import argparse
+import os
+import signal
+import subprocess
+import sys
+import time
+import urllib.request
+from benchmarks.harness import report
+MODES = {
+    # Every worker builds its own models after the fork
+    "per_worker": {"GUNICORN_PRELOAD": "false", "PRELOAD_MODELS": "true"},
+    # The master builds them once and workers share the pages
+    "preload": {"GUNICORN_PRELOAD": "true", "PRELOAD_MODELS": "true"},
+}
+def children(pid):
+    with open(f"/proc/{pid}/task/{pid}/children") as f:
+        return [int(child) for child in f.read().split()]
+def memory_kb(pid):
+    """Proportional (PSS) and private (USS) resident memory of a process"""
+    values = {}
+    with open(f"/proc/{pid}/smaps_rollup") as f:
+        for line in f:
+            parts = line.split()
+            if parts[0] in ("Pss:", "Private_Clean:", "Private_Dirty:"):
+                values[parts[0]] = int(parts[1])
+    return values["Pss:"], values["Private_Clean:"] + values["Private_Dirty:"]
+def wait_ready(url, master, workers, timeout):
+    """Seconds until every worker has started and the app answers"""
+    start = time.perf_counter()
+    while time.perf_counter() - start < timeout:
+        try:
+            with urllib.request.urlopen(url, timeout=1) as response:
+                if response.status == 200 and len(children(master)) >= workers:
+                    return time.perf_counter() - start
+        except OSError:
+            pass
+        time.sleep(0.05)
+    raise TimeoutError(f"Server not ready after {timeout}s")
+def run(mode, args):
+    env = dict(os.environ, GUNICORN_WORKERS=str(args.workers), GUNICORN_BIND=f"127.0.0.1:{args.port}",
+               NLP_BACKEND=args.nlp_backend, **MODES[mode])
+    start = time.perf_counter()
+    server = subprocess.Popen([sys.executable, "-m", "gunicorn", "--config", "gunicorn.conf.py", "app:create_app()"],
+                              env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    try:
+        ready = wait_ready(f"http://127.0.0.1:{args.port}/api/models", server.pid, args.workers, args.timeout)
+        # Let the last workers finish loading, then exercise each one
+        for _ in range(args.workers * 4):
+            urllib.request.urlopen(f"http://127.0.0.1:{args.port}/health", timeout=args.timeout).read()
+        time.sleep(args.settle)
+        worker_memory = [memory_kb(pid) for pid in children(server.pid)]
+        master_pss, _ = memory_kb(server.pid)
+        return {
+            "mode": mode,
+            "workers": args.workers,
+            "nlp_backend": args.nlp_backend,
+            "ready_seconds": round(ready, 3),
+            "launch_to_ready_seconds": round(time.perf_counter() - start - args.settle, 3),
+            "total_pss_mb": round((master_pss + sum(pss for pss, _ in worker_memory)) / 1024, 1),
+            "worker_private_mb": [round(private / 1024, 1) for _, private in worker_memory],
+        }
+    finally:
+        server.send_signal(signal.SIGTERM)
+        server.wait(timeout=30)
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--nlp-backend", default="simple", choices=["simple", "spacy"])
+    parser.add_argument("--modes", nargs="+", default=list(MODES), choices=list(MODES))
+    parser.add_argument("--port", type=int, default=5099)
+    parser.add_argument("--settle", type=float, default=1.0)
+    parser.add_argument("--timeout", type=float, default=120)
+    args = parser.parse_args()
+    report("startup", [run(mode, args) for mode in args.modes])
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+"""Benchmark per-document regex time of the combined span scan against the previous separate passes.
+
+Run from the backend directory:
+    python -m benchmarks.bench_text_patterns --documents 2000
+"""
+import argparse
+import random
+import re
+from algorithms.text_patterns import clean_text, contact_info, years_of_experience
+from benchmarks.corpus import resume_lines
+from benchmarks.harness import synthetic_skills, time_call, report
+def legacy_contact_info(text):
+    """contact_extractor before the shared module: five findall passes and a lowercased copy"""
+    emails = re.findall(r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b', text)
+    phones = []
+    for pattern in [r'\b\d{3}[-.]?\d{3}[-.]?\d{4}\b', r'\b\(\d{3}\)\s?\d{3}[-.]?\d{4}\b',
+                    r'\b\+\d{1,3}[-.\s]?\d{3,4}[-.\s]?\d{3,4}[-.\s]?\d{3,4}\b']:
+        phones.extend(re.findall(pattern, text))
+    linkedin = re.findall(r'linkedin\.com/in/[\w-]+', text.lower())
+    return {'EMAIL': emails, 'PHONE': phones, 'LINKEDIN': linkedin}
+def legacy_years(text):
+    """ATSScorer._extract_years_from_text before the shared module"""
+    total_years = 0
+    for pattern in [r'(\d+)\s*years?', r'(\d+)\s*yrs?', r'(\d{4})\s*-\s*(\d{4})', r'(\d{4})\s*to\s*(\d{4})']:
+        for match in re.findall(pattern, text.lower()):
+            if isinstance(match, tuple):
+                total_years += max(0, int(match[1]) - int(match[0]))
+            else:
+                total_years += int(match)
+    return total_years
+def legacy_clean_text(text):
+    """FileService._clean_text before the shared module"""
+    text = re.sub(r'\s+', ' ', text)
+    text = re.sub(r'[^\w\s@.-]', ' ', text)
+    text = re.sub(r' +', ' ', text)
+    return text.strip()
+def documents_for(count, rng):
+    skills = synthetic_skills(500, seed=count)
+    documents = []
+    for _ in range(count):
+        lines = resume_lines(rng, skills, rng.randint(20, 60))
+        lines.insert(2, rng.choice(["(555) 123-4567", "+44 2079 4601 23", "555.123.4567", "Phone: 5551234567"]))
+        lines.append(f"Skills — {rng.choice(skills)} • {rng.choice(skills)} | {rng.randint(1, 15)} Years total")
+        documents.append("\n".join(lines))
+    return documents
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--documents", type=int, default=2000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+    documents = documents_for(args.documents, random.Random(0))
+    # Experience entries as the scorer sees them: one line each, per document
+    experience = [[line for line in document.split("\n") if re.search(r"\d", line)] for document in documents]
+    def legacy_document(index):
+        document = documents[index]
+        return legacy_clean_text(document), legacy_contact_info(document), sum(map(legacy_years, experience[index]))
+    def shared_document(index):
+        document = documents[index]
+        return clean_text(document), contact_info(document), sum(map(years_of_experience, experience[index]))
+    lines = [line for entries in experience for line in entries]
+    stages = {
+        "contact_info": (legacy_contact_info, contact_info, documents),
+        "years_of_experience": (legacy_years, years_of_experience, lines),
+        "clean_text": (legacy_clean_text, clean_text, documents),
+        "document": (legacy_document, shared_document, range(len(documents))),
+    }
+    results = []
+    for name, (legacy, shared, inputs) in stages.items():
+        legacy_ms = time_call(lambda: [legacy(value) for value in inputs], args.repeat)["median_ms"]
+        shared_ms = time_call(lambda: [shared(value) for value in inputs], args.repeat)["median_ms"]
+        results.append({
+            "stage": name,
+            "inputs": len(inputs),
+            "legacy_us": round(legacy_ms * 1000 / len(inputs), 2),
+            "shared_us": round(shared_ms * 1000 / len(inputs), 2),
+            "speedup": round(legacy_ms / shared_ms, 2),
+            # "(555) 123-4567" is now found; the old \b-anchored pattern missed it after a space
+            "same_output": round(sum(legacy(value) == shared(value) for value in inputs) / len(inputs), 4),
+        })
+    report("text_patterns", results)
+if __name__ == "__main__":
+    main()
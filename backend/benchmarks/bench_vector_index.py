@@ -0,0 +1,85 @@
+"""Benchmark recall@k and latency of the IVF vector index against brute force.
+
+Run from the backend directory:
+    python -m benchmarks.bench_vector_index --sizes 20000 100000 --nprobe 4 8 16 32
+"""
+import argparse
+import random
+import time
+import numpy as np
+from algorithms.tfidf_model import TfidfModel
+from algorithms.vector_index import VectorIndex
+from benchmarks.corpus import resume_lines
+from benchmarks.harness import synthetic_skills, report
+def topic_corpus(count, topics, seed):
+    """Resumes and job descriptions drawn from `topics` overlapping skill sets"""
+    rng = random.Random(seed)
+    skills = synthetic_skills(topics * 20, seed=seed)
+    topic_skills = [rng.sample(skills, 30) for _ in range(topics)]
+    documents = []
+    for _ in range(count):
+        # Most candidates span a couple of topics plus a few unrelated skills
+        mixed = [skill for topic in rng.sample(topic_skills, rng.randint(1, 3)) for skill in topic] + rng.sample(skills, 5)
+        documents.append("\n".join(resume_lines(rng, mixed, rng.randint(15, 40))))
+    return documents, topic_skills, skills, rng
+def latency_ms(fn, queries):
+    start = time.perf_counter()
+    results = [fn(query) for query in queries]
+    return results, round((time.perf_counter() - start) * 1000 / len(queries), 3)
+def recall(approximate, exact):
+    hits = [len({hit['id'] for hit in a} & {hit['id'] for hit in e}) / max(1, len(e)) for a, e in zip(approximate, exact)]
+    return round(float(np.mean(hits)), 4)
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[20000])
+    parser.add_argument("--topics", type=int, default=200)
+    parser.add_argument("--queries", type=int, default=100)
+    parser.add_argument("--top-k", type=int, default=10)
+    parser.add_argument("--dims", type=int, default=128)
+    parser.add_argument("--method", choices=["svd", "random"], default="svd")
+    parser.add_argument("--nprobe", type=int, nargs="+", default=[4, 8, 16, 32])
+    args = parser.parse_args()
+    results = []
+    for size in args.sizes:
+        documents, topic_skills, skills, rng = topic_corpus(size, args.topics, seed=size)
+        ids = [str(i) for i in range(size)]
+        model = TfidfModel.fit(documents[:5000], max_features=20000)
+        start = time.perf_counter()
+        index = VectorIndex.build(model, documents, ids, dims=args.dims, method=args.method)
+        build_seconds = time.perf_counter() - start
+        job_descriptions = [
+            "Looking for an engineer with " + ", ".join(rng.sample(rng.choice(topic_skills), 8) + rng.sample(skills, 2))
+            for _ in range(args.queries)
+        ]
+        queries = index.embed(model, job_descriptions)
+        exact, exact_ms = latency_ms(lambda query: index.search_exact(query, args.top_k), queries)
+        # Exact cosine over the unreduced TF-IDF rows, the quality ceiling
+        matrix = model.transform(documents)
+        sparse_queries = model.transform(job_descriptions)
+        def sparse_search(position):
+            scores = np.asarray((matrix @ sparse_queries[position].T).todense()).ravel()
+            best = np.argsort(-scores, kind="stable")[:args.top_k]
+            return [{"id": ids[i]} for i in best]
+        tfidf_exact, tfidf_ms = latency_ms(sparse_search, range(len(job_descriptions)))
+        row = {
+            "documents": size,
+            "dims": index.meta["dims"],
+            "lists": index.meta["lists"],
+            "build_seconds": round(build_seconds, 2),
+            "tfidf_brute_force_ms": tfidf_ms,
+            "reduced_brute_force_ms": exact_ms,
+            "reduced_recall_vs_tfidf": recall(exact, tfidf_exact),
+            "ivf": [],
+        }
+        for nprobe in args.nprobe:
+            approximate, ivf_ms = latency_ms(lambda query: index.search(query, args.top_k, nprobe), queries)
+            row["ivf"].append({
+                "nprobe": nprobe,
+                "latency_ms": ivf_ms,
+                f"recall_at_{args.top_k}": recall(approximate, exact),
+                "speedup": round(exact_ms / ivf_ms, 2),
+            })
+        results.append(row)
+    report("vector_index", results)
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+"""Compare two benchmark JSON reports and flag regressions beyond a threshold.
+
+Rows are matched on their non-metric fields (stage, format, length, ...). Metrics ending in _ms, _us or _seconds
+are better lower; metrics ending in _per_second are better higher. Run from the backend directory:
+    python -m benchmarks.compare base.json head.json --metric median_ms --threshold 0.10
+Exits with status 1 if any metric regressed by more than the threshold.
+"""
+import argparse
+import json
+import sys
+LOWER_IS_BETTER = ("_ms", "_us", "_seconds")
+HIGHER_IS_BETTER = ("_per_second",)
+# Timing parameters and outcome counts, not part of what a row measures
+IGNORED_FIELDS = ("repeat", "number", "errors", "statuses")
+def is_metric(field):
+    return field.endswith(LOWER_IS_BETTER) or field.endswith(HIGHER_IS_BETTER)
+def row_key(row):
+    return tuple(sorted(
+        (field, json.dumps(value, sort_keys=True)) for field, value in row.items()
+        if not is_metric(field) and field not in IGNORED_FIELDS
+    ))
+def load(path):
+    with open(path) as f:
+        return json.load(f)
+def compare(base, head, metrics=None, threshold=0.10):
+    """Relative change of every shared metric of every matched row; positive change means slower"""
+    base_rows = {row_key(row): row for row in base["results"]}
+    changes = []
+    for row in head["results"]:
+        key = row_key(row)
+        if key not in base_rows:
+            continue
+        for field, value in row.items():
+            if not is_metric(field) or (metrics and field not in metrics):
+                continue
+            before = base_rows[key].get(field)
+            if not isinstance(value, (int, float)) or not isinstance(before, (int, float)) or before == 0:
+                continue
+            change = (value - before) / before
+            if field.endswith(HIGHER_IS_BETTER):
+                change = -change
+            changes.append({
+                "row": {name: json.loads(raw) for name, raw in key},
+                "metric": field,
+                "base": before,
+                "head": value,
+                "change": round(change, 4),
+                "regression": change > threshold,
+            })
+    return changes
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("base")
+    parser.add_argument("head")
+    parser.add_argument("--metric", nargs="+", default=None, help="Only compare these metrics")
+    parser.add_argument("--threshold", type=float, default=0.10, help="Relative slowdown that counts as a regression")
+    args = parser.parse_args()
+    base, head = load(args.base), load(args.head)
+    if base["benchmark"] != head["benchmark"]:
+        parser.error(f"Different benchmarks: {base['benchmark']} and {head['benchmark']}")
+    changes = compare(base, head, args.metric, args.threshold)
+    json.dump({
+        "benchmark": head["benchmark"],
+        "base": base.get("meta", {}).get("commit"),
+        "head": head.get("meta", {}).get("commit"),
+        "threshold": args.threshold,
+        "regressions": sum(change["regression"] for change in changes),
+        "changes": changes,
+    }, sys.stdout, indent=2)
+    sys.stdout.write("\n")
+    sys.exit(1 if any(change["regression"] for change in changes) else 0)
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,149 @@
+"""Synthetic resume and job description corpus for the benchmarks.
+
+Write a corpus to disk, from the backend directory:
+    python -m benchmarks.corpus --out corpus --count 50 --formats pdf docx txt
+"""
+import argparse
+import io
+import json
+import os
+import random
+from benchmarks.harness import synthetic_skills
+# Resume length name -> total lines, at about 55 lines per PDF page
+LENGTHS = {"short": 30, "medium": 110, "long": 440}
+FORMATS = ("pdf", "docx", "txt")
+SECTION_LINES = {
+    "experience": [
+        "Senior Software Engineer at Acme Corp 2016 - 2021",
+        "Developed data pipelines in {skill} and {skill} serving millions of users",
+        "Led a team of 5 engineers building {skill} services with 4 years of ownership",
+        "Improved latency by 40 percent using {skill} and {skill}",
+    ],
+    "education": [
+        "Bachelor of Science in Computer Science, State University 2012 - 2016",
+        "Master degree in Data Science, Tech Institute",
+    ],
+    "skills": ["{skill}, {skill}, {skill}, {skill}"],
+}
+def resume_lines(rng, skills, line_count):
+    """Plain-text resume lines with contact, experience, education and skills sections"""
+    lines = [
+        "Jane Doe",
+        f"jane.doe{rng.randint(1, 999)}@example.com 555-{rng.randint(100, 999)}-{rng.randint(1000, 9999)}",
+        "linkedin.com/in/jane-doe",
+        "Experience",
+    ]
+    while len(lines) < line_count:
+        section = rng.choice(list(SECTION_LINES))
+        template = rng.choice(SECTION_LINES[section])
+        lines.append(template.replace("{skill}", "{}").format(
+            *(rng.choice(skills) for _ in range(template.count("{skill}")))
+        ))
+    lines[len(lines) // 2:len(lines) // 2] = ["Education", "Bachelor of Science, State University"]
+    lines.append("Skills")
+    lines.append(", ".join(rng.sample(skills, min(8, len(skills)))))
+    return lines
+def _pdf_escape(line):
+    return line.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+def make_pdf(pages):
+    """Minimal PDF with one Helvetica text block per page, given a list of line lists"""
+    objects = [b"<< /Type /Catalog /Pages 2 0 R >>", None,
+               b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>"]
+    kids = []
+    for index, lines in enumerate(pages):
+        page_id = 4 + 2 * index
+        kids.append(f"{page_id} 0 R")
+        content = ("BT /F1 10 Tf 50 760 Td 13 TL "
+                   + " ".join(f"({_pdf_escape(line)}) '" for line in lines) + " ET").encode("latin-1", "replace")
+        objects.append(
+            f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] "
+            f"/Resources << /Font << /F1 3 0 R >> >> /Contents {page_id + 1} 0 R >>".encode()
+        )
+        objects.append(b"<< /Length %d >>\nstream\n" % len(content) + content + b"\nendstream")
+    objects[1] = f"<< /Type /Pages /Kids [{' '.join(kids)}] /Count {len(pages)} >>".encode()
+    output = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, 1):
+        offsets.append(len(output))
+        output += b"%d 0 obj\n" % number + body + b"\nendobj\n"
+    xref = len(output)
+    output += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    output += b"".join(b"%010d 00000 n \n" % offset for offset in offsets)
+    output += b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, xref)
+    return bytes(output)
+def resume_pdf(page_count, seed=0, lines_per_page=55):
+    """Synthetic resume PDF with page_count full pages of text"""
+    rng = random.Random(seed)
+    skills = synthetic_skills(200, seed=seed)
+    lines = resume_lines(rng, skills, page_count * lines_per_page)
+    return make_pdf([lines[i:i + lines_per_page] for i in range(0, len(lines), lines_per_page)][:page_count])
+def resume_text(line_count, seed=0, skills=None):
+    """Synthetic plain-text resume of line_count lines"""
+    rng = random.Random(seed)
+    return "\n".join(resume_lines(rng, skills or synthetic_skills(200, seed=seed), line_count))
+def resume_docx(line_count, seed=0, skills=None):
+    """Synthetic resume DOCX with one paragraph per line"""
+    from docx import Document
+    document = Document()
+    for line in resume_text(line_count, seed, skills).split("\n"):
+        document.add_paragraph(line)
+    output = io.BytesIO()
+    document.save(output)
+    return output.getvalue()
+def resume_file(file_format, line_count, seed=0, skills=None, lines_per_page=55):
+    """Synthetic resume of line_count lines as PDF, DOCX or TXT bytes"""
+    if file_format == "pdf":
+        lines = resume_text(line_count, seed, skills).split("\n")
+        return make_pdf([lines[i:i + lines_per_page] for i in range(0, len(lines), lines_per_page)])
+    if file_format == "docx":
+        return resume_docx(line_count, seed, skills)
+    if file_format == "txt":
+        return resume_text(line_count, seed, skills).encode("utf-8")
+    raise ValueError(f"Unsupported format: {file_format}")
+def job_description(rng, skills, skill_count=8):
+    """Synthetic job description with its required skills, years and education"""
+    wanted = rng.sample(skills, min(skill_count, len(skills)))
+    years = rng.randint(0, 8)
+    education = rng.sample(["bachelor", "master", "degree", "certification"], rng.randint(0, 2))
+    lines = [
+        "Senior Software Engineer",
+        f"We are looking for an engineer with {years} years of experience building production services.",
+        f"Required skills: {', '.join(wanted[:skill_count // 2])}.",
+        f"Nice to have: {', '.join(wanted[skill_count // 2:])}.",
+        "You will design, build and operate data pipelines and APIs with a small team.",
+    ]
+    if education:
+        lines.append(f"Education: {' or '.join(education)} in Computer Science or equivalent.")
+    return {"description": "\n".join(lines), "skills": wanted, "min_experience": years, "required_education": education}
+def write_corpus(directory, count, formats=FORMATS, lengths=tuple(LENGTHS), jobs=10, seed=0):
+    """Write count resumes per format, cycling through lengths, plus jobs.jsonl; returns the file paths"""
+    os.makedirs(directory, exist_ok=True)
+    skills = synthetic_skills(200, seed=seed)
+    paths = []
+    for index in range(count):
+        length = lengths[index % len(lengths)]
+        for file_format in formats:
+            path = os.path.join(directory, f"resume_{index:05d}_{length}.{file_format}")
+            with open(path, "wb") as f:
+                f.write(resume_file(file_format, LENGTHS[length], seed + index, skills))
+            paths.append(path)
+    rng = random.Random(seed)
+    jobs_path = os.path.join(directory, "jobs.jsonl")
+    with open(jobs_path, "w") as f:
+        for index in range(jobs):
+            f.write(json.dumps({"id": f"job-{index:04d}", **job_description(rng, skills)}) + "\n")
+    paths.append(jobs_path)
+    return paths
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--out", default="corpus")
+    parser.add_argument("--count", type=int, default=50, help="Resumes per format")
+    parser.add_argument("--formats", nargs="+", default=list(FORMATS), choices=list(FORMATS))
+    parser.add_argument("--lengths", nargs="+", default=list(LENGTHS), choices=list(LENGTHS))
+    parser.add_argument("--jobs", type=int, default=10)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    paths = write_corpus(args.out, args.count, args.formats, args.lengths, args.jobs, args.seed)
+    print(f"Wrote {len(paths)} files to {args.out}")
+if __name__ == "__main__":
+    main()
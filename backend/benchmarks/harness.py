@@ -0,0 +1,85 @@
+import datetime
+import json
+import os
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import time
+SYLLABLES = [
+    "py", "thon", "ja", "va", "script", "re", "act", "no", "de", "dja", "ngo",
+    "fla", "sk", "sql", "mon", "go", "db", "post", "gres", "doc", "ker", "ku",
+    "ber", "net", "es", "az", "ure", "ten", "sor", "flow", "tor", "ch", "git",
+    "ji", "ra", "ag", "ile", "scr", "um", "ru", "st", "ka", "fka", "spa", "rk",
+]
+def synthetic_skills(count, seed=0):
+    """Generate `count` unique pseudo skill names, some of them multi-word"""
+    rng = random.Random(seed)
+    skills = []
+    seen = set()
+    while len(skills) < count:
+        words = [
+            "".join(rng.choice(SYLLABLES) for _ in range(rng.randint(1, 4)))
+            for _ in range(1 if rng.random() < 0.8 else 2)
+        ]
+        skill = " ".join(words)
+        if skill not in seen:
+            seen.add(skill)
+            skills.append(skill)
+    return skills
+def typo(word, rng):
+    """Apply one random edit (substitution, insertion or deletion) to a word"""
+    position = rng.randrange(len(word))
+    char = rng.choice("abcdefghijklmnopqrstuvwxyz")
+    edit = rng.choice(("substitute", "insert", "delete"))
+    if edit == "substitute":
+        return word[:position] + char + word[position + 1:]
+    if edit == "insert":
+        return word[:position] + char + word[position:]
+    return word[:position] + word[position + 1:] or word
+def time_call(fn, repeat=5, number=1):
+    """Time `fn` and return per-call latency statistics in milliseconds"""
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(number):
+            fn()
+        samples.append((time.perf_counter() - start) * 1000 / number)
+    return {
+        "min_ms": round(min(samples), 4),
+        "median_ms": round(statistics.median(samples), 4),
+        "mean_ms": round(statistics.fmean(samples), 4),
+        "repeat": repeat,
+        "number": number,
+    }
+def percentiles(samples, points=(50, 95, 99)):
+    """Latency percentiles of samples in milliseconds, nearest rank"""
+    ordered = sorted(samples)
+    if not ordered:
+        return {f"p{point}_ms": None for point in points}
+    return {
+        f"p{point}_ms": round(ordered[min(len(ordered) - 1, max(0, -(-point * len(ordered) // 100) - 1))], 4)
+        for point in points
+    }
+def git_commit():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, timeout=5,
+            cwd=os.path.dirname(os.path.abspath(__file__))
+        ).stdout.strip() or None
+    except OSError:
+        return None
+def run_metadata():
+    """Where and when a benchmark ran, so results from different commits can be compared"""
+    return {
+        "commit": git_commit(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpus": os.cpu_count(),
+        "timestamp": datetime.datetime.now(datetime.timezone.utc).isoformat(timespec="seconds"),
+    }
+def report(name, results, stream=None):
+    """Write benchmark results and run metadata as one JSON document"""
+    json.dump({"benchmark": name, "meta": run_metadata(), "results": results}, stream or sys.stdout, indent=2)
+    (stream or sys.stdout).write("\n")
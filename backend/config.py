@@ -5,8 +5,71 @@ class Config:
     SECRET_KEY = os.getenv('SECRET_KEY', 'default-secret-key-change-in-production')
     MONGO_URI = os.getenv('MONGO_URI', 'mongodb://mongo:27017/resume_ai')
     REDIS_URL = os.getenv('REDIS_URL', 'redis://redis:6379/0')
+    RESUME_STORE = os.getenv('RESUME_STORE', 'auto') # auto, mongo or sqlite: where processed resumes are kept
+    RESUME_STORE_PATH = os.getenv('RESUME_STORE_PATH', 'data/resumes.db') # SQLite store; ':memory:' keeps resumes in process
+    MONGO_RESUME_COLLECTION = os.getenv('MONGO_RESUME_COLLECTION', 'resumes')
+    MONGO_MAX_POOL_SIZE = int(os.getenv('MONGO_MAX_POOL_SIZE', 50)) # Connections per worker process
+    MONGO_TIMEOUT_MS = int(os.getenv('MONGO_TIMEOUT_MS', 2000))
+    JOB_STORE_PATH = os.getenv('JOB_STORE_PATH', 'data/jobs.db') # SQLite store of registered postings, used when resumes are in SQLite
+    MONGO_JOB_COLLECTION = os.getenv('MONGO_JOB_COLLECTION', 'jobs')
+    JOB_PROFILE_CACHE_SIZE = int(os.getenv('JOB_PROFILE_CACHE_SIZE', 1024)) # Parsed job descriptions kept per worker
+    JOB_POSTING_CACHE_TTL = int(os.getenv('JOB_POSTING_CACHE_TTL', 60)) # Seconds a worker serves a posting's requirements without reading the store
     UPLOAD_FOLDER = os.getenv('UPLOAD_FOLDER', 'uploads')
     MAX_CONTENT_LENGTH = 5 * 1024 * 1024 # 5MB max file size
+    UPLOAD_SPOOL_MAX_MEMORY = int(os.getenv('UPLOAD_SPOOL_MAX_MEMORY', 1024 * 1024)) # Larger uploads spill to UPLOAD_FOLDER
     CORS_ORIGINS = os.getenv('CORS_ORIGINS', 'http://localhost:3000').split(',')
     ALLOWED_EXTENSIONS = {'pdf', 'docx', 'doc', 'txt'}
+    SKILLS_FILE = os.getenv('SKILLS_FILE', 'data/skills.json')
+    SKILL_TRIE_SNAPSHOT = os.getenv('SKILL_TRIE_SNAPSHOT', '') # Memory-mapped trie built by python -m data_structures.frozen_trie
+    TAXONOMY_BACKEND = os.getenv('TAXONOMY_BACKEND', 'auto') # auto, redis or file: where taxonomy deltas are shared
+    TAXONOMY_LOG_PATH = os.getenv('TAXONOMY_LOG_PATH', 'data/taxonomy_deltas.jsonl')
+    TAXONOMY_POLL_INTERVAL = float(os.getenv('TAXONOMY_POLL_INTERVAL', 2)) # Seconds between checks for new deltas; 0 disables
+    TAXONOMY_ADMIN_TOKEN = os.getenv('TAXONOMY_ADMIN_TOKEN', '') # Taxonomy changes need this token in the header; unset disables them
+    TAXONOMY_ADMIN_HEADER = os.getenv('TAXONOMY_ADMIN_HEADER', 'X-Taxonomy-Token')
+    NLP_BACKEND = os.getenv('NLP_BACKEND', 'simple') # simple (regex and trie) or spacy
+    SPACY_MODEL = os.getenv('SPACY_MODEL', 'en_core_web_sm')
+    PRELOAD_MODELS = os.getenv('PRELOAD_MODELS', 'false').lower() == 'true' # Load every model in create_app
+    TFIDF_MODEL_PATH = os.getenv('TFIDF_MODEL_PATH', 'models/tfidf')
+    EXTRACTION_CACHE_BACKEND = os.getenv('EXTRACTION_CACHE_BACKEND', 'auto') # auto, redis, memory or none
+    EXTRACTION_CACHE_MAX_BYTES = int(os.getenv('EXTRACTION_CACHE_MAX_BYTES', 64 * 1024 * 1024))
+    EXTRACTION_CACHE_TTL = int(os.getenv('EXTRACTION_CACHE_TTL', 7 * 24 * 3600))
+    EXTRACTION_CACHE_VERSION = os.getenv('EXTRACTION_CACHE_VERSION', '3')
+    SECTION_SEGMENTATION = os.getenv('SECTION_SEGMENTATION', 'true').lower() == 'true' # Uploads run each extractor on its resume sections only
+    PDF_EXTRACTION_BACKEND = os.getenv('PDF_EXTRACTION_BACKEND', 'process') # process or sequential
+    EXTRACTION_WORKERS = int(os.getenv('EXTRACTION_WORKERS', 2))
+    EXTRACTION_PAGES_PER_CHUNK = int(os.getenv('EXTRACTION_PAGES_PER_CHUNK', 5))
+    EXTRACTION_PARALLEL_MIN_PAGES = int(os.getenv('EXTRACTION_PARALLEL_MIN_PAGES', 8))
+    EXTRACTION_MAX_PAGES = int(os.getenv('EXTRACTION_MAX_PAGES', 50))
+    EXTRACTION_TIMEOUT = float(os.getenv('EXTRACTION_TIMEOUT', 30))
+    BATCH_SCORE_MAX_RESUMES = int(os.getenv('BATCH_SCORE_MAX_RESUMES', 5000))
+    MATRIX_MAX_PAIRS = int(os.getenv('MATRIX_MAX_PAIRS', 2000000)) # Jobs x resumes per /api/score/matrix request; larger runs use the CLI
+    MATRIX_BLOCK_SIZE = int(os.getenv('MATRIX_BLOCK_SIZE', 1024)) # Resumes scored against every job at once
 
+    NLP_BATCH_SIZE = int(os.getenv('NLP_BATCH_SIZE', 64)) # Documents per nlp.pipe batch
+    NLP_N_PROCESS = int(os.getenv('NLP_N_PROCESS', 1))
+    NLP_DISABLED_COMPONENTS = os.getenv('NLP_DISABLED_COMPONENTS', 'tagger,attribute_ruler,lemmatizer').split(',')
+    SKILL_RESOLUTION_CACHE_SIZE = int(os.getenv('SKILL_RESOLUTION_CACHE_SIZE', 100000)) # Tokens whose fuzzy skill match is remembered
+    INGEST_BACKEND = os.getenv('INGEST_BACKEND', 'process') # process or thread
+    INGEST_WORKERS = int(os.getenv('INGEST_WORKERS', os.cpu_count() or 2))
+    INGEST_BATCH_SIZE = int(os.getenv('INGEST_BATCH_SIZE', 16)) # Files per worker task, sent through nlp.pipe together
+    INGEST_MAX_PENDING = int(os.getenv('INGEST_MAX_PENDING', 1000)) # Files queued or running per worker before 429
+    INGEST_MAX_FILES = int(os.getenv('INGEST_MAX_FILES', 500)) # Files per ingestion job
+    INGEST_MAX_CONTENT_LENGTH = int(os.getenv('INGEST_MAX_CONTENT_LENGTH', 200 * 1024 * 1024)) # Size limit for /api/ingest, of the request and of its unpacked files
+    INGEST_JOB_STORE = os.getenv('INGEST_JOB_STORE', 'auto') # auto, redis or memory
+    INGEST_JOB_TTL = int(os.getenv('INGEST_JOB_TTL', 24 * 3600))
+    SKILL_INDEX_PATH = os.getenv('SKILL_INDEX_PATH', 'index/skill_index.db')
+    SKILL_INDEX_CATEGORY_WEIGHT = float(os.getenv('SKILL_INDEX_CATEGORY_WEIGHT', 0.25)) # Share of a category's IDF a related skill earns
+    SKILL_INDEX_DELTA_LIMIT = int(os.getenv('SKILL_INDEX_DELTA_LIMIT', 50000)) # Appended postings rows folded into the compressed lists at once
+    CANDIDATE_SEARCH_MAX_K = int(os.getenv('CANDIDATE_SEARCH_MAX_K', 1000))
+    VECTOR_INDEX_PATH = os.getenv('VECTOR_INDEX_PATH', 'models/vectors')
+    VECTOR_SEARCH_NPROBE = int(os.getenv('VECTOR_SEARCH_NPROBE', 8)) # IVF lists scanned per query
+    ASGI_THREADS = int(os.getenv('ASGI_THREADS', 8)) # Threads running the Flask app per ASGI worker
+    ASGI_MAX_PENDING = int(os.getenv('ASGI_MAX_PENDING', 64)) # Requests admitted at once per ASGI worker before 429
+    ASGI_QUEUE_TIMEOUT = float(os.getenv('ASGI_QUEUE_TIMEOUT', 10)) # Seconds an admitted request may wait for a thread before 503
+    ASGI_RETRY_AFTER = int(os.getenv('ASGI_RETRY_AFTER', 1)) # Retry-After seconds sent with 429 and 503
+    METRICS_ENABLED = os.getenv('METRICS_ENABLED', 'true').lower() == 'true' # Prometheus /metrics and request timings
+    PROFILE_ENABLED = os.getenv('PROFILE_ENABLED', 'false').lower() == 'true' # Allow per-request cProfile dumps
+    PROFILE_HEADER = os.getenv('PROFILE_HEADER', 'X-Profile') # Requests carrying this header are profiled
+    PROFILE_TOKEN = os.getenv('PROFILE_TOKEN', '') # If set, the header value must match it
+    PROFILE_SAMPLE_RATE = float(os.getenv('PROFILE_SAMPLE_RATE', 0)) # Share of other requests profiled at random
+    PROFILE_DIR = os.getenv('PROFILE_DIR', 'profiles')
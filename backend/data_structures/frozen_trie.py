@@ -0,0 +1,229 @@
+import argparse
+import json
+import logging
+import mmap
+import os
+import struct
+import sys
+from collections import deque
+from data_structures.skill_scanner import SkillScanner
+from data_structures.skill_trie import SkillTrie, levenshtein_walk
+MAGIC = b'SKTRIE\x00\x01'
+# Magic, node count, skill count, trailer offset and length, padded to 32 bytes
+HEADER = struct.Struct('<8sIIII8x')
+# Terminal table values below zero; zero and up index the metadata table
+NOT_END = -2
+NO_METADATA = -1
+class FrozenNode:
+    """Read-only view of one frozen trie node, shaped like TrieNode"""
+    __slots__ = ['trie', 'index']
+    def __init__(self, trie, index):
+        self.trie = trie
+        self.index = index
+    @property
+    def children(self):
+        trie = self.trie
+        begin, end = trie.offsets[self.index], trie.offsets[self.index + 1]
+        return {trie.labels[edge]: FrozenNode(trie, edge + 1) for edge in range(begin, end)}
+    @property
+    def is_end(self):
+        return self.trie.terminal[self.index] != NOT_END
+    @property
+    def metadata(self):
+        return self.trie.metadata_of(self.index)
+class FrozenSkillTrie:
+    """Immutable SkillTrie stored in flat arrays that can be memory-mapped
+
+    Nodes are numbered breadth-first with each node's children consecutive
+    and in insertion order, so node i's children are the nodes
+    offsets[i] + 1 .. offsets[i + 1] and the label of node k is labels[k - 1].
+    The snapshot holds the offsets and terminal tables as little-endian
+    32-bit arrays, the labels as UTF-32 and a JSON trailer with the distinct
+    metadata values. Loaded with mmap, the tables are shared by every worker
+    that maps the same file. search, fuzzy_search and get_all_skills return
+    exactly what the SkillTrie they were frozen from returns.
+    """
+    version = 0
+    def __init__(self, buffer, path=None):
+        self.path = path
+        self._buffer = buffer
+        view = memoryview(buffer)
+        magic, node_count, skill_count, trailer_offset, trailer_length = HEADER.unpack_from(view)
+        if magic != MAGIC:
+            raise ValueError("Not a skill trie snapshot")
+        if sys.byteorder != 'little':
+            raise ValueError("Skill trie snapshots are only readable on little-endian hosts")
+        position = HEADER.size
+        self.offsets = view[position:position + 4 * (node_count + 1)].cast('I')
+        position += 4 * (node_count + 1)
+        self.terminal = view[position:position + 4 * node_count].cast('i')
+        position += 4 * node_count
+        # Decoded once per process: one str character per edge makes child lookup a C-level find
+        self.labels = bytes(view[position:position + 4 * (node_count - 1)]).decode('utf-32-le')
+        trailer = json.loads(bytes(view[trailer_offset:trailer_offset + trailer_length]))
+        self.node_count = node_count
+        self.skill_count = skill_count
+        self._metadata = trailer['metadata']
+        self._fingerprint = trailer['fingerprint']
+        self._scanner = None
+    @classmethod
+    def snapshot(cls, skill_trie):
+        """Serialize a SkillTrie into snapshot bytes"""
+        offsets = [0]
+        terminal = []
+        labels = []
+        metadata_index = {}
+        metadata_table = []
+        nodes = deque([skill_trie.root])
+        while nodes:
+            node = nodes.popleft()
+            if not node.is_end:
+                terminal.append(NOT_END)
+            elif node.metadata is None:
+                terminal.append(NO_METADATA)
+            else:
+                key = json.dumps(node.metadata, sort_keys=True)
+                if key not in metadata_index:
+                    metadata_index[key] = len(metadata_table)
+                    metadata_table.append(node.metadata)
+                terminal.append(metadata_index[key])
+            for char, child in node.children.items():
+                labels.append(char)
+                nodes.append(child)
+            offsets.append(len(labels))
+        node_count = len(terminal)
+        trailer = json.dumps({'metadata': metadata_table, 'fingerprint': skill_trie.fingerprint()}).encode('utf-8')
+        body = b''.join([
+            struct.pack(f'<{node_count + 1}I', *offsets),
+            struct.pack(f'<{node_count}i', *terminal),
+            ''.join(labels).encode('utf-32-le')
+        ])
+        header = HEADER.pack(MAGIC, node_count, skill_trie.skill_count, HEADER.size + len(body), len(trailer))
+        return header + body + trailer
+    @classmethod
+    def freeze(cls, skill_trie):
+        """Frozen in-memory copy of a SkillTrie"""
+        return cls(cls.snapshot(skill_trie))
+    @staticmethod
+    def save(skill_trie, path):
+        """Write a SkillTrie snapshot; the file is written whole and renamed into place"""
+        temporary = f"{path}.tmp"
+        with open(temporary, 'wb') as f:
+            f.write(FrozenSkillTrie.snapshot(skill_trie))
+        os.replace(temporary, path)
+    @classmethod
+    def load(cls, path):
+        """Memory-map a snapshot read-only"""
+        with open(path, 'rb') as f:
+            buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        trie = cls(buffer, path=path)
+        logging.info(f"Mapped {trie.skill_count} skills from {path}")
+        return trie
+    def __reduce__(self):
+        # Pool workers map the same file instead of receiving a copy of the tables
+        if self.path is not None:
+            return (FrozenSkillTrie.load, (self.path,))
+        return (FrozenSkillTrie, (bytes(self._buffer),))
+    @property
+    def root(self):
+        return FrozenNode(self, 0)
+    def insert(self, skill, metadata=None):
+        raise TypeError("FrozenSkillTrie is read-only; thaw() it to add skills")
+    def delete(self, skill):
+        raise TypeError("FrozenSkillTrie is read-only; thaw() it to remove skills")
+    def with_changes(self, changes):
+        """Mutable SkillTrie with changes applied; the snapshot itself is unchanged"""
+        skill_trie = self.thaw()
+        if self._scanner is not None:
+            # Same skills, so the scanner already built over the snapshot carries over
+            skill_trie._scanner = self._scanner
+            skill_trie._scanner_version = skill_trie.version
+        return skill_trie.with_changes(changes)
+    def thaw(self):
+        """Mutable SkillTrie with the same skills, metadata and insertion order"""
+        skill_trie = SkillTrie()
+        for skill, metadata in self.iter_skills():
+            skill_trie.insert(skill, metadata)
+        return skill_trie
+    def metadata_of(self, node):
+        value = self.terminal[node]
+        return self._metadata[value] if value >= 0 else None
+    def _find(self, skill):
+        """Node reached by spelling skill, or -1"""
+        offsets = self.offsets
+        labels = self.labels
+        node = 0
+        for char in skill.lower():
+            edge = labels.find(char, offsets[node], offsets[node + 1])
+            if edge < 0:
+                return -1
+            node = edge + 1
+        return node
+    def search(self, skill):
+        """Search for exact skill match"""
+        node = self._find(skill)
+        return node >= 0 and self.terminal[node] != NOT_END
+    def get_metadata(self, skill):
+        """Metadata stored with skill, or None"""
+        node = self._find(skill)
+        return self.metadata_of(node) if node >= 0 else None
+    def scanner(self):
+        """Aho-Corasick scanner over the frozen skills, built on first use"""
+        if self._scanner is None:
+            self._scanner = SkillScanner.from_trie(self)
+        return self._scanner
+    def fingerprint(self):
+        """Fingerprint of the SkillTrie this snapshot was taken from"""
+        return self._fingerprint
+    def fuzzy_search(self, term, max_distance=1, top_k=5):
+        """Fuzzy search with Levenshtein distance, as SkillTrie.fuzzy_search"""
+        offsets = self.offsets
+        terminal = self.terminal
+        labels = self.labels
+        def child(node, char):
+            edge = labels.find(char, offsets[node], offsets[node + 1])
+            return edge + 1 if edge >= 0 else None
+        return levenshtein_walk(
+            0, term, max_distance, top_k,
+            edges=lambda node: [(labels[edge], edge + 1) for edge in range(offsets[node], offsets[node + 1])],
+            child=child,
+            is_end=lambda node: terminal[node] != NOT_END,
+            has_children=lambda node: offsets[node + 1] > offsets[node]
+        )
+    def get_all_skills(self):
+        """Get all skills in the trie"""
+        offsets = self.offsets
+        labels = self.labels
+        terminal = self.terminal
+        skills = []
+        stack = [(0, '')]
+        while stack:
+            node, current_word = stack.pop()
+            if terminal[node] != NOT_END:
+                skills.append(current_word)
+            for edge in range(offsets[node + 1] - 1, offsets[node] - 1, -1):
+                stack.append((edge + 1, current_word + labels[edge]))
+        return skills
+    def iter_skills(self):
+        """Yield (skill, metadata) for every skill, in SkillTrie order"""
+        offsets = self.offsets
+        labels = self.labels
+        stack = [(0, '')]
+        while stack:
+            node, current_word = stack.pop()
+            if self.terminal[node] != NOT_END:
+                yield current_word, self.metadata_of(node)
+            for edge in range(offsets[node + 1] - 1, offsets[node] - 1, -1):
+                stack.append((edge + 1, current_word + labels[edge]))
+def main():
+    parser = argparse.ArgumentParser(description="Build a memory-mappable skill trie snapshot from a skills JSON file")
+    parser.add_argument('skills', help="Skills JSON file, as read by SkillTrie.load_skills_from_file")
+    parser.add_argument('--out', required=True, help="Snapshot path, e.g. data/skills.trie")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(name)s %(message)s")
+    skill_trie = SkillTrie()
+    skill_trie.load_skills_from_file(args.skills)
+    FrozenSkillTrie.save(skill_trie, args.out)
+    logging.info(f"Wrote {skill_trie.skill_count} skills to {args.out}")
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,116 @@
+from collections import deque, namedtuple
+SkillMatch = namedtuple('SkillMatch', ['skill', 'start', 'end', 'metadata'])
+# Whitespace variants are scanned as a plain space so "machine\nlearning" still matches
+WHITESPACE = str.maketrans({'\n': ' ', '\r': ' ', '\t': ' ', '\f': ' ', '\v': ' '})
+def is_word_char(char):
+    """Characters that may not touch either end of a skill occurrence"""
+    return char.isalnum() or char == '_'
+class SkillScanner:
+    """Aho-Corasick automaton that finds every skill of a SkillTrie in one pass
+
+    States are the trie nodes numbered breadth-first, so the goto function is
+    the trie itself; failure links and dictionary-suffix links are added on top.
+    """
+    __slots__ = ['goto', 'fail', 'output', 'length', 'metadata', 'dictionary_link']
+    def __init__(self, root):
+        self.goto = [{}]
+        self.fail = [0]
+        self.output = [None]
+        self.length = [0]
+        self.metadata = [None]
+        self.dictionary_link = [0]
+        nodes = deque([(root, 0, '')])
+        # Number the trie nodes breadth-first, copying the goto edges
+        while nodes:
+            node, state, prefix = nodes.popleft()
+            if node.is_end:
+                # An alias reports the skill it stands for
+                alias_of = node.metadata.get('alias_of') if isinstance(node.metadata, dict) else None
+                self.output[state] = alias_of or prefix
+                self.metadata[state] = node.metadata
+            for char, child_node in node.children.items():
+                child = len(self.goto)
+                self.goto[state][char] = child
+                self.goto.append({})
+                self.fail.append(0)
+                self.output.append(None)
+                self.length.append(self.length[state] + 1)
+                self.metadata.append(None)
+                self.dictionary_link.append(0)
+                nodes.append((child_node, child, prefix + char))
+        # Failure links in breadth-first order, so a parent's link is always ready
+        states = deque(self.goto[0].values())
+        while states:
+            state = states.popleft()
+            for char, child in self.goto[state].items():
+                fallback = self.fail[state]
+                while fallback and char not in self.goto[fallback]:
+                    fallback = self.fail[fallback]
+                target = self.goto[fallback].get(char, 0)
+                self.fail[child] = target if target != child else 0
+                link = self.fail[child]
+                self.dictionary_link[child] = link if self.output[link] is not None else self.dictionary_link[link]
+                states.append(child)
+    @classmethod
+    def from_trie(cls, skill_trie):
+        """Build a scanner over every skill currently in the trie"""
+        return cls(skill_trie.root)
+    @staticmethod
+    def normalize(text):
+        """Lowercased text with whitespace variants as spaces, offset-aligned with text"""
+        lowered = text.lower()
+        if len(lowered) != len(text):
+            # A few characters lowercase to several; keep offsets aligned with text
+            lowered = ''.join(char.lower()[0] for char in text)
+        return lowered.translate(WHITESPACE)
+    def scan(self, text):
+        """Return every word-bounded skill occurrence in text as SkillMatch tuples"""
+        lowered = self.normalize(text)
+        goto = self.goto
+        fail = self.fail
+        output = self.output
+        dictionary_link = self.dictionary_link
+        matches = []
+        state = 0
+        for position, char in enumerate(lowered):
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            found = state if output[state] is not None else dictionary_link[state]
+            while found:
+                end = position + 1
+                start = end - self.length[found]
+                if (start == 0 or not is_word_char(text[start - 1])) and \
+                        (end == len(text) or not is_word_char(text[end])):
+                    matches.append(SkillMatch(output[found], start, end, self.metadata[found]))
+                found = dictionary_link[found]
+        matches.sort(key=lambda match: (match.start, -match.end))
+        return matches
+    def find_skills(self, text):
+        """Return the distinct skills found in text, in order of first occurrence"""
+        return list(dict.fromkeys(match.skill for match in self.scan(text)))
+class LayeredScanner:
+    """A full SkillScanner plus a small overlay for skills changed since it was built
+
+    Matches of the base scanner whose text is a changed (masked) skill are
+    dropped and the overlay scanner reports the current entries of the changed
+    skills, so the result equals a scanner rebuilt over the whole taxonomy
+    while a change costs only a rebuild of the overlay.
+    """
+    __slots__ = ['base', 'masked', 'overlay', 'overlay_scanner']
+    def __init__(self, base, masked, overlay, overlay_scanner):
+        self.base = base
+        self.masked = masked
+        self.overlay = overlay
+        self.overlay_scanner = overlay_scanner
+    def scan(self, text):
+        matches = self.base.scan(text)
+        if self.masked:
+            lowered = SkillScanner.normalize(text)
+            matches = [match for match in matches if lowered[match.start:match.end] not in self.masked]
+        matches.extend(self.overlay_scanner.scan(text))
+        matches.sort(key=lambda match: (match.start, -match.end))
+        return matches
+    def find_skills(self, text):
+        """Return the distinct skills found in text, in order of first occurrence"""
+        return list(dict.fromkeys(match.skill for match in self.scan(text)))
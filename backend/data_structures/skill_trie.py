@@ -1,6 +1,15 @@
 
+import hashlib
+import heapq
 import json
 import logging
+from data_structures.skill_scanner import SkillScanner, LayeredScanner
+FINGERPRINT_MODULUS = 1 << 64
+# Changed skills a LayeredScanner may carry before the scanner is rebuilt whole
+MAX_OVERLAY_SKILLS = 2048
+_REMOVED = object()
+def _entry_hash(skill, metadata):
+    return int(hashlib.sha1(json.dumps([skill, metadata], sort_keys=True).encode('utf-8')).hexdigest()[:16], 16)
 class TrieNode:
     """Optimized Trie node using __slots__ for memory efficiency"""
     __slots__ = ['children', 'is_end', 'metadata']
@@ -8,11 +17,179 @@ class TrieNode:
         self.children = {}
         self.is_end = False
         self.metadata = None
+    def copy(self):
+        """Node with the same flag, metadata and children, sharing the child nodes"""
+        node = TrieNode()
+        node.children = dict(self.children)
+        node.is_end = self.is_end
+        node.metadata = self.metadata
+        return node
+class LevenshteinAutomaton:
+    """Lazily built DFA accepting strings within max_distance edits of a term
+
+    Each state is a Levenshtein row capped at max_distance + 1, so every trie
+    node reaching the same row shares one state and the row is computed once.
+    """
+    __slots__ = ['term', 'alphabet', 'max_distance', 'states', 'rows', 'minimum', 'distance', 'transitions', 'viable', 'start']
+    DEAD = -1
+    def __init__(self, term, max_distance):
+        self.term = term
+        self.alphabet = frozenset(term)
+        self.max_distance = max_distance
+        self.states = {}
+        self.rows = []
+        self.minimum = []
+        self.distance = []
+        self.transitions = {}
+        self.viable = {}
+        cap = max_distance + 1
+        self.start = self._state(tuple(min(column, cap) for column in range(len(term) + 1)))
+    def _state(self, row):
+        """Intern a row and return its state id, or DEAD if it can never match"""
+        state = self.states.get(row)
+        if state is None:
+            if min(row) > self.max_distance:
+                return self.DEAD
+            state = len(self.rows)
+            self.states[row] = state
+            self.rows.append(row)
+            self.minimum.append(min(row))
+            self.distance.append(row[-1])
+        return state
+    def step(self, state, char):
+        """Follow (and memoize) the transition for one character"""
+        if char not in self.alphabet:
+            # Every character absent from the term leads to the same state
+            following = self.transitions.get((state, None))
+            if following is None:
+                following = self._advance(state, None)
+                self.transitions[(state, None)] = following
+            self.transitions[(state, char)] = following
+            return following
+        following = self._advance(state, char)
+        self.transitions[(state, char)] = following
+        return following
+    def _advance(self, state, char):
+        """Compute the row reached from `state` by reading `char`"""
+        previous_row = self.rows[state]
+        term = self.term
+        cap = self.max_distance + 1
+        width = len(term)
+        low = 0
+        while previous_row[low] >= cap:
+            low += 1
+        high = width
+        while previous_row[high] >= cap:
+            high -= 1
+        row = [cap] * (width + 1)
+        if low == 0:
+            row[0] = previous_row[0] + 1 if previous_row[0] + 1 < cap else cap
+            low = 1
+        # Cells left of the previous row's first uncapped cell stay capped, and so do
+        # cells past its last one once the running value is capped too
+        for column in range(low, width + 1):
+            value = previous_row[column - 1]
+            if term[column - 1] != char:
+                value += 1
+            if previous_row[column] + 1 < value:
+                value = previous_row[column] + 1
+            if row[column - 1] + 1 < value:
+                value = row[column - 1] + 1
+            if value >= cap:
+                if column > high:
+                    break
+                value = cap
+            row[column] = value
+        return self._state(tuple(row))
+    def viable_chars(self, state, limit):
+        """Characters that keep `state` within `limit`, or None if any character does
+
+        Once the row minimum reaches the limit every further edit overshoots it,
+        so only the term characters continuing a cell at the limit survive.
+        """
+        key = (state, limit)
+        if key not in self.viable:
+            row = self.rows[state]
+            if self.minimum[state] < limit:
+                self.viable[key] = None
+            else:
+                self.viable[key] = frozenset(
+                    self.term[column] for column in range(len(self.term)) if row[column] == limit
+                )
+        return self.viable[key]
+def levenshtein_walk(root, term, max_distance, top_k, edges, child, is_end, has_children):
+    """Top-k (skill, distance) matches of term in a trie, walked with a LevenshteinAutomaton
+
+    The trie is read only through the accessors, so SkillTrie and
+    FrozenSkillTrie share the walk: edges(node) yields (char, child) pairs in
+    insertion order, child(node, char) returns a child or None, and
+    is_end/has_children test a node. Matches are ranked by distance, then by
+    discovery order.
+    """
+    if top_k <= 0 or max_distance < 0:
+        return []
+    automaton = LevenshteinAutomaton(term.lower(), max_distance)
+    transitions = automaton.transitions
+    minimum = automaton.minimum
+    distance = automaton.distance
+    viable = automaton.viable
+    # Max-heap on (distance, discovery order) so the worst kept match is on top
+    heap = []
+    path = []
+    state = {'limit': max_distance, 'found': 0}
+    def keep(match_distance):
+        entry = (-match_distance, -state['found'], ''.join(path))
+        state['found'] += 1
+        if len(heap) < top_k:
+            heapq.heappush(heap, entry)
+        else:
+            heapq.heapreplace(heap, entry)
+        if len(heap) == top_k:
+            # A later match only helps if it beats the worst one kept
+            state['limit'] = -heap[0][0] - 1
+    def dfs(node, current):
+        limit = state['limit']
+        chars = viable.get((current, limit), False)
+        if chars is False:
+            chars = automaton.viable_chars(current, limit)
+        if chars is None:
+            candidates = edges(node)
+        elif len(chars) == 1:
+            char = next(iter(chars))
+            child_node = child(node, char)
+            candidates = ((char, child_node),) if child_node is not None else ()
+        else:
+            candidates = [(char, child_node) for char, child_node in edges(node) if char in chars]
+        for char, child_node in candidates:
+            # The bound only tightens, so the candidates above stay a superset
+            limit = state['limit']
+            if limit < 0:
+                return
+            following = transitions.get((current, char))
+            if following is None:
+                following = automaton.step(current, char)
+            if following < 0 or minimum[following] > limit:
+                continue
+            path.append(char)
+            if is_end(child_node) and distance[following] <= limit:
+                keep(distance[following])
+            if has_children(child_node):
+                dfs(child_node, following)
+            path.pop()
+    if is_end(root) and distance[automaton.start] <= max_distance:
+        keep(distance[automaton.start])
+    dfs(root, automaton.start)
+    ranked = sorted(heap, key=lambda entry: (-entry[0], -entry[1]))
+    return [(skill, -match_distance) for match_distance, _, skill in ranked]
 class SkillTrie:
     """Trie data structure for efficient skill matching and fuzzy search"""
     def __init__(self):
         self.root = TrieNode()
         self.skill_count = 0
+        self.version = 0
+        self._scanner = None
+        self._scanner_version = None
+        self._fingerprint = None
     def insert(self, skill, metadata=None):
         """Insert a skill into the trie with optional metadata"""
         node = self.root
@@ -24,6 +201,107 @@ class SkillTrie:
             self.skill_count += 1
         node.is_end = True
         node.metadata = metadata
+        self.version += 1
+    def delete(self, skill):
+        """Remove a skill, pruning nodes no other skill uses; returns whether it was present"""
+        key = skill.lower()
+        path = [self.root]
+        for char in key:
+            node = path[-1].children.get(char)
+            if node is None:
+                return False
+            path.append(node)
+        if not path[-1].is_end:
+            return False
+        self._unlink(path, key)
+        return True
+    def _unlink(self, path, key):
+        """Unmark the last node of path and drop the nodes left without skills below them"""
+        path[-1].is_end = False
+        path[-1].metadata = None
+        for depth in range(len(key), 0, -1):
+            node = path[depth]
+            if node.is_end or node.children:
+                break
+            del path[depth - 1].children[key[depth - 1]]
+        self.skill_count -= 1
+        self.version += 1
+    def with_changes(self, changes):
+        """New trie with ('add', skill, metadata) and ('remove', skill, None) changes applied
+
+        Path copying: only the nodes on the path of a changed skill are copied
+        and every other subtree is shared, so this trie is left untouched for
+        readers still using it and a change costs O(len(skill)), not
+        O(taxonomy).
+        """
+        trie = SkillTrie()
+        trie.root = self.root.copy()
+        trie.skill_count = self.skill_count
+        trie.version = self.version
+        # Nodes created by this call, which later changes may modify in place
+        owned = {id(trie.root)}
+        # Final entry of every changed skill, and the change to the fingerprint sum
+        changed = {}
+        digest = 0
+        for operation, skill, metadata in changes:
+            key = skill.lower()
+            path = [trie.root]
+            for char in key:
+                parent = path[-1]
+                child = parent.children.get(char)
+                if child is None:
+                    if operation == 'remove':
+                        break
+                    child = TrieNode()
+                elif id(child) not in owned:
+                    child = child.copy()
+                else:
+                    path.append(child)
+                    continue
+                owned.add(id(child))
+                parent.children[char] = child
+                path.append(child)
+            else:
+                node = path[-1]
+                if node.is_end:
+                    digest -= _entry_hash(key, node.metadata)
+                if operation == 'add':
+                    if not node.is_end:
+                        trie.skill_count += 1
+                    node.is_end = True
+                    node.metadata = metadata
+                    trie.version += 1
+                    digest += _entry_hash(key, metadata)
+                    changed[key] = metadata
+                elif node.is_end:
+                    trie._unlink(path, key)
+                    changed[key] = _REMOVED
+        # Carry the fingerprint and scanner forward instead of recomputing them over every skill
+        if self._fingerprint is not None and self._fingerprint[0] == self.version:
+            trie._fingerprint = (trie.version, (self._fingerprint[1] + digest) % FINGERPRINT_MODULUS)
+        if self._scanner is not None and self._scanner_version == self.version:
+            trie._scanner = self._layered_scanner(self._scanner, changed) if changed else self._scanner
+            trie._scanner_version = trie.version if trie._scanner is not None else None
+        return trie
+    @staticmethod
+    def _layered_scanner(scanner, changed):
+        """Scanner over the skills of scanner with changed applied, or None once a full rebuild is due"""
+        if isinstance(scanner, LayeredScanner):
+            base, masked, overlay = scanner.base, set(scanner.masked), dict(scanner.overlay)
+        else:
+            base, masked, overlay = scanner, set(), {}
+        for key, metadata in changed.items():
+            masked.add(key)
+            if metadata is _REMOVED:
+                overlay.pop(key, None)
+            else:
+                overlay[key] = metadata
+        if len(masked) > MAX_OVERLAY_SKILLS:
+            return None
+        overlay_trie = SkillTrie()
+        for key, metadata in overlay.items():
+            overlay_trie.insert(key, metadata)
+        return LayeredScanner(base, frozenset(masked), overlay, SkillScanner.from_trie(overlay_trie))
     def search(self, skill):
         """Search for exact skill match"""
         node = self.root
@@ -32,37 +310,46 @@ class SkillTrie:
                 return False
             node = node.children[char]
         return node.is_end
-    def fuzzy_search(self, term, max_distance=1):
-        """Fuzzy search with Levenshtein distance"""
-        results = []
-        def dfs(node, current_word, remaining_term, distance):
-            if distance > max_distance:
-                return
-            if node.is_end and distance <= max_distance:
-                results.append((current_word, distance))
-            if not remaining_term:
-                # Only insertions left
-                for char, child_node in node.children.items():
-                    dfs(child_node, current_word + char, "", distance + 1)
-                return
-            current_char = remaining_term[0]
-            remaining = remaining_term[1:]
-            # Exact match
-            if current_char in node.children:
-                dfs(node.children[current_char], current_word + current_char, remaining, distance)
-            # Substitution
-            for char, child_node in node.children.items():
-                if char != current_char:
-                    dfs(child_node, current_word + char, remaining, distance + 1)
-            # Insertion
-            for char, child_node in node.children.items():
-                dfs(child_node, current_word + char, remaining_term, distance + 1)
-            # Deletion
-            dfs(node, current_word, remaining, distance + 1)
-        dfs(self.root, "", term.lower(), 0)
-        return sorted(results, key=lambda x: x[1])[:5]
-    def load_skills_from_file(self, file_path):
-        """Load skills from JSON file"""
+    def get_metadata(self, skill):
+        """Metadata stored with skill, or None"""
+        node = self.root
+        for char in skill.lower():
+            if char not in node.children:
+                return None
+            node = node.children[char]
+        return node.metadata if node.is_end else None
+    def scanner(self):
+        """Aho-Corasick scanner over the current skills, rebuilt after changes"""
+        if self._scanner is None or self._scanner_version != self.version:
+            self._scanner = SkillScanner.from_trie(self)
+            self._scanner_version = self.version
+        return self._scanner
+    def fingerprint(self):
+        """Content hash of skills and metadata, identical in every worker that loaded the same taxonomy
+
+        A sum of per-skill hashes, so it does not depend on insertion order and
+        with_changes can update it from the changed skills alone.
+        """
+        if self._fingerprint is None or self._fingerprint[0] != self.version:
+            digest = sum(_entry_hash(skill, metadata) for skill, metadata in self.iter_skills())
+            self._fingerprint = (self.version, digest % FINGERPRINT_MODULUS)
+        return format(self._fingerprint[1], '016x')
+    def fuzzy_search(self, term, max_distance=1, top_k=5):
+        """Fuzzy search with Levenshtein distance
+
+        Walks the trie with a Levenshtein automaton instead of branching on every
+        edit, drops a branch as soon as its state can no longer end within the
+        bound and tightens that bound once top_k matches are held.
+        """
+        return levenshtein_walk(
+            self.root, term, max_distance, top_k,
+            edges=lambda node: node.children.items(),
+            child=lambda node, char: node.children.get(char),
+            is_end=lambda node: node.is_end,
+            has_children=lambda node: bool(node.children)
+        )
+    def load_skills_from_file(self, file_path, strict=False):
+        """Load skills from JSON file; with strict, errors are raised after logging"""
         try:
             with open(file_path, 'r', encoding='utf-8') as f:
                 skills_data = json.load(f)
@@ -76,6 +363,8 @@ class SkillTrie:
                 logging.info(f"Loaded {self.skill_count} skills from {file_path}")
         except Exception as e:
             logging.error(f"Error loading skills: {e}")
+            if strict:
+                raise
     def get_all_skills(self):
         """Get all skills in the trie"""
         skills = []
@@ -86,4 +375,12 @@ class SkillTrie:
                 dfs(child_node, current_word + char)
         dfs(self.root, "")
         return skills
-
+    def iter_skills(self):
+        """Yield (skill, metadata) for every skill in the trie"""
+        stack = [(self.root, '')]
+        while stack:
+            node, current_word = stack.pop()
+            if node.is_end:
+                yield current_word, node.metadata
+            for char, child_node in reversed(list(node.children.items())):
+                stack.append((child_node, current_word + char))
@@ -0,0 +1,26 @@
+import gc
+import glob
+import os
+import tempfile
+bind = os.getenv('GUNICORN_BIND', '0.0.0.0:5000')
+workers = int(os.getenv('GUNICORN_WORKERS', 4))
+timeout = int(os.getenv('GUNICORN_TIMEOUT', 60))
+# Build the app and its models once in the master; workers share them copy-on-write
+preload_app = os.getenv('GUNICORN_PRELOAD', 'true').lower() == 'true'
+if preload_app:
+    os.environ.setdefault('PRELOAD_MODELS', 'true')
+# Workers write their metrics to files here and /metrics merges them. Set before
+# prometheus_client is imported. Its *.db files are removed so a restart does not
+# count twice; anything else in an operator's directory is left alone.
+metrics_dir = os.environ.setdefault('PROMETHEUS_MULTIPROC_DIR', os.path.join(tempfile.gettempdir(), 'resume-ai-metrics'))
+os.makedirs(metrics_dir, exist_ok=True)
+for path in glob.glob(os.path.join(metrics_dir, '*.db')):
+    os.remove(path)
+def when_ready(server):
+    # Move the preloaded objects out of the collector's reach, so collections in
+    # the workers do not write to (and un-share) the pages holding them
+    gc.freeze()
+def child_exit(server, worker):
+    # Drop the exited worker's live gauges; its counters and histograms are kept
+    from prometheus_client import multiprocess
+    multiprocess.mark_process_dead(worker.pid)
@@ -0,0 +1,268 @@
+import hashlib
+import json
+import logging
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Hashable, List, Optional, Sequence, Tuple
+from services.metrics import count_cache, count_trie
+from services.redis_service import ping_redis
+class LRUCacheBackend:
+    """In-process LRU store that evicts by total payload size"""
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self.current_bytes = 0
+        self.evictions = 0
+        self._items = OrderedDict()
+        self._lock = threading.Lock()
+    def get(self, key: str) -> Optional[bytes]:
+        with self._lock:
+            value = self._items.get(key)
+            if value is not None:
+                self._items.move_to_end(key)
+            return value
+    def set(self, key: str, value: bytes) -> None:
+        size = len(key) + len(value)
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            previous = self._items.pop(key, None)
+            if previous is not None:
+                self.current_bytes -= len(key) + len(previous)
+            self._items[key] = value
+            self.current_bytes += size
+            while self.current_bytes > self.max_bytes:
+                evicted_key, evicted = self._items.popitem(last=False)
+                self.current_bytes -= len(evicted_key) + len(evicted)
+                self.evictions += 1
+    def stats(self) -> Dict:
+        with self._lock:
+            return {
+                'backend': 'memory',
+                'entries': len(self._items),
+                'bytes': self.current_bytes,
+                'max_bytes': self.max_bytes,
+                'evictions': self.evictions
+            }
+class RedisCacheBackend:
+    """Redis store shared by every worker, with entries expiring after ttl seconds"""
+    def __init__(self, client, ttl: int, prefix: str = 'resume-ai:extract:'):
+        self.client = client
+        self.ttl = ttl
+        self.prefix = prefix
+    def get(self, key: str) -> Optional[bytes]:
+        return self.client.get(self.prefix + key)
+    def set(self, key: str, value: bytes) -> None:
+        self.client.set(self.prefix + key, value, ex=self.ttl or None)
+    def incr(self, counter: str) -> None:
+        self.client.hincrby(self.prefix + 'stats', counter, 1)
+    def stats(self) -> Dict:
+        info = self.client.info('memory')
+        shared = {k.decode(): int(v) for k, v in self.client.hgetall(self.prefix + 'stats').items()}
+        return {
+            'backend': 'redis',
+            'used_memory': info.get('used_memory'),
+            'maxmemory': info.get('maxmemory'),
+            'shared_hits': shared.get('hits', 0),
+            'shared_misses': shared.get('misses', 0)
+        }
+class ExtractionCache:
+    """Content-addressed cache of extracted resume text and entities
+
+    Keys combine the SHA-256 of the uploaded bytes with a version string, so
+    a taxonomy or model change never serves stale entities.
+    """
+    def __init__(self, backend=None):
+        self.backend = backend
+        self.hits = 0
+        self.misses = 0
+        self.errors = 0
+    @staticmethod
+    def content_hash(data: bytes) -> str:
+        """Hash of the raw upload bytes"""
+        return hashlib.sha256(data).hexdigest()
+    @staticmethod
+    def stream_hash(stream, chunk_size: int = 64 * 1024) -> str:
+        """Hash of a seekable upload stream, read in chunks and rewound afterwards"""
+        digest = hashlib.sha256()
+        stream.seek(0)
+        for chunk in iter(lambda: stream.read(chunk_size), b''):
+            digest.update(chunk)
+        stream.seek(0)
+        return digest.hexdigest()
+    @staticmethod
+    def make_key(content_hash: str, version: str) -> str:
+        return f"{version}:{content_hash}"
+    def get(self, content_hash: str, version: str) -> Optional[Dict]:
+        """Return the cached extraction for an upload, or None on a miss"""
+        if self.backend is None:
+            return None
+        try:
+            value = self.backend.get(self.make_key(content_hash, version))
+        except Exception as e:
+            self.errors += 1
+            count_cache('extraction', 'error')
+            logging.warning(f"Extraction cache lookup failed: {e}")
+            return None
+        self._count('hits' if value is not None else 'misses')
+        count_cache('extraction', 'hit' if value is not None else 'miss')
+        return json.loads(value) if value is not None else None
+    def set(self, content_hash: str, version: str, extraction: Dict) -> None:
+        """Store the extraction for an upload"""
+        if self.backend is None:
+            return
+        try:
+            self.backend.set(self.make_key(content_hash, version), json.dumps(extraction).encode('utf-8'))
+        except Exception as e:
+            self.errors += 1
+            logging.warning(f"Extraction cache store failed: {e}")
+    def _count(self, counter: str) -> None:
+        setattr(self, counter, getattr(self, counter) + 1)
+        if hasattr(self.backend, 'incr'):
+            try:
+                self.backend.incr(counter)
+            except Exception as e:
+                logging.warning(f"Extraction cache counter update failed: {e}")
+    def stats(self) -> Dict:
+        """Hit/miss counters of this worker plus backend occupancy"""
+        lookups = self.hits + self.misses
+        stats = {
+            'hits': self.hits,
+            'misses': self.misses,
+            'errors': self.errors,
+            'hit_ratio': round(self.hits / lookups, 4) if lookups else 0.0
+        }
+        if self.backend is None:
+            stats['backend'] = 'none'
+            return stats
+        try:
+            stats.update(self.backend.stats())
+        except Exception as e:
+            logging.warning(f"Extraction cache stats unavailable: {e}")
+        return stats
+def create_extraction_cache(config) -> ExtractionCache:
+    """Build the extraction cache selected by EXTRACTION_CACHE_BACKEND
+
+    "auto" uses Redis when it answers and falls back to the in-process LRU.
+    """
+    backend = config["EXTRACTION_CACHE_BACKEND"]
+    if backend == "none":
+        return ExtractionCache()
+    if backend in ("redis", "auto"):
+        client = ping_redis(config["REDIS_URL"])
+        if client is not None:
+            return ExtractionCache(RedisCacheBackend(client, config["EXTRACTION_CACHE_TTL"]))
+        if backend == "redis":
+            logging.warning("Falling back to the in-process extraction cache")
+    return ExtractionCache(LRUCacheBackend(config["EXTRACTION_CACHE_MAX_BYTES"]))
+class VersionedLRU:
+    """Bounded, thread-safe LRU whose entries belong to one version
+
+    Callers pass the version their values were computed against, such as a
+    taxonomy fingerprint or a model version: the first lookup under another
+    version clears the cache, and values computed against a version that
+    was replaced meanwhile are not stored. With a ttl, entries older than
+    ttl seconds are misses, for values another worker may change.
+    """
+    def __init__(self, name: str, max_entries: int, ttl: float = 0):
+        self.name = name
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.version = None
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+        self._items = OrderedDict()
+        self._lock = threading.Lock()
+    def get_many(self, keys: Sequence[Hashable], version: Hashable = None) -> Dict:
+        """Cached values of keys under version; each distinct missing key is one miss, its repeats are hits"""
+        found = {}
+        missing = set()
+        now = time.monotonic()
+        with self._lock:
+            if version != self.version:
+                if self.version is not None:
+                    self.invalidations += 1
+                self._items.clear()
+                self.version = version
+            for key in keys:
+                if key in found or key in missing:
+                    continue
+                entry = self._items.get(key)
+                if entry is not None and self.ttl and now - entry[1] > self.ttl:
+                    del self._items[key]
+                    entry = None
+                if entry is None:
+                    missing.add(key)
+                else:
+                    self._items.move_to_end(key)
+                    found[key] = entry[0]
+            self.hits += len(keys) - len(missing)
+            self.misses += len(missing)
+        count_cache(self.name, 'hit', len(keys) - len(missing))
+        count_cache(self.name, 'miss', len(missing))
+        return found
+    def get(self, key: Hashable, version: Hashable = None):
+        """Cached value of key under version, or None"""
+        return self.get_many([key], version).get(key)
+    def put_many(self, items: Dict, version: Hashable = None) -> None:
+        now = time.monotonic()
+        with self._lock:
+            if version != self.version:
+                return
+            for key, value in items.items():
+                self._items[key] = (value, now)
+                self._items.move_to_end(key)
+            while len(self._items) > self.max_entries:
+                self._items.popitem(last=False)
+                self.evictions += 1
+    def put(self, key: Hashable, value, version: Hashable = None) -> None:
+        self.put_many({key: value}, version)
+    def discard(self, key: Hashable) -> None:
+        with self._lock:
+            self._items.pop(key, None)
+    def stats(self) -> Dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'entries': len(self._items),
+                'max_entries': self.max_entries,
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_ratio': round(self.hits / lookups, 4) if lookups else 0.0,
+                'evictions': self.evictions,
+                'invalidations': self.invalidations,
+                'version': self.version
+            }
+class SkillResolutionCache(VersionedLRU):
+    """Bounded, thread-safe LRU of token -> fuzzy skill resolution
+
+    Remembers, per lowercased token, the closest skill within the fuzzy
+    distance and its distance, or that there is none, so vocabulary repeated
+    across resumes skips the trie walk. Entries belong to one taxonomy
+    fingerprint: the first lookup against a changed trie clears the cache.
+    """
+    def __init__(self, max_entries: int = 100000):
+        super().__init__('skill_resolution', max_entries)
+    def resolve_all(self, skill_trie, tokens: Sequence[str], max_distance: int = 1) -> List[Optional[Tuple[str, int]]]:
+        """(skill, distance) of the best fuzzy match of every token, or None where nothing is close enough"""
+        version = (skill_trie.fingerprint(), max_distance)
+        keys = [token.lower() for token in tokens]
+        found = self.get_many(keys, version)
+        # Trie walks run outside the lock; each distinct unknown token is walked once
+        resolved = {}
+        for key in keys:
+            if key not in found and key not in resolved:
+                matches = skill_trie.fuzzy_search(key, max_distance=max_distance, top_k=1)
+                resolved[key] = tuple(matches[0]) if matches and matches[0][1] <= max_distance else None
+        # A swap while walking leaves these results to the old taxonomy
+        self.put_many(resolved, version)
+        count_trie('fuzzy', len(resolved))
+        found.update(resolved)
+        return [found[key] for key in keys]
+    def stats(self) -> Dict:
+        stats = super().stats()
+        version = stats.pop('version')
+        stats['taxonomy_fingerprint'] = version[0] if version else None
+        return stats
@@ -0,0 +1,168 @@
+import io
+import logging
+import multiprocessing
+import os
+import threading
+import time
+from concurrent.futures import Future, ProcessPoolExecutor, TimeoutError as FuturesTimeout
+from concurrent.futures.process import BrokenProcessPool
+from algorithms.sections import Line
+from services.file_service import FileService
+class ExtractionTimeout(Exception):
+    """Raised when extracting a document takes longer than the configured timeout"""
+def _extract_page_range(data, start, end):
+    """Pool task: extract pages [start, end) of a PDF held in memory"""
+    return FileService.extract_pdf_pages(io.BytesIO(data), start, end)
+class ExtractionPool:
+    """Text extraction backend that fans large PDFs out to a process pool
+
+    PDFs with at least `parallel_min_pages` pages are split into ranges of
+    `pages_per_chunk` pages, extracted in parallel and joined in page order.
+    Everything else, and every document when the backend is "sequential",
+    is extracted in the calling thread. The pool is created on first use so
+    each gunicorn worker starts its own after forking.
+    """
+    def __init__(self, backend="process", max_workers=2, pages_per_chunk=5,
+                 parallel_min_pages=8, max_pages=50, timeout=30):
+        self.backend = backend
+        self.max_workers = max_workers
+        self.pages_per_chunk = pages_per_chunk
+        self.parallel_min_pages = parallel_min_pages
+        self.max_pages = max_pages
+        self.timeout = timeout
+        self._executor = None
+        self._executor_pid = None
+        self._lock = threading.Lock()
+    @classmethod
+    def from_config(cls, config):
+        return cls(
+            backend=config["PDF_EXTRACTION_BACKEND"],
+            max_workers=config["EXTRACTION_WORKERS"],
+            pages_per_chunk=config["EXTRACTION_PAGES_PER_CHUNK"],
+            parallel_min_pages=config["EXTRACTION_PARALLEL_MIN_PAGES"],
+            max_pages=config["EXTRACTION_MAX_PAGES"],
+            timeout=config["EXTRACTION_TIMEOUT"]
+        )
+    def _get_executor(self):
+        if self._executor is None or self._executor_pid != os.getpid():
+            with self._lock:
+                if self._executor is None or self._executor_pid != os.getpid():
+                    self._executor = ProcessPoolExecutor(
+                        max_workers=self.max_workers,
+                        mp_context=multiprocessing.get_context("spawn")
+                    )
+                    self._executor_pid = os.getpid()
+        return self._executor
+    def _discard_executor(self, executor):
+        """Drop a pool whose worker died so the next document starts a fresh one"""
+        with self._lock:
+            if executor is not None and self._executor is executor:
+                self._executor = None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+    def _abandon(self, executor, chunks):
+        """Cancel the ranges of a timed-out document, recycling the pool if some are already running
+
+        A running range cannot be cancelled and keeps its worker busy after the
+        timeout, so the pool is discarded and the next document starts a fresh one.
+        """
+        running = [chunk for chunk in chunks if not chunk.cancel() and not chunk.done()]
+        if running:
+            self._discard_executor(executor)
+    def submit(self, source, file_type):
+        """Start extracting a document and return a Future of its cleaned text"""
+        future = Future()
+        future.chunks = []
+        future.executor = executor = None
+        try:
+            if file_type.lower() != 'pdf':
+                future.set_result(FileService.extract_text(source, file_type))
+                return future
+            source = FileService.as_source(source)
+            page_count = min(FileService.count_pdf_pages(source), self.max_pages)
+            if self.backend != "process" or page_count < self.parallel_min_pages:
+                future.set_result(FileService.join_pages(FileService.extract_pdf_pages(source, 0, page_count)))
+                return future
+            data = FileService.read_bytes(source)
+            executor = self._get_executor()
+            future.executor = executor
+            future.chunks = [
+                executor.submit(_extract_page_range, data, start, min(start + self.pages_per_chunk, page_count))
+                for start in range(0, page_count, self.pages_per_chunk)
+            ]
+        except Exception as e:
+            logging.error(f"Error extracting text: {e}")
+            if isinstance(e, BrokenProcessPool):
+                self._discard_executor(executor)
+            future.set_exception(e)
+            return future
+        remaining = [len(future.chunks)]
+        lock = threading.Lock()
+        def chunk_done(_):
+            with lock:
+                remaining[0] -= 1
+                if remaining[0] or future.done():
+                    return
+            try:
+                pages = [page for chunk in future.chunks for page in chunk.result()]
+                future.set_result(FileService.join_pages(pages))
+            except Exception as e:
+                logging.error(f"Error extracting PDF text: {e}")
+                if isinstance(e, BrokenProcessPool):
+                    self._discard_executor(executor)
+                future.set_exception(e)
+        for chunk in future.chunks:
+            chunk.add_done_callback(chunk_done)
+        return future
+    def extract_text(self, source, file_type):
+        """Extract a document, waiting at most `timeout` seconds for the pool"""
+        future = self.submit(source, file_type)
+        try:
+            return future.result(timeout=self.timeout)
+        except FuturesTimeout:
+            self._abandon(future.executor, future.chunks)
+            raise ExtractionTimeout(f"Text extraction took longer than {self.timeout}s")
+    def extract_lines(self, source, file_type):
+        """Lines of a document in page order, as a generator, for section segmentation
+
+        Large PDFs are extracted by the pool as in extract_text, under the same
+        timeout. Everything else streams from FileService.iter_lines, so pages
+        are parsed only as they are consumed and at most `max_pages` are read.
+        """
+        if file_type.lower() != 'pdf':
+            return FileService.iter_lines(source, file_type)
+        source = FileService.as_source(source)
+        page_count = min(FileService.count_pdf_pages(source), self.max_pages)
+        if self.backend != "process" or page_count < self.parallel_min_pages:
+            return FileService.iter_lines(source, file_type, max_pages=page_count)
+        return self._pooled_lines(FileService.read_bytes(source), page_count)
+    def _pooled_lines(self, data, page_count):
+        executor = self._get_executor()
+        starts = range(0, page_count, self.pages_per_chunk)
+        chunks = [
+            executor.submit(_extract_page_range, data, start, min(start + self.pages_per_chunk, page_count))
+            for start in starts
+        ]
+        deadline = time.monotonic() + self.timeout
+        try:
+            # Lines of each range are yielded as soon as it and the ranges before it are done; ranges keep
+            # their blank pages, so page numbers match FileService.iter_lines
+            for start, chunk in zip(starts, chunks):
+                pages = chunk.result(timeout=max(deadline - time.monotonic(), 0))
+                for offset, text in enumerate(pages):
+                    for line in text.splitlines():
+                        yield Line(start + offset, line)
+        except FuturesTimeout:
+            self._abandon(executor, chunks)
+            raise ExtractionTimeout(f"Text extraction took longer than {self.timeout}s")
+        except BrokenProcessPool:
+            self._discard_executor(executor)
+            raise
+        finally:
+            # Also reached when the caller stops early: ranges not yet started are dropped
+            for chunk in chunks:
+                chunk.cancel()
+    def shutdown(self):
+        if self._executor is not None and self._executor_pid == os.getpid():
+            self._executor.shutdown(wait=False, cancel_futures=True)
+        self._executor = None
@@ -1,56 +1,153 @@
 
 import pdfplumber
+from pdfminer.pdfdocument import PDFDocument
+from pdfminer.pdfparser import PDFParser
+from pdfminer.pdftypes import resolve1
 from docx import Document
-import re
+import io
+import os
+import shutil
+import tempfile
 import logging
-from typing import Tuple
+from typing import Iterator, List, Tuple
+from algorithms.sections import Line
+from algorithms.text_patterns import clean_text
 class FileService:
     """Service for extracting text from various file formats"""
+    # Uploads larger than this are spooled to a temporary file instead of memory
+    SPOOL_MAX_MEMORY = 1024 * 1024
+    CHUNK_SIZE = 64 * 1024
     @staticmethod
-    def extract_text(file_path: str, file_type: str) -> str:
-        """Extract text from uploaded file based on file type"""
+    def extract_text(source, file_type: str) -> str:
+        """Extract text from a file path, raw bytes or a binary stream based on file type"""
         try:
+            source = FileService.as_source(source)
             if file_type.lower() == 'pdf':
-                return FileService._extract_from_pdf(file_path)
+                return FileService._extract_from_pdf(source)
             elif file_type.lower() in ['docx', 'doc']:
-                return FileService._extract_from_docx(file_path)
+                return FileService._extract_from_docx(source)
             elif file_type.lower() == 'txt':
-                return FileService._extract_from_txt(file_path)
+                return FileService._extract_from_txt(source)
             else:
                 raise ValueError(f"Unsupported file type: {file_type}")
         except Exception as e:
-            logging.error(f"Error extracting text from {file_path}: {e}")
+            logging.error(f"Error extracting text from {FileService._describe(source)}: {e}")
             raise
     @staticmethod
-    def _extract_from_pdf(file_path: str) -> str:
+    def iter_lines(source, file_type: str, max_pages: int = None) -> Iterator[Line]:
+        """Lines of a file path, raw bytes or binary stream as laid out, page by page and uncleaned
+
+        A generator: PDF pages are parsed only as they are consumed and released
+        after their lines are yielded, so stopping early skips the rest of the file.
+        """
+        source = FileService.as_source(source)
+        file_type = file_type.lower()
+        if file_type == 'pdf':
+            with pdfplumber.open(source) as pdf:
+                for number, page in enumerate(pdf.pages[:max_pages]):
+                    text = page.extract_text()
+                    # Drop the page's parsed layout objects before moving on
+                    page.flush_cache()
+                    for line in (text or '').splitlines():
+                        yield Line(number, line)
+        elif file_type in ['docx', 'doc']:
+            for paragraph in Document(source).paragraphs:
+                for line in paragraph.text.splitlines() or ['']:
+                    yield Line(0, line)
+        elif file_type == 'txt':
+            if isinstance(source, (str, os.PathLike)):
+                with open(source, 'r', encoding='utf-8') as file:
+                    yield from (Line(0, line.rstrip('\r\n')) for line in file)
+            else:
+                file = io.TextIOWrapper(source, encoding='utf-8')
+                try:
+                    yield from (Line(0, line.rstrip('\r\n')) for line in file)
+                finally:
+                    # Leave the caller's stream open
+                    file.detach()
+        else:
+            raise ValueError(f"Unsupported file type: {file_type}")
+    @staticmethod
+    def spool(stream, max_memory: int = None, directory: str = None):
+        """Copy a stream into memory, spilling to a temporary file above max_memory bytes"""
+        spooled = tempfile.SpooledTemporaryFile(
+            max_size=max_memory or FileService.SPOOL_MAX_MEMORY, mode='w+b', dir=directory
+        )
+        shutil.copyfileobj(stream, spooled, FileService.CHUNK_SIZE)
+        spooled.seek(0)
+        return spooled
+    @staticmethod
+    def as_source(source):
+        """Normalize a source to a path or a seekable binary stream positioned at the start"""
+        if isinstance(source, (str, os.PathLike)):
+            return source
+        if isinstance(source, (bytes, bytearray, memoryview)):
+            return io.BytesIO(source)
+        if not source.seekable():
+            return FileService.spool(source)
+        source.seek(0)
+        return source
+    @staticmethod
+    def read_bytes(source) -> bytes:
+        """Read a whole path or stream source into memory"""
+        if isinstance(source, (str, os.PathLike)):
+            with open(source, 'rb') as f:
+                return f.read()
+        source.seek(0)
+        return source.read()
+    @staticmethod
+    def _describe(source) -> str:
+        return source if isinstance(source, (str, os.PathLike)) else f"<{type(source).__name__}>"
+    @staticmethod
+    def _extract_from_pdf(source) -> str:
         """Extract text from PDF file"""
-        text = ""
+        return FileService.join_pages(FileService.extract_pdf_pages(source))
+    @staticmethod
+    def extract_pdf_pages(source, start: int = 0, end: int = None) -> List[str]:
+        """Extract the text of pages [start, end) of a PDF, one entry per page ('' for a page without text)"""
+        # Page numbers passed to pdfplumber are 1-based; only those pages are parsed
+        page_numbers = list(range(start + 1, end + 1)) if end is not None else None
         try:
-            with pdfplumber.open(file_path) as pdf:
-                for page in pdf.pages:
-                    page_text = page.extract_text()
-                    if page_text:
-                        text += page_text + "\n"
+            with pdfplumber.open(FileService.as_source(source), pages=page_numbers) as pdf:
+                pages = pdf.pages if end is not None else pdf.pages[start:]
+                return [page.extract_text() or '' for page in pages]
         except Exception as e:
             logging.error(f"Error extracting PDF text: {e}")
             raise
-        return FileService._clean_text(text)
     @staticmethod
-    def _extract_from_docx(file_path: str) -> str:
+    def join_pages(pages: List[str]) -> str:
+        """Join extracted pages in order, skipping empty ones, and clean the result"""
+        return FileService._clean_text("\n".join(page for page in pages if page))
+    @staticmethod
+    def count_pdf_pages(source) -> int:
+        """Read the page count from the PDF page tree without parsing any page"""
+        stream = FileService.as_source(source)
+        if isinstance(stream, (str, os.PathLike)):
+            with open(stream, 'rb') as f:
+                return FileService.count_pdf_pages(f)
+        document = PDFDocument(PDFParser(stream))
+        count = int(resolve1(resolve1(document.catalog['Pages'])['Count']))
+        stream.seek(0)
+        return count
+    @staticmethod
+    def _extract_from_docx(source) -> str:
         """Extract text from DOCX file"""
         try:
-            doc = Document(file_path)
+            doc = Document(source)
             text = "\n".join([paragraph.text for paragraph in doc.paragraphs])
             return FileService._clean_text(text)
         except Exception as e:
             logging.error(f"Error extracting DOCX text: {e}")
             raise
     @staticmethod
-    def _extract_from_txt(file_path: str) -> str:
+    def _extract_from_txt(source) -> str:
         """Extract text from TXT file"""
         try:
-            with open(file_path, 'r', encoding='utf-8') as file:
-                text = file.read()
+            if isinstance(source, (str, os.PathLike)):
+                with open(source, 'r', encoding='utf-8') as file:
+                    text = file.read()
+            else:
+                text = source.read().decode('utf-8')
             return FileService._clean_text(text)
         except Exception as e:
             logging.error(f"Error extracting TXT text: {e}")
@@ -58,13 +155,8 @@ class FileService:
     @staticmethod
     def _clean_text(text: str) -> str:
         """Clean and normalize extracted text"""
-        # Remove excessive whitespace
-        text = re.sub(r'\s+', ' ', text)
-        # Remove special characters but keep essential punctuation
-        text = re.sub(r'[^\w\s@.-]', ' ', text)
-        # Remove multiple spaces
-        text = re.sub(r' +', ' ', text)
-        return text.strip()
+        # Collapse whitespace and special characters, keeping essential punctuation, in one pass
+        return clean_text(text)
     @staticmethod
     def validate_file(filename: str, max_size: int = 5 * 1024 * 1024) -> Tuple[bool, str]:
         """Validate uploaded file"""
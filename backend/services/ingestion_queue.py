@@ -0,0 +1,373 @@
+import json
+import logging
+import multiprocessing
+import os
+import threading
+import time
+import uuid
+import zipfile
+import zlib
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from datetime import datetime
+from functools import partial
+from typing import Dict, Iterator, List, Optional, Tuple
+from services.cache_service import ExtractionCache
+from services.file_service import FileService
+from services.redis_service import ping_redis
+from services.resume_store import resume_document
+class QueueFull(Exception):
+    """Raised when accepting a job would exceed the ingestion backlog limit"""
+class UploadTooLarge(Exception):
+    """Raised when the files of an upload add up to more than the ingestion size limit once unpacked"""
+# NLP service of a pool worker process, set once by _init_worker
+_worker_nlp_service = None
+def _init_worker(nlp_service):
+    global _worker_nlp_service
+    _worker_nlp_service = nlp_service
+def _ingest_documents(documents, nlp_service=None):
+    """Pool task: extract text from uploaded documents and run batched entity extraction
+
+    Returns one (text, entities, error) tuple per (data, file_type) document;
+    a document that fails extraction does not fail the rest of the batch.
+    """
+    nlp_service = nlp_service or _worker_nlp_service
+    texts = []
+    for data, file_type in documents:
+        try:
+            texts.append((FileService.extract_text(data, file_type), None))
+        except Exception as e:
+            texts.append((None, str(e) or type(e).__name__))
+    entities = iter(nlp_service.extract_entities_batch([text for text, error in texts if error is None]))
+    return [(text, next(entities), None) if error is None else (None, None, error) for text, error in texts]
+def unpack_upload(filename: str, stream, max_file_size: int,
+                  max_total_size: Optional[int] = None) -> Iterator[Tuple[str, Optional[bytes], Optional[str]]]:
+    """Yield (filename, data, error) for an uploaded file, expanding zip archives
+
+    Archive members are checked against max_file_size before being read, so a
+    small archive cannot inflate into an arbitrarily large ingestion job, and
+    UploadTooLarge is raised before the files read would add up to more than
+    max_total_size bytes.
+    """
+    if not filename.lower().endswith('.zip'):
+        data = stream.read(max_file_size + 1)
+        if len(data) > max_file_size:
+            yield filename, None, f"File exceeds {max_file_size} bytes"
+        elif max_total_size is not None and len(data) > max_total_size:
+            raise UploadTooLarge(f"Uploaded files exceed {max_total_size} bytes")
+        else:
+            yield filename, data, None
+        return
+    try:
+        archive = zipfile.ZipFile(stream)
+    except zipfile.BadZipFile:
+        yield filename, None, "Invalid zip archive"
+        return
+    total_size = 0
+    with archive:
+        for member in archive.infolist():
+            name = os.path.basename(member.filename)
+            # Skip directories and the metadata macOS adds to archives
+            if member.is_dir() or not name or name.startswith('.') or member.filename.startswith('__MACOSX/'):
+                continue
+            if member.file_size > max_file_size:
+                yield name, None, f"File exceeds {max_file_size} bytes"
+                continue
+            # Reads stop at the declared size, so the sum of declared sizes bounds what is inflated
+            total_size += member.file_size
+            if max_total_size is not None and total_size > max_total_size:
+                raise UploadTooLarge(f"Uploaded files exceed {max_total_size} bytes uncompressed")
+            try:
+                data = archive.read(member)
+            except (zipfile.BadZipFile, zlib.error, EOFError):
+                yield name, None, "Corrupt archive member"
+                continue
+            yield name, data, None
+class MemoryJobStore:
+    """Job records held in this process; polls must reach the worker that accepted the job"""
+    def __init__(self, ttl: int = 24 * 3600):
+        self.ttl = ttl
+        self._jobs: Dict[str, Dict] = {}
+        self._lock = threading.Lock()
+    def create(self, job_id: str, meta: Dict, files: List[Dict]) -> None:
+        with self._lock:
+            # Drop expired jobs whenever a new one arrives
+            cutoff = time.time() - self.ttl
+            for expired in [key for key, job in self._jobs.items() if job['created'] < cutoff]:
+                del self._jobs[expired]
+            self._jobs[job_id] = {'created': time.time(), 'meta': meta, 'files': [dict(record) for record in files]}
+    def update_file(self, job_id: str, index: int, record: Dict) -> None:
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is not None:
+                job['files'][index] = record
+    def get(self, job_id: str) -> Optional[Tuple[Dict, List[Dict]]]:
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is None:
+                return None
+            return dict(job['meta']), [dict(record) for record in job['files']]
+    @property
+    def name(self) -> str:
+        return 'memory'
+class RedisJobStore:
+    """Job records in a Redis hash per job, so any worker can answer a poll"""
+    def __init__(self, client, ttl: int = 24 * 3600, prefix: str = 'resume-ai:job:'):
+        self.client = client
+        self.ttl = ttl
+        self.prefix = prefix
+    def create(self, job_id: str, meta: Dict, files: List[Dict]) -> None:
+        key = self.prefix + job_id
+        fields = {'meta': json.dumps(meta)}
+        fields.update({f"file:{record['index']}": json.dumps(record) for record in files})
+        pipe = self.client.pipeline()
+        pipe.hset(key, mapping=fields)
+        pipe.expire(key, self.ttl)
+        pipe.execute()
+    def update_file(self, job_id: str, index: int, record: Dict) -> None:
+        # One field per file, so concurrent completions never overwrite each other
+        self.client.hset(self.prefix + job_id, f"file:{index}", json.dumps(record))
+    def get(self, job_id: str) -> Optional[Tuple[Dict, List[Dict]]]:
+        fields = self.client.hgetall(self.prefix + job_id)
+        if not fields or b'meta' not in fields:
+            return None
+        meta = json.loads(fields.pop(b'meta'))
+        files = sorted((json.loads(value) for value in fields.values()), key=lambda record: record['index'])
+        return meta, files
+    @property
+    def name(self) -> str:
+        return 'redis'
+def create_job_store(config):
+    """Build the job store selected by INGEST_JOB_STORE
+
+    "auto" uses Redis when it answers and falls back to the in-process store.
+    """
+    backend = config["INGEST_JOB_STORE"]
+    if backend in ("redis", "auto"):
+        client = ping_redis(config["REDIS_URL"])
+        if client is not None:
+            return RedisJobStore(client, config["INGEST_JOB_TTL"])
+        if backend == "redis":
+            logging.warning("Falling back to the in-process ingestion job store")
+    return MemoryJobStore(config["INGEST_JOB_TTL"])
+class IngestionQueue:
+    """Bulk resume ingestion on a bounded worker pool
+
+    Accepted files are grouped into pool tasks of `batch_size` files, each
+    running FileService extraction and one batched NLP service call. At most `max_pending` files are queued or running
+    per process; a job that would go over the limit is rejected with
+    QueueFull instead of growing the backlog. Results go to the job store
+    as each file finishes and are also written to the extraction cache, so
+    a later /api/upload of the same bytes is a cache hit, to the skill
+    index, so the resume can be found by /api/candidates/search, and to the
+    resume store in one bulk write per batch, so it can be scored by id.
+    """
+    def __init__(self, store, nlp_service, cache=None, skill_index=None, resume_store=None, backend="process",
+                 max_workers=2, batch_size=16, max_pending=1000, preview_length=500):
+        self.store = store
+        self.skill_index = skill_index
+        self.resume_store = resume_store
+        self.nlp_service = nlp_service
+        self.cache = cache or ExtractionCache()
+        self.backend = backend
+        self.max_workers = max_workers
+        self.batch_size = batch_size
+        self.max_pending = max_pending
+        self.preview_length = preview_length
+        self.pending = 0
+        self._executor = None
+        self._executor_pid = None
+        self._lock = threading.Lock()
+    @classmethod
+    def from_config(cls, config, nlp_service, cache=None, skill_index=None, resume_store=None):
+        return cls(
+            store=create_job_store(config),
+            nlp_service=nlp_service,
+            cache=cache,
+            skill_index=skill_index,
+            resume_store=resume_store,
+            backend=config["INGEST_BACKEND"],
+            max_workers=config["INGEST_WORKERS"],
+            batch_size=config["INGEST_BATCH_SIZE"],
+            max_pending=config["INGEST_MAX_PENDING"]
+        )
+    def _get_executor(self):
+        if self._executor is None or self._executor_pid != os.getpid():
+            with self._lock:
+                if self._executor is None or self._executor_pid != os.getpid():
+                    if self.backend == "process":
+                        # Workers receive the NLP service once, not with every task
+                        self._executor = ProcessPoolExecutor(
+                            max_workers=self.max_workers,
+                            mp_context=multiprocessing.get_context("spawn"),
+                            initializer=_init_worker,
+                            initargs=(self.nlp_service,)
+                        )
+                    else:
+                        self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="ingest")
+                    self._executor_pid = os.getpid()
+        return self._executor
+    def retire_workers(self):
+        """Send new batches to a fresh pool, e.g. after the taxonomy changed; queued batches finish on the old one"""
+        with self._lock:
+            executor = self._executor if self._executor_pid == os.getpid() else None
+            self._executor = None
+        if executor is not None and self.backend == "process":
+            executor.shutdown(wait=False)
+    def _discard_executor(self, executor):
+        """Drop a pool whose worker died so the next job starts a fresh one"""
+        with self._lock:
+            if self._executor is executor:
+                self._executor = None
+        executor.shutdown(wait=False, cancel_futures=True)
+    def _reserve(self, count: int) -> None:
+        with self._lock:
+            if self.pending + count > self.max_pending:
+                raise QueueFull(f"Ingestion backlog is full ({self.pending}/{self.max_pending} files pending)")
+            self.pending += count
+    def _release(self) -> None:
+        with self._lock:
+            self.pending -= 1
+    def submit(self, documents: List[Tuple[str, Optional[bytes], Optional[str]]], cache_version: str) -> str:
+        """Queue (filename, data, error) documents as one job and return its id"""
+        self._reserve(len(documents))
+        job_id = str(uuid.uuid4())
+        files = [{'index': index, 'filename': filename, 'status': 'queued'}
+                 for index, (filename, _, _) in enumerate(documents)]
+        meta = {'job_id': job_id, 'total': len(documents), 'created_at': str(datetime.utcnow())}
+        try:
+            self.store.create(job_id, meta, files)
+        except Exception:
+            with self._lock:
+                self.pending -= len(documents)
+            raise
+        # Small jobs are still spread over every worker
+        batch_size = max(1, min(self.batch_size, -(-len(documents) // self.max_workers)))
+        batch = []
+        finished = []
+        for index, (filename, data, error) in enumerate(documents):
+            if error is None:
+                is_valid, message = FileService.validate_file(filename)
+                error = None if is_valid else message
+            if error is not None:
+                self._finish_file(job_id, index, filename, {'status': 'failed', 'error': error})
+                continue
+            content_hash = ExtractionCache.content_hash(data)
+            cached = self.cache.get(content_hash, cache_version)
+            if cached is not None:
+                record = self._completed(cached['text'], cached['entities'], content_hash, True)
+                finished.append((index, filename, record, cached['text']))
+                continue
+            batch.append((index, filename, content_hash, data))
+            if len(batch) == batch_size:
+                self._submit_batch(job_id, cache_version, batch)
+                batch = []
+        if batch:
+            self._submit_batch(job_id, cache_version, batch)
+        self._save(job_id, [(filename, record, text) for _, filename, record, text in finished])
+        for index, filename, record, _ in finished:
+            self._finish_file(job_id, index, filename, record)
+        return job_id
+    def _submit_batch(self, job_id, cache_version, batch):
+        """Send up to batch_size files to one worker, so their NLP runs through a single nlp.pipe"""
+        documents = [(data, filename.rsplit('.', 1)[1].lower()) for _, filename, _, data in batch]
+        items = [(index, filename, content_hash) for index, filename, content_hash, _ in batch]
+        executor = None
+        try:
+            executor = self._get_executor()
+            if self.backend == "process":
+                future = executor.submit(_ingest_documents, documents)
+            else:
+                future = executor.submit(_ingest_documents, documents, self.nlp_service)
+        except Exception as e:
+            logging.error(f"Error queueing files for ingestion in job {job_id}: {e}")
+            if isinstance(e, BrokenProcessPool) and executor is not None:
+                self._discard_executor(executor)
+            for index, filename, _ in items:
+                self._finish_file(job_id, index, filename, {'status': 'failed', 'error': str(e)})
+            return
+        future.add_done_callback(partial(self._batch_done, job_id, cache_version, items, executor))
+    def _batch_done(self, job_id, cache_version, items, executor, future):
+        try:
+            results = future.result()
+        except Exception as e:
+            logging.error(f"Error ingesting {len(items)} files in job {job_id}: {e}")
+            if isinstance(e, BrokenProcessPool):
+                self._discard_executor(executor)
+            results = [(None, None, str(e) or type(e).__name__)] * len(items)
+        records = []
+        for (index, filename, content_hash), (text, entities, error) in zip(items, results):
+            if error is None:
+                self.cache.set(content_hash, cache_version, {"text": text, "entities": entities})
+                records.append(self._completed(text, entities, content_hash, False))
+            else:
+                logging.error(f"Error ingesting {filename} in job {job_id}: {error}")
+                records.append({'status': 'failed', 'error': error})
+        self._save(job_id, [(filename, record, text)
+                            for (_, filename, _), record, (text, _, _) in zip(items, records, results)])
+        for (index, filename, _), record in zip(items, records):
+            self._finish_file(job_id, index, filename, record)
+    def _save(self, job_id, results):
+        """Store and index the completed files of (filename, record, text) results, one bulk write each per batch"""
+        completed = [(filename, record, text) for filename, record, text in results if record['status'] == 'completed']
+        if not completed:
+            return
+        if self.resume_store is not None:
+            try:
+                self.resume_store.add_many([
+                    resume_document(record['resume_id'], filename, text, record['entities'], record['content_hash'])
+                    for filename, record, text in completed
+                ])
+            except Exception as e:
+                logging.error(f"Could not store {len(completed)} resumes of job {job_id}: {e}")
+        if self.skill_index is not None:
+            try:
+                self.skill_index.add_many([(record['resume_id'], record['entities'].get('SKILL', []))
+                                           for _, record, _ in completed])
+            except Exception as e:
+                logging.error(f"Could not index {len(completed)} resumes of job {job_id}: {e}")
+    def _completed(self, text, entities, content_hash, cached):
+        return {
+            'status': 'completed',
+            'resume_id': str(uuid.uuid4()),
+            'cached': cached,
+            'content_hash': content_hash,
+            'entities': entities,
+            'text_preview': text[:self.preview_length] + "..." if len(text) > self.preview_length else text
+        }
+    def _finish_file(self, job_id, index, filename, record):
+        record.update(index=index, filename=filename)
+        try:
+            self.store.update_file(job_id, index, record)
+        except Exception as e:
+            logging.error(f"Could not record ingestion result for job {job_id}: {e}")
+        finally:
+            self._release()
+    def get_job(self, job_id: str) -> Optional[Dict]:
+        """Job summary with per-file status and results, or None if unknown or expired"""
+        job = self.store.get(job_id)
+        if job is None:
+            return None
+        meta, files = job
+        counts = {'queued': 0, 'completed': 0, 'failed': 0}
+        for record in files:
+            counts[record['status']] += 1
+        if counts['queued']:
+            status = 'processing' if counts['completed'] or counts['failed'] else 'queued'
+        else:
+            status = 'completed' if not counts['failed'] else 'completed_with_errors'
+        return {**meta, 'status': status, **counts, 'files': files}
+    def stats(self) -> Dict:
+        with self._lock:
+            pending = self.pending
+        return {
+            'backend': self.backend,
+            'store': self.store.name,
+            'workers': self.max_workers,
+            'pending': pending,
+            'max_pending': self.max_pending
+        }
+    def shutdown(self):
+        if self._executor is not None and self._executor_pid == os.getpid():
+            self._executor.shutdown(wait=False, cancel_futures=True)
+        self._executor = None
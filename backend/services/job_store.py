@@ -0,0 +1,212 @@
+import json
+import logging
+import os
+import sqlite3
+import threading
+import uuid
+from datetime import datetime
+from typing import Callable, Dict, List, Optional
+from algorithms.job_profile import PARSER_VERSION, JobProfile, description_hash
+from services.cache_service import VersionedLRU
+from services.mongo_service import mongo_collection
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    job_id TEXT PRIMARY KEY,
+    title TEXT,
+    content_hash TEXT NOT NULL,
+    description TEXT NOT NULL,
+    requirements TEXT NOT NULL,
+    profile TEXT,
+    created_at TEXT NOT NULL
+);
+"""
+COLUMNS = ("job_id", "title", "content_hash", "description", "requirements", "profile", "created_at")
+def job_document(job_id: str, title: Optional[str], profile: JobProfile, requirements: Dict,
+                 created_at: Optional[str] = None) -> Dict:
+    """A registered posting as it is stored: its description, the requirements it sets and the description's profile"""
+    return {
+        "job_id": job_id,
+        "title": title,
+        "content_hash": profile.content_hash,
+        "description": profile.description,
+        "requirements": requirements,
+        "profile": profile.to_dict(),
+        "created_at": created_at or str(datetime.utcnow())
+    }
+class SQLiteJobStore:
+    """Registered job postings in a local SQLite file, next to the SQLite resume store"""
+    def __init__(self, path: str):
+        self.path = path
+        if path != ":memory:" and os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._connection_handle = None
+        self._connection_pid = None
+        self._lock = threading.Lock()
+    @property
+    def _connection(self):
+        # SQLite connections must not cross a fork, so each process opens its own
+        if self._connection_handle is None or self._connection_pid != os.getpid():
+            self._connection_handle = sqlite3.connect(self.path, timeout=30, check_same_thread=False)
+            if self.path != ":memory:":
+                self._connection_handle.execute("PRAGMA journal_mode=WAL")
+            self._connection_handle.executescript(SCHEMA)
+            self._connection_pid = os.getpid()
+        return self._connection_handle
+    def add(self, document: Dict) -> None:
+        row = tuple(
+            json.dumps(document[column]) if column in ("requirements", "profile") else document[column]
+            for column in COLUMNS
+        )
+        with self._lock, self._connection:
+            self._connection.execute(
+                f"INSERT OR REPLACE INTO jobs ({', '.join(COLUMNS)}) VALUES ({', '.join('?' * len(COLUMNS))})", row
+            )
+    def get(self, job_id: str, with_profile: bool = True) -> Optional[Dict]:
+        """A registered posting, without its stored profile unless with_profile, or None"""
+        columns = [column for column in COLUMNS if with_profile or column != "profile"]
+        with self._lock:
+            row = self._connection.execute(
+                f"SELECT {', '.join(columns)} FROM jobs WHERE job_id = ?", (job_id,)
+            ).fetchone()
+        if row is None:
+            return None
+        document = dict(zip(columns, row))
+        document["requirements"] = json.loads(document["requirements"])
+        if "profile" in document:
+            document["profile"] = json.loads(document["profile"])
+        return document
+    def list(self, limit: int = 100) -> List[Dict]:
+        """The most recently registered postings, without descriptions or profiles"""
+        with self._lock:
+            rows = self._connection.execute(
+                "SELECT job_id, title, content_hash, created_at FROM jobs ORDER BY created_at DESC LIMIT ?", (limit,)
+            ).fetchall()
+        return [dict(zip(("job_id", "title", "content_hash", "created_at"), row)) for row in rows]
+    def stats(self) -> Dict:
+        with self._lock:
+            count = self._connection.execute("SELECT COUNT(*) FROM jobs").fetchone()[0]
+        return {"backend": self.name, "jobs": count, "path": self.path}
+    @property
+    def name(self) -> str:
+        return "sqlite"
+class MongoJobStore:
+    """Registered job postings in a MongoDB collection shared by every worker and host, on each process's own client"""
+    def __init__(self, uri: str, collection_name: str, max_pool_size: int = 50, timeout_ms: int = 2000):
+        self.uri = uri
+        self.collection_name = collection_name
+        self.max_pool_size = max_pool_size
+        self.timeout_ms = timeout_ms
+        self.collection.create_index("created_at")
+    @property
+    def collection(self):
+        return mongo_collection(self.uri, self.collection_name, self.max_pool_size, self.timeout_ms)
+    def add(self, document: Dict) -> None:
+        self.collection.replace_one({"_id": document["job_id"]}, {"_id": document["job_id"], **document}, upsert=True)
+    def get(self, job_id: str, with_profile: bool = True) -> Optional[Dict]:
+        """A registered posting, without its stored profile unless with_profile, or None"""
+        return self.collection.find_one({"_id": job_id}, {"_id": 0} if with_profile else {"_id": 0, "profile": 0})
+    def list(self, limit: int = 100) -> List[Dict]:
+        """The most recently registered postings, without descriptions or profiles"""
+        projection = {"_id": 0, "job_id": 1, "title": 1, "content_hash": 1, "created_at": 1}
+        return list(self.collection.find({}, projection).sort("created_at", -1).limit(limit))
+    def stats(self) -> Dict:
+        return {"backend": self.name, "jobs": self.collection.estimated_document_count(),
+                "collection": self.collection.full_name}
+    @property
+    def name(self) -> str:
+        return "mongo"
+def create_job_store(config, resume_store):
+    """Build the job store next to the resume store, in its Mongo database or else in a SQLite file"""
+    if resume_store.name == "mongo":
+        return MongoJobStore(resume_store.uri, config["MONGO_JOB_COLLECTION"], resume_store.max_pool_size,
+                             resume_store.timeout_ms)
+    return SQLiteJobStore(config["JOB_STORE_PATH"])
+class JobProfiles:
+    """Parsed job descriptions, cached by content hash, and registered postings, stored by id
+
+    Parsing a description (skill scan, years, education, TF-IDF vector)
+    happens once per distinct text: profiles are kept in a bounded LRU keyed
+    by the description's hash, so scoring the same posting again does no
+    JD-side work. Entries belong to one taxonomy fingerprint and TF-IDF
+    model; the first lookup after either changes clears the cache. A
+    registered posting stores its description, the requirements it sets and
+    its parsed profile, and is reparsed on read when the stored profile was
+    parsed against an older taxonomy or model. Each worker also caches a
+    posting's content hash, title and requirements by id for posting_ttl
+    seconds, so scoring by job_id does not read the store.
+    """
+    def __init__(self, store, skill_trie: Callable, tfidf_model: Callable, max_entries: int = 1024,
+                 posting_ttl: float = 60):
+        self.store = store
+        self.skill_trie = skill_trie
+        self.tfidf_model = tfidf_model
+        self.profiles = VersionedLRU('job_profile', max_entries)
+        self.postings = VersionedLRU('job_posting', max_entries, ttl=posting_ttl)
+    @classmethod
+    def from_config(cls, config, resume_store, skill_trie: Callable, tfidf_model: Callable) -> 'JobProfiles':
+        return cls(create_job_store(config, resume_store), skill_trie, tfidf_model, config["JOB_PROFILE_CACHE_SIZE"],
+                   config["JOB_POSTING_CACHE_TTL"])
+    def current_version(self) -> str:
+        """Version of everything a profile is parsed with"""
+        tfidf_model = self.tfidf_model()
+        return ":".join([PARSER_VERSION, self.skill_trie().fingerprint(),
+                         tfidf_model.version if tfidf_model is not None else "pairwise"])
+    def profile(self, description: str) -> JobProfile:
+        """Parsed profile of a job description, from the cache when this text was parsed before"""
+        version = self.current_version()
+        profile = self.profiles.get(description_hash(description), version)
+        if profile is None:
+            profile = self._parse(description, version)
+        return profile
+    def register(self, description: str, job_id: Optional[str] = None, title: Optional[str] = None,
+                 min_experience: Optional[int] = None, required_education: Optional[List[str]] = None) -> JobProfile:
+        """Parse and store a posting, replacing any posting with the same id"""
+        job_id = job_id or str(uuid.uuid4())
+        requirements = {"min_experience": min_experience, "required_education": required_education}
+        profile = self.profile(description)
+        self.store.add(job_document(job_id, title, profile, requirements))
+        self.postings.put(job_id, (profile.content_hash, title, requirements))
+        return profile.for_posting(job_id, title, **requirements)
+    def get(self, job_id: str) -> Optional[JobProfile]:
+        """Profile of a registered posting with its own requirements applied, or None"""
+        posting = self.postings.get(job_id)
+        if posting is None:
+            document = self.store.get(job_id, with_profile=False)
+            if document is None:
+                return None
+            posting = (document["content_hash"], document["title"], document["requirements"])
+            self.postings.put(job_id, posting)
+        content_hash, title, requirements = posting
+        version = self.current_version()
+        profile = self.profiles.get(content_hash, version)
+        if profile is None:
+            stored = self.store.get(job_id)
+            if stored is None:
+                self.postings.discard(job_id)
+                return None
+            if stored["profile"] and stored["profile"]["version"] == version:
+                profile = JobProfile.from_dict(stored["profile"])
+                self.profiles.put(profile.content_hash, profile, version)
+            else:
+                # Parsed against an older taxonomy or model: parse again and store it for the other workers
+                profile = self._parse(stored["description"], version)
+                self.store.add(job_document(job_id, stored["title"], profile, stored["requirements"],
+                                            stored["created_at"]))
+            title, requirements = stored["title"], stored["requirements"]
+            self.postings.put(job_id, (profile.content_hash, title, requirements))
+        return profile.for_posting(job_id, title, **requirements)
+    def list(self, limit: int = 100) -> List[Dict]:
+        return self.store.list(limit)
+    def _parse(self, description: str, version: str) -> JobProfile:
+        profile = JobProfile.parse(description, self.skill_trie().scanner(), self.tfidf_model(), version)
+        # A taxonomy or model swap while parsing leaves this profile to the old version
+        self.profiles.put(profile.content_hash, profile, version)
+        return profile
+    def stats(self) -> Dict:
+        stats = self.profiles.stats()
+        stats['postings'] = self.postings.stats()
+        try:
+            stats['store'] = self.store.stats()
+        except Exception as e:
+            logging.warning(f"Job store stats unavailable: {e}")
+        return stats
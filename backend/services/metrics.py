@@ -0,0 +1,75 @@
+import os
+import time
+from contextlib import contextmanager
+from flask import g, has_request_context
+from prometheus_client import CollectorRegistry, Counter, Histogram, REGISTRY, CONTENT_TYPE_LATEST, generate_latest
+from prometheus_client import multiprocess
+# Latency buckets from sub-millisecond trie work up to timed-out extractions
+LATENCY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30)
+SIZE_BUCKETS = tuple(1024 * 4 ** power for power in range(9)) # 1KB to 64MB
+REQUEST_SECONDS = Histogram(
+    "resume_ai_request_seconds", "Request latency by endpoint and status",
+    ["endpoint", "method", "status"], buckets=LATENCY_BUCKETS
+)
+STAGE_SECONDS = Histogram(
+    "resume_ai_stage_seconds", "Latency of each pipeline stage", ["stage"], buckets=LATENCY_BUCKETS
+)
+STAGE_ERRORS = Counter(
+    "resume_ai_stage_errors_total", "Exceptions raised by each pipeline stage", ["stage", "error"]
+)
+DOCUMENT_BYTES = Histogram(
+    "resume_ai_document_bytes", "Size of uploaded documents", ["format"], buckets=SIZE_BUCKETS
+)
+DOCUMENT_CHARS = Histogram(
+    "resume_ai_document_chars", "Characters of text extracted from uploaded documents", ["format"], buckets=SIZE_BUCKETS
+)
+CACHE_REQUESTS = Counter(
+    "resume_ai_cache_requests_total", "Cache lookups by cache and result (hit, miss or error)", ["cache", "result"]
+)
+TRIE_LOOKUPS = Counter(
+    "resume_ai_trie_lookups_total", "Skill trie operations: scan (one per text), match and fuzzy", ["kind"]
+)
+REJECTED_REQUESTS = Counter(
+    "resume_ai_rejected_requests_total", "Requests refused by ASGI admission control (queue_full or queue_timeout)",
+    ["reason"]
+)
+def multiprocess_dir():
+    """Directory gunicorn workers share their metric files through, if running multi-process"""
+    return os.environ.get("PROMETHEUS_MULTIPROC_DIR")
+def render_metrics():
+    """Prometheus text exposition of every worker's metrics, and its content type"""
+    if multiprocess_dir():
+        # Each scrape merges the files written by every live and exited worker
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    else:
+        registry = REGISTRY
+    return generate_latest(registry), CONTENT_TYPE_LATEST
+@contextmanager
+def stage(name):
+    """Time a pipeline stage, counting the exceptions it raises by type
+
+    Within a request the timing is also kept for the Server-Timing response header.
+    """
+    start = time.perf_counter()
+    try:
+        yield
+    except Exception as e:
+        STAGE_ERRORS.labels(name, type(e).__name__).inc()
+        raise
+    finally:
+        elapsed = time.perf_counter() - start
+        STAGE_SECONDS.labels(name).observe(elapsed)
+        if has_request_context():
+            g.setdefault("stage_timings", []).append((name, elapsed))
+def server_timing(timings):
+    """Server-Timing header value of (stage, seconds) pairs, in milliseconds"""
+    return ", ".join(f"{name};dur={seconds * 1000:.2f}" for name, seconds in timings)
+def count_cache(cache, result, amount=1):
+    if amount:
+        CACHE_REQUESTS.labels(cache, result).inc(amount)
+def count_trie(kind, amount=1):
+    if amount:
+        TRIE_LOOKUPS.labels(kind).inc(amount)
+def count_rejection(reason):
+    REJECTED_REQUESTS.labels(reason).inc()
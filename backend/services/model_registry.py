@@ -0,0 +1,64 @@
+import logging
+import os
+import threading
+import time
+from typing import Callable, Dict, Iterable, Optional
+class ModelRegistry:
+    """Heavy shared resources, each loaded on first use and only once per process
+
+    Resources are registered as zero-argument factories. The first `get`
+    builds the resource under a per-resource lock and records how long it
+    took. Calling `preload` in the gunicorn master (with --preload) loads
+    everything before the fork, so workers share the pages copy-on-write
+    instead of each building their own copy.
+    """
+    def __init__(self):
+        self._factories: Dict[str, Callable] = {}
+        self._resources: Dict[str, object] = {}
+        self._timings: Dict[str, Dict] = {}
+        self._locks: Dict[str, threading.Lock] = {}
+        self._lock = threading.Lock()
+    def register(self, name: str, factory: Callable) -> None:
+        with self._lock:
+            self._factories[name] = factory
+            self._locks[name] = threading.Lock()
+            self._resources.pop(name, None)
+            self._timings.pop(name, None)
+    def get(self, name: str):
+        """Return the resource, building it on first use"""
+        try:
+            return self._resources[name]
+        except KeyError:
+            pass
+        if name not in self._factories:
+            raise KeyError(f"Unknown resource: {name}")
+        # One lock per resource, so a slow model does not block the others
+        with self._locks[name]:
+            if name not in self._resources:
+                start = time.perf_counter()
+                resource = self._factories[name]()
+                seconds = time.perf_counter() - start
+                self._timings[name] = {'seconds': round(seconds, 4), 'pid': os.getpid()}
+                self._resources[name] = resource
+                logging.info(f"Loaded {name} in {seconds:.3f}s (pid {os.getpid()})")
+        return self._resources[name]
+    def set(self, name: str, resource) -> None:
+        """Replace a resource without going through its factory"""
+        with self._lock:
+            self._resources[name] = resource
+    def is_loaded(self, name: str) -> bool:
+        return name in self._resources
+    def preload(self, names: Optional[Iterable[str]] = None) -> None:
+        """Build resources now, in registration order unless names are given"""
+        for name in names or list(self._factories):
+            self.get(name)
+    @staticmethod
+    def resource(name: str) -> property:
+        """Attribute that reads a resource from the owner's `models` registry"""
+        return property(lambda owner: owner.models.get(name), lambda owner, value: owner.models.set(name, value))
+    def stats(self) -> Dict:
+        """Load state and cold-start time of every resource; `pid` is the process that built it"""
+        return {
+            name: {'loaded': name in self._resources, **self._timings.get(name, {})}
+            for name in self._factories
+        }
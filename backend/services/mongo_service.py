@@ -0,0 +1,42 @@
+import logging
+import os
+import threading
+from pymongo import MongoClient
+_clients = {}
+_lock = threading.Lock()
+def get_mongo_client(uri, max_pool_size=50, timeout_ms=2000):
+    """Return this process's MongoDB client for uri
+
+    A MongoClient pools connections for every thread that uses it but must
+    not cross a fork, so clients are kept per process id: a gunicorn worker
+    forked from a preloading master creates its own on first use and shares
+    it between all of its requests. Objects built before the fork must call
+    this (or mongo_collection) on each use rather than keep a client.
+    """
+    key = (uri, os.getpid())
+    client = _clients.get(key)
+    if client is None:
+        with _lock:
+            client = _clients.get(key)
+            if client is None:
+                client = MongoClient(
+                    uri,
+                    maxPoolSize=max_pool_size,
+                    serverSelectionTimeoutMS=timeout_ms,
+                    connectTimeoutMS=timeout_ms,
+                    connect=False
+                )
+                _clients[key] = client
+    return client
+def mongo_collection(uri, name, max_pool_size=50, timeout_ms=2000):
+    """Collection name in the URI's database (resume_ai by default), on this process's client"""
+    return get_mongo_client(uri, max_pool_size, timeout_ms).get_default_database(default="resume_ai")[name]
+def ping_mongo(uri, max_pool_size=50, timeout_ms=2000):
+    """Return the client for uri if the server answers, otherwise None"""
+    try:
+        client = get_mongo_client(uri, max_pool_size, timeout_ms)
+        client.admin.command("ping")
+        return client
+    except Exception as e:
+        logging.warning(f"MongoDB at {uri} is unavailable: {e}")
+        return None
@@ -1,38 +1,48 @@
 import spacy
-import re
+import threading
 from spacy.tokens import Doc
 from spacy.language import Language
-# Load the English language model
-try:
-    nlp = spacy.load("en_core_web_sm")
-except OSError:
-    print("Please install spaCy English model: python -m spacy download en_core_web_sm")
-    raise
+from algorithms.sections import document_text
+from algorithms.text_patterns import contact_info
+from services.cache_service import SkillResolutionCache
+from services.metrics import count_trie
+# Pipelines loaded by this process, shared by every NLPService using the same model
+_pipelines = {}
+_pipelines_lock = threading.Lock()
+def load_pipeline(model_name="en_core_web_sm"):
+    """Load a spaCy model once per process, on first use rather than at import"""
+    pipeline = _pipelines.get(model_name)
+    if pipeline is None:
+        with _pipelines_lock:
+            pipeline = _pipelines.get(model_name)
+            if pipeline is None:
+                try:
+                    pipeline = spacy.load(model_name)
+                except OSError:
+                    print(f"Please install spaCy English model: python -m spacy download {model_name}")
+                    raise
+                _pipelines[model_name] = pipeline
+    return pipeline
 @Language.component("contact_extractor")
 def contact_extractor(doc):
     """Custom spaCy component to extract contact information"""
-    # Email extraction
-    email_pattern = r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b'
-    emails = re.findall(email_pattern, doc.text)
-    # Phone extraction
-    phone_patterns = [
-        r'\b\d{3}[-.]?\d{3}[-.]?\d{4}\b', # US format
-        r'\b\(\d{3}\)\s?\d{3}[-.]?\d{4}\b', # (123) 456-7890
-        r'\b\+\d{1,3}[-.\s]?\d{3,4}[-.\s]?\d{3,4}[-.\s]?\d{3,4}\b' # International
-    ]
-    phones = []
-    for pattern in phone_patterns:
-        phones.extend(re.findall(pattern, doc.text))
-    # LinkedIn profile extraction
-    linkedin_pattern = r'linkedin\.com/in/[\w-]+'
-    linkedin = re.findall(linkedin_pattern, doc.text.lower())
-    doc._.emails = emails
-    doc._.phones = phones
-    doc._.linkedin = linkedin
+    # Emails, phones and LinkedIn profiles in one scan of the text
+    contacts = contact_info(doc.text)
+    doc._.emails = contacts['EMAIL']
+    doc._.phones = contacts['PHONE']
+    doc._.linkedin = contacts['LINKEDIN']
     return doc
+# Education-related phrases searched for in sentences or section lines
+EDUCATION_KEYWORDS = ("university", "college", "bachelor", "master", "phd", "degree", "diploma", "graduate",
+                      "undergraduate", "alumni", "school")
 class NLPService:
     """Advanced NLP service for resume processing"""
-    def __init__(self, skill_trie):
+    # Pipeline components none of the extractors read (POS tags and lemmas)
+    DISABLED_COMPONENTS = ("tagger", "attribute_ruler", "lemmatizer")
+    # Components the named entity recognizer needs; sectioned extraction runs only these
+    NER_COMPONENTS = ("tok2vec", "ner")
+    def __init__(self, skill_trie, batch_size=64, n_process=1, disabled_components=DISABLED_COMPONENTS,
+                 model_name="en_core_web_sm", skill_cache_size=100000):
         # Set custom extensions
         if not Doc.has_extension("emails"):
             Doc.set_extension("emails", default=[])
@@ -40,75 +50,143 @@ class NLPService:
             Doc.set_extension("phones", default=[])
         if not Doc.has_extension("linkedin"):
             Doc.set_extension("linkedin", default=[])
-        self.nlp = nlp
-        self.nlp.add_pipe("contact_extractor", last=True)
+        self.nlp = load_pipeline(model_name)
+        # The pipeline is shared, so only the first service adds the component
+        with _pipelines_lock:
+            if "contact_extractor" not in self.nlp.pipe_names:
+                self.nlp.add_pipe("contact_extractor", last=True)
+        self.model_name = model_name
         self.skill_trie = skill_trie
+        self.batch_size = batch_size
+        self.n_process = n_process
+        self.disabled_components = [name for name in disabled_components if name in self.nlp.pipe_names]
+        self.ner_disabled_components = [name for name in self.nlp.pipe_names if name not in self.NER_COMPONENTS]
+        # Fuzzy resolutions of tokens seen before, per taxonomy fingerprint
+        self.skill_cache = SkillResolutionCache(skill_cache_size)
+        # Part of the extraction cache key, so upgrading the model invalidates entries
+        self.model_version = f"{self.nlp.meta.get('name', 'spacy')}-{self.nlp.meta.get('version', '0')}"
+    @classmethod
+    def from_config(cls, config, skill_trie):
+        return cls(
+            skill_trie,
+            batch_size=config["NLP_BATCH_SIZE"],
+            n_process=config["NLP_N_PROCESS"],
+            disabled_components=config["NLP_DISABLED_COMPONENTS"],
+            model_name=config["SPACY_MODEL"],
+            skill_cache_size=config["SKILL_RESOLUTION_CACHE_SIZE"]
+        )
+    def __reduce__(self):
+        # Pool workers rebuild the service around their own copy of the spaCy pipeline
+        return (NLPService, (self.skill_trie, self.batch_size, 1, tuple(self.disabled_components), self.model_name,
+                             self.skill_cache.max_entries))
     def extract_entities(self, text):
         """Extract all relevant entities from resume text"""
-        doc = self.nlp(text)
+        return self._entities_from_doc(self.nlp(text, disable=self.disabled_components))
+    def extract_entities_batch(self, texts, batch_size=None, n_process=None):
+        """Extract entities from many resume texts with one streamed nlp.pipe call"""
+        docs = self.nlp.pipe(
+            texts,
+            batch_size=batch_size or self.batch_size,
+            n_process=n_process or self.n_process,
+            disable=self.disabled_components
+        )
+        return [self._entities_from_doc(doc) for doc in docs]
+    def extract_entities_from_sections(self, routed):
+        """Extract entities from a segmented resume, running each extractor only on the sections it needs
+
+        routed is route_sections() output. Contacts come from the contact
+        block, the NER pipeline runs only on the contact and experience
+        sections, typos are fuzzy matched only in skill-bearing sections and
+        education is read from education lines. Returns the same keys as
+        extract_entities.
+        """
+        text = document_text(routed['all'])
+        contacts = contact_info(document_text(routed.get('contact', [])))
+        if not any(contacts.values()):
+            contacts = contact_info(text)
+        names = self.nlp(document_text(routed.get('names', [])), disable=self.ner_disabled_components)
+        persons, orgs, experience = self._extract_from_ents(names)
+        skills = self._extract_skills(self.nlp.make_doc(document_text(routed.get('skills', []))), text)
+        # Certifications are routed to education too; without an education section the whole text is searched
+        education = routed.get('education') if 'education' in routed.get('sections', ()) else None
+        return {
+            'PERSON': persons,
+            'ORG': orgs,
+            'SKILL': skills,
+            'EMAIL': contacts['EMAIL'],
+            'PHONE': contacts['PHONE'],
+            'LINKEDIN': contacts['LINKEDIN'],
+            'EDUCATION': self._education_lines(education or routed['all']),
+            'EXPERIENCE': experience
+        }
+    def _entities_from_doc(self, doc):
+        persons, orgs, experience = self._extract_from_ents(doc)
         entities = {
-            'PERSON': self._extract_persons(doc),
-            'ORG': self._extract_organizations(doc),
+            'PERSON': persons,
+            'ORG': orgs,
             'SKILL': self._extract_skills(doc),
             'EMAIL': doc._.emails,
             'PHONE': doc._.phones,
             'LINKEDIN': doc._.linkedin,
             'EDUCATION': self._extract_education(doc),
-            'EXPERIENCE': self._extract_experience(doc)
+            'EXPERIENCE': experience
         }
         return entities
-    def _extract_persons(self, doc):
-        """Extract person names, typically the candidate's name"""
-        persons = []
-        for ent in doc.ents:
-            if ent.label_ == "PERSON":
-                persons.append(ent.text.strip())
-        return list(set(persons))
-    def _extract_organizations(self, doc):
-        """Extract organization names"""
-        orgs = []
+    def _extract_from_ents(self, doc):
+        """Person names, organization names and work experience context in one pass over doc.ents"""
+        persons = set()
+        orgs = set()
+        experience = []
         for ent in doc.ents:
-            if ent.label_ == "ORG":
-                orgs.append(ent.text.strip())
-        return list(set(orgs))
-    def _extract_skills(self, doc):
-        """Extract skills using the skill trie and NLP"""
+            label = ent.label_
+            if label == "PERSON":
+                persons.add(ent.text.strip())
+            elif label in ("DATE", "ORG"):
+                if label == "ORG":
+                    orgs.add(ent.text.strip())
+                # Date ranges and organizations, with surrounding context
+                start = max(0, ent.start - 10)
+                end = min(len(doc), ent.end + 10)
+                experience.append(doc[start:end].text.strip())
+        return list(persons), list(orgs), experience
+    def _extract_skills(self, doc, text=None):
+        """Extract skills using the skill trie and NLP
+
+        Exact matches are also scanned for in text, when given; typos are only fuzzy matched in doc.
+        """
         skills = set()
-        # Extract using trie for exact matches
-        for token in doc:
-            if not token.is_stop and not token.is_punct and len(token.text) > 2:
-                # Exact match
-                if self.skill_trie.search(token.text):
-                    skills.add(token.text)
-                # Fuzzy match for potential typos
-                else:
-                    fuzzy_matches = self.skill_trie.fuzzy_search(token.text, max_distance=1)
-                    if fuzzy_matches and fuzzy_matches[0][1] <= 1:
-                        skills.add(fuzzy_matches[0][0])
-        # Extract multi-word skills
-        for noun_phrase in doc.noun_chunks:
-            phrase = noun_phrase.text.lower().strip()
-            if self.skill_trie.search(phrase):
-                skills.add(phrase)
+        scanner = self.skill_trie.scanner()
+        # One Aho-Corasick pass finds every single- and multi-word skill
+        covered = bytearray(len(doc.text))
+        for match in scanner.scan(doc.text):
+            skills.add(match.skill)
+            covered[match.start:match.end] = b'\x01' * (match.end - match.start)
+        count_trie('scan')
+        if text is not None:
+            skills.update(scanner.find_skills(text))
+            count_trie('scan')
+        count_trie('match', len(skills))
+        # Fuzzy match the remaining tokens for potential typos; common words resolve from the cache
+        tokens = [
+            token.text for token in doc
+            if not token.is_stop and not token.is_punct and len(token.text) > 2 and not covered[token.idx]
+        ]
+        for resolution in self.skill_cache.resolve_all(self.skill_trie, tokens, max_distance=1):
+            if resolution is not None:
+                skills.add(resolution[0])
         return list(skills)
     def _extract_education(self, doc):
         """Extract education information"""
-        education_keywords = ["university", "college", "bachelor", "master", "phd", "degree", "diploma", "graduate", "undergraduate", "alumni", "school"]
         education = []
         for sent in doc.sents:
-            if any(keyword in sent.text.lower() for keyword in education_keywords):
+            if any(keyword in sent.text.lower() for keyword in EDUCATION_KEYWORDS):
                 education.append(sent.text.strip())
         return education
-    def _extract_experience(self, doc):
-        """Extract work experience information"""
-        experience = []
-        # Look for date ranges and organizations
-        for ent in doc.ents:
-            if ent.label_ in ["DATE", "ORG"]:
-                # Get surrounding context
-                start = max(0, ent.start - 10)
-                end = min(len(doc), ent.end + 10)
-                context = doc[start:end].text
-                experience.append(context.strip())
-        return experience
-
+    def _education_lines(self, lines):
+        """Education lines of a section, the line-level counterpart of _extract_education"""
+        education = []
+        for line in lines:
+            line = document_text([line])
+            if any(keyword in line.lower() for keyword in EDUCATION_KEYWORDS):
+                education.append(line)
+        return education
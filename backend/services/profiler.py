@@ -0,0 +1,56 @@
+import cProfile
+import hmac
+import logging
+import os
+import random
+import time
+import uuid
+from typing import Optional
+class RequestProfiler:
+    """Opt-in cProfile of single requests, dumped as .prof files for pstats or snakeviz
+
+    A request is profiled when profiling is enabled and it either carries the
+    profile header (whose value must match the token, if one is set) or is
+    picked by the sample rate. Profiles cover the view and its serialization
+    and are written to the profile directory, named by time, endpoint and pid.
+    """
+    def __init__(self, directory: str, header: str = 'X-Profile', token: str = '', sample_rate: float = 0.0,
+                 enabled: bool = False):
+        self.directory = directory
+        self.header = header
+        self.token = token
+        self.sample_rate = sample_rate
+        self.enabled = enabled
+    @classmethod
+    def from_config(cls, config) -> 'RequestProfiler':
+        return cls(
+            directory=config['PROFILE_DIR'],
+            header=config['PROFILE_HEADER'],
+            token=config['PROFILE_TOKEN'],
+            sample_rate=config['PROFILE_SAMPLE_RATE'],
+            enabled=config['PROFILE_ENABLED']
+        )
+    def wanted(self, headers) -> bool:
+        """Whether a request with these headers should be profiled"""
+        if not self.enabled:
+            return False
+        value = headers.get(self.header)
+        if value is not None:
+            return not self.token or hmac.compare_digest(value, self.token)
+        return self.sample_rate > 0 and random.random() < self.sample_rate
+    def start(self) -> cProfile.Profile:
+        profile = cProfile.Profile()
+        profile.enable()
+        return profile
+    def stop(self, profile: cProfile.Profile, endpoint: Optional[str]) -> Optional[str]:
+        """Stop a profile and dump it; returns the file name, or None if it could not be written"""
+        profile.disable()
+        endpoint = (endpoint or 'unmatched').replace('.', '_')
+        name = f"{time.strftime('%Y%m%dT%H%M%S')}-{endpoint}-{os.getpid()}-{uuid.uuid4().hex[:8]}.prof"
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            profile.dump_stats(os.path.join(self.directory, name))
+        except OSError as e:
+            logging.warning(f"Could not write request profile: {e}")
+            return None
+        return name
@@ -0,0 +1,28 @@
+import logging
+import threading
+import redis
+_clients = {}
+_lock = threading.Lock()
+def get_redis_client(url):
+    """Return the process-wide Redis client for url
+
+    redis-py pools connections per client and resets the pool after a fork,
+    so one client per URL can be shared by every request of a worker.
+    """
+    client = _clients.get(url)
+    if client is None:
+        with _lock:
+            client = _clients.get(url)
+            if client is None:
+                client = redis.Redis.from_url(url, socket_timeout=2, socket_connect_timeout=2)
+                _clients[url] = client
+    return client
+def ping_redis(url):
+    """Return the client for url if the server answers, otherwise None"""
+    try:
+        client = get_redis_client(url)
+        client.ping()
+        return client
+    except Exception as e:
+        logging.warning(f"Redis at {url} is unavailable: {e}")
+        return None
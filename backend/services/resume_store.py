@@ -0,0 +1,209 @@
+import json
+import logging
+import os
+import sqlite3
+import threading
+from datetime import datetime
+from typing import Dict, Iterable, Iterator, Optional, Sequence
+from services.mongo_service import mongo_collection, ping_mongo
+# Fields the ATS scorer reads; stored resumes are fetched for scoring with only these
+SCORING_FIELDS = ("text", "entities.SKILL", "entities.EDUCATION", "entities.EXPERIENCE")
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS resumes (
+    resume_id TEXT PRIMARY KEY,
+    filename TEXT,
+    content_hash TEXT,
+    text TEXT NOT NULL,
+    entities TEXT NOT NULL,
+    created_at TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS resumes_content_hash ON resumes (content_hash);
+"""
+COLUMNS = ("resume_id", "filename", "content_hash", "text", "entities", "created_at")
+# Bound parameters per SELECT ... IN query, under SQLite's default limit
+SQLITE_MAX_VARIABLES = 500
+def resume_document(resume_id: str, filename: str, text: str, entities: Dict, content_hash: str) -> Dict:
+    """A processed resume as it is stored"""
+    return {
+        "resume_id": resume_id,
+        "filename": filename,
+        "content_hash": content_hash,
+        "text": text,
+        "entities": entities,
+        "created_at": str(datetime.utcnow())
+    }
+def scoring_data(document: Dict) -> Dict:
+    """resume_data for the ATS scorer from a stored resume"""
+    entities = document.get("entities", {})
+    return {
+        "id": document["resume_id"],
+        "text": document.get("text", ""),
+        "skills": entities.get("SKILL", []),
+        "experience": entities.get("EXPERIENCE", []),
+        "education": entities.get("EDUCATION", [])
+    }
+def project(document: Dict, fields: Optional[Sequence[str]]) -> Dict:
+    """document limited to resume_id and dotted field paths, as a MongoDB projection returns it"""
+    if fields is None:
+        return document
+    projected = {"resume_id": document["resume_id"]}
+    for field in fields:
+        source, target = document, projected
+        *parents, leaf = field.split(".")
+        for parent in parents:
+            source = source.get(parent)
+            if not isinstance(source, dict):
+                break
+            target = target.setdefault(parent, {})
+        else:
+            if leaf in source:
+                target[leaf] = source[leaf]
+    return projected
+class SQLiteResumeStore:
+    """Processed resumes in a local SQLite file, for development, tests and single-host deployments
+
+    Entities are stored as JSON next to the text. A path of ":memory:" keeps
+    everything in this process, which tests can use in place of MongoDB.
+    """
+    def __init__(self, path: str):
+        self.path = path
+        if path != ":memory:" and os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._connection_handle = None
+        self._connection_pid = None
+        self._lock = threading.Lock()
+    @property
+    def _connection(self):
+        # SQLite connections must not cross a fork, so each process opens its own
+        if self._connection_handle is None or self._connection_pid != os.getpid():
+            self._connection_handle = sqlite3.connect(self.path, timeout=30, check_same_thread=False)
+            if self.path != ":memory:":
+                self._connection_handle.execute("PRAGMA journal_mode=WAL")
+            self._connection_handle.executescript(SCHEMA)
+            self._connection_pid = os.getpid()
+        return self._connection_handle
+    def add(self, document: Dict) -> None:
+        self.add_many([document])
+    def add_many(self, documents: Iterable[Dict]) -> int:
+        """Store many resumes in one transaction and return how many were written"""
+        rows = [
+            (document["resume_id"], document.get("filename"), document.get("content_hash"), document["text"],
+             json.dumps(document["entities"]), document["created_at"])
+            for document in documents
+        ]
+        with self._lock, self._connection:
+            self._connection.executemany(
+                f"INSERT OR REPLACE INTO resumes ({', '.join(COLUMNS)}) VALUES ({', '.join('?' * len(COLUMNS))})", rows
+            )
+        return len(rows)
+    def get(self, resume_id: str, fields: Optional[Sequence[str]] = None) -> Optional[Dict]:
+        """A stored resume, limited to fields if given, or None"""
+        return self.get_many([resume_id], fields).get(resume_id)
+    def get_many(self, resume_ids: Sequence[str], fields: Optional[Sequence[str]] = None) -> Dict[str, Dict]:
+        """Stored resumes by id, limited to fields if given; unknown ids are left out"""
+        columns = self._columns(fields)
+        resume_ids = list(dict.fromkeys(resume_ids))
+        documents = {}
+        with self._lock:
+            for start in range(0, len(resume_ids), SQLITE_MAX_VARIABLES):
+                chunk = resume_ids[start:start + SQLITE_MAX_VARIABLES]
+                rows = self._connection.execute(
+                    f"SELECT {', '.join(columns)} FROM resumes WHERE resume_id IN ({', '.join('?' * len(chunk))})", chunk
+                ).fetchall()
+                for row in rows:
+                    documents[row[0]] = self._document(columns, row, fields)
+        return documents
+    def iter_resumes(self, fields: Optional[Sequence[str]] = None, batch_size: int = 1000) -> Iterator[Dict]:
+        """Every stored resume, limited to fields if given, read batch_size rows at a time in resume id order"""
+        columns = self._columns(fields)
+        after = ""
+        while True:
+            with self._lock:
+                rows = self._connection.execute(
+                    f"SELECT {', '.join(columns)} FROM resumes WHERE resume_id > ? ORDER BY resume_id LIMIT ?",
+                    (after, batch_size)
+                ).fetchall()
+            for row in rows:
+                yield self._document(columns, row, fields)
+            if len(rows) < batch_size:
+                return
+            after = rows[-1][0]
+    @staticmethod
+    def _columns(fields):
+        """resume_id and the columns the fields live in, so nothing else is read"""
+        wanted = {field.split(".")[0] for field in fields} if fields is not None else set(COLUMNS)
+        return [column for column in COLUMNS if column == "resume_id" or column in wanted]
+    @staticmethod
+    def _document(columns, row, fields):
+        document = dict(zip(columns, row))
+        if "entities" in document:
+            document["entities"] = json.loads(document["entities"])
+        return project(document, fields)
+    def stats(self) -> Dict:
+        with self._lock:
+            count = self._connection.execute("SELECT COUNT(*) FROM resumes").fetchone()[0]
+        return {"backend": self.name, "resumes": count, "path": self.path}
+    @property
+    def name(self) -> str:
+        return "sqlite"
+class MongoResumeStore:
+    """Processed resumes in a MongoDB collection shared by every worker and host
+
+    Each resume is one document keyed by its resume id. Writes from
+    ingestion go out as unordered bulk inserts, and reads for scoring
+    project only the fields the scorer needs, so the rest of the entities
+    never leave the server. The store keeps the connection settings, not a
+    client, so a store built in a preloading master is safe in its workers.
+    """
+    def __init__(self, uri: str, collection_name: str, max_pool_size: int = 50, timeout_ms: int = 2000):
+        self.uri = uri
+        self.collection_name = collection_name
+        self.max_pool_size = max_pool_size
+        self.timeout_ms = timeout_ms
+        self.collection.create_index("content_hash")
+    @property
+    def collection(self):
+        # Resolved on this process's client, so a forked worker never uses its parent's
+        return mongo_collection(self.uri, self.collection_name, self.max_pool_size, self.timeout_ms)
+    def add(self, document: Dict) -> None:
+        self.add_many([document])
+    def add_many(self, documents: Iterable[Dict]) -> int:
+        """Store many resumes in one unordered bulk insert and return how many were written"""
+        documents = [{"_id": document["resume_id"], **document} for document in documents]
+        if not documents:
+            return 0
+        return len(self.collection.insert_many(documents, ordered=False).inserted_ids)
+    def get(self, resume_id: str, fields: Optional[Sequence[str]] = None) -> Optional[Dict]:
+        """A stored resume, limited to fields if given, or None"""
+        return self.collection.find_one({"_id": resume_id}, self._projection(fields))
+    def get_many(self, resume_ids: Sequence[str], fields: Optional[Sequence[str]] = None) -> Dict[str, Dict]:
+        """Stored resumes by id, limited to fields if given; unknown ids are left out"""
+        cursor = self.collection.find({"_id": {"$in": list(dict.fromkeys(resume_ids))}}, self._projection(fields))
+        return {document["resume_id"]: document for document in cursor}
+    def iter_resumes(self, fields: Optional[Sequence[str]] = None, batch_size: int = 1000) -> Iterator[Dict]:
+        """Every stored resume, limited to fields if given, fetched batch_size documents per round trip"""
+        yield from self.collection.find({}, self._projection(fields), batch_size=batch_size)
+    @staticmethod
+    def _projection(fields):
+        if fields is None:
+            return {"_id": 0}
+        return {"_id": 0, "resume_id": 1, **{field: 1 for field in fields}}
+    def stats(self) -> Dict:
+        return {"backend": self.name, "resumes": self.collection.estimated_document_count(),
+                "collection": self.collection.full_name}
+    @property
+    def name(self) -> str:
+        return "mongo"
+def create_resume_store(config):
+    """Build the resume store selected by RESUME_STORE
+
+    "auto" uses MongoDB when it answers and falls back to the SQLite file.
+    """
+    backend = config["RESUME_STORE"]
+    if backend in ("mongo", "auto"):
+        if ping_mongo(config["MONGO_URI"], config["MONGO_MAX_POOL_SIZE"], config["MONGO_TIMEOUT_MS"]) is not None:
+            return MongoResumeStore(config["MONGO_URI"], config["MONGO_RESUME_COLLECTION"],
+                                    config["MONGO_MAX_POOL_SIZE"], config["MONGO_TIMEOUT_MS"])
+        if backend == "mongo":
+            logging.warning("Falling back to the SQLite resume store")
+    return SQLiteResumeStore(config["RESUME_STORE_PATH"])
@@ -0,0 +1,33 @@
+from algorithms.sections import document_text
+from algorithms.text_patterns import contact_info
+from services.metrics import count_trie
+class SimpleNLPService:
+    """Regex and skill-trie entity extraction for running without spaCy"""
+    def __init__(self, skill_trie):
+        self.skill_trie = skill_trie
+        self.model_version = "simple-1"
+    def extract_entities(self, text, contacts=None):
+        # Simple entity extraction without spaCy
+        contacts = contacts or contact_info(text)
+        entities = {
+            'PERSON': [],
+            'ORG': [],
+            'SKILL': [],
+            'EMAIL': contacts['EMAIL'],
+            'PHONE': contacts['PHONE'],
+            'LINKEDIN': contacts['LINKEDIN'],
+            'EDUCATION': [],
+            'EXPERIENCE': []
+        }
+        # Single Aho-Corasick pass over the whole text
+        entities['SKILL'] = self.skill_trie.scanner().find_skills(text)
+        count_trie('scan')
+        count_trie('match', len(entities['SKILL']))
+        return entities
+    def extract_entities_from_sections(self, routed):
+        """Extract entities from a segmented resume, reading contacts from the contact block when it has any"""
+        contacts = contact_info(document_text(routed.get('contact', [])))
+        return self.extract_entities(document_text(routed['all']), contacts if any(contacts.values()) else None)
+    def extract_entities_batch(self, texts):
+        """Extract entities from many resume texts"""
+        return [self.extract_entities(text) for text in texts]
@@ -0,0 +1,337 @@
+import argparse
+import json
+import logging
+import math
+import os
+import re
+import sqlite3
+import threading
+import zlib
+import numpy as np
+from datetime import datetime
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+# Postings keys for categories are kept apart from skill names
+CATEGORY_PREFIX = 'category:'
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS documents (
+    doc_id INTEGER PRIMARY KEY AUTOINCREMENT,
+    resume_id TEXT NOT NULL,
+    skills TEXT NOT NULL,
+    deleted INTEGER NOT NULL DEFAULT 0,
+    created_at TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS documents_resume_id ON documents (resume_id);
+CREATE INDEX IF NOT EXISTS documents_deleted ON documents (doc_id) WHERE deleted = 1;
+CREATE TABLE IF NOT EXISTS counters (
+    name TEXT PRIMARY KEY,
+    value INTEGER NOT NULL
+);
+INSERT OR IGNORE INTO counters (name, value) VALUES ('documents', 0);
+CREATE TABLE IF NOT EXISTS postings (
+    term TEXT PRIMARY KEY,
+    doc_count INTEGER NOT NULL,
+    last_doc INTEGER NOT NULL,
+    data BLOB NOT NULL
+);
+CREATE TABLE IF NOT EXISTS postings_delta (
+    term TEXT NOT NULL,
+    doc_id INTEGER NOT NULL,
+    PRIMARY KEY (term, doc_id)
+) WITHOUT ROWID;
+INSERT OR IGNORE INTO counters (name, value) VALUES ('delta', 0);
+"""
+def normalize_skill(skill: str) -> str:
+    """Lowercase and collapse whitespace, the form skills take in the trie"""
+    return re.sub(r'\s+', ' ', skill.strip().lower())
+def encode_postings(doc_ids: np.ndarray) -> bytes:
+    """Sorted doc ids as zlib-compressed uint32 gaps"""
+    return zlib.compress(np.diff(doc_ids, prepend=0).astype('<u4').tobytes())
+def decode_postings(data: bytes) -> np.ndarray:
+    return np.cumsum(np.frombuffer(zlib.decompress(data), dtype='<u4'), dtype=np.int64)
+class SkillIndex:
+    """Inverted index from normalized skill and skill category to resumes, in SQLite
+
+    Every indexed resume gets a dense integer doc id. Each skill, and each
+    category "category:<name>" taken from the trie metadata, maps to the
+    sorted ids of the resumes mentioning it. Postings are stored
+    delta-encoded and zlib-compressed and decoded with NumPy, so a query over
+    a few dozen JD skills touches a few compressed blobs and runs in
+    milliseconds. New resumes are appended to a delta table, one row per
+    term, so an add costs the same however large the index is; reads merge
+    the delta into the compressed lists, and once it holds `delta_limit`
+    rows it is folded into them. Removing a resume only marks it deleted;
+    `compact` folds the delta and rewrites the postings without it.
+    """
+    def __init__(self, path: str, category_of: Optional[Callable[[str], Optional[str]]] = None,
+                 category_weight: float = 0.25, delta_limit: int = 50000):
+        self.path = path
+        self.category_of = category_of or (lambda skill: None)
+        self.category_weight = category_weight
+        self.delta_limit = delta_limit
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._connection_handle = None
+        self._connection_pid = None
+        self._lock = threading.Lock()
+        self._connection.executescript(SCHEMA)
+    @property
+    def _connection(self):
+        # SQLite connections must not cross a fork, so each process opens its own
+        if self._connection_handle is None or self._connection_pid != os.getpid():
+            self._connection_handle = sqlite3.connect(self.path, timeout=30, check_same_thread=False)
+            self._connection_handle.execute("PRAGMA journal_mode=WAL")
+            self._connection_pid = os.getpid()
+        return self._connection_handle
+    @classmethod
+    def from_config(cls, config, skill_trie_getter):
+        def category_of(skill):
+            metadata = skill_trie_getter().get_metadata(skill)
+            return metadata.get('category') if isinstance(metadata, dict) else None
+        return cls(config["SKILL_INDEX_PATH"], category_of=category_of, category_weight=config["SKILL_INDEX_CATEGORY_WEIGHT"],
+                   delta_limit=config["SKILL_INDEX_DELTA_LIMIT"])
+    def _terms(self, skills: Iterable[str]) -> List[str]:
+        terms = []
+        for skill in dict.fromkeys(normalize_skill(skill) for skill in skills if skill and skill.strip()):
+            terms.append(skill)
+            category = self.category_of(skill)
+            if category:
+                terms.append(CATEGORY_PREFIX + category.lower())
+        return list(dict.fromkeys(terms))
+    def add(self, resume_id: str, skills: Iterable[str]) -> int:
+        """Index one resume's skills and return its doc id"""
+        return self.add_many([(resume_id, skills)])[0]
+    def add_many(self, resumes: Iterable[Tuple[str, Iterable[str]]]) -> List[int]:
+        """Index many resumes in one transaction, appending their terms to the delta table"""
+        created_at = str(datetime.utcnow())
+        additions = []
+        doc_ids = []
+        with self._lock, self._connection:
+            cursor = self._connection.cursor()
+            for resume_id, skills in resumes:
+                skills = [normalize_skill(skill) for skill in skills if skill and skill.strip()]
+                cursor.execute(
+                    "INSERT INTO documents (resume_id, skills, created_at) VALUES (?, ?, ?)",
+                    (resume_id, json.dumps(list(dict.fromkeys(skills))), created_at)
+                )
+                doc_ids.append(cursor.lastrowid)
+                additions.extend((term, cursor.lastrowid) for term in self._terms(skills))
+            cursor.executemany("INSERT INTO postings_delta (term, doc_id) VALUES (?, ?)", additions)
+            cursor.execute("UPDATE counters SET value = value + ? WHERE name = 'documents'", (len(doc_ids),))
+            cursor.execute("UPDATE counters SET value = value + ? WHERE name = 'delta'", (len(additions),))
+            delta = cursor.execute("SELECT value FROM counters WHERE name = 'delta'").fetchone()[0]
+            # Folding rewrites every touched list, so it runs once per delta_limit rows rather than per add
+            if delta >= self.delta_limit:
+                self._merge_delta(cursor)
+        return doc_ids
+    def _merge_delta(self, cursor) -> None:
+        """Fold the delta table into the compressed posting lists, inside the caller's transaction"""
+        additions: Dict[str, List[int]] = {}
+        for term, doc_id in cursor.execute("SELECT term, doc_id FROM postings_delta ORDER BY term, doc_id"):
+            additions.setdefault(term, []).append(doc_id)
+        for term, new_ids in additions.items():
+            row = cursor.execute("SELECT data FROM postings WHERE term = ?", (term,)).fetchone()
+            merged = self._merged(decode_postings(row[0]) if row else None, new_ids)
+            cursor.execute(
+                "INSERT OR REPLACE INTO postings (term, doc_count, last_doc, data) VALUES (?, ?, ?, ?)",
+                (term, len(merged), int(merged[-1]), encode_postings(merged))
+            )
+        cursor.execute("DELETE FROM postings_delta")
+        cursor.execute("UPDATE counters SET value = 0 WHERE name = 'delta'")
+    @staticmethod
+    def _merged(doc_ids: Optional[np.ndarray], new_ids: List[int]) -> np.ndarray:
+        """Sorted union of a posting list and delta ids"""
+        new_ids = np.asarray(new_ids, dtype=np.int64)
+        if doc_ids is None or not len(doc_ids):
+            return new_ids
+        # Doc ids only grow, so delta ids almost always extend the list
+        if not len(new_ids) or new_ids[0] > doc_ids[-1]:
+            return np.concatenate([doc_ids, new_ids])
+        return np.union1d(doc_ids, new_ids)
+    def remove(self, resume_id: str) -> int:
+        """Mark every document of resume_id deleted and return how many were"""
+        with self._lock, self._connection:
+            removed = self._connection.execute(
+                "UPDATE documents SET deleted = 1 WHERE resume_id = ? AND deleted = 0", (resume_id,)
+            ).rowcount
+            self._connection.execute("UPDATE counters SET value = value - ? WHERE name = 'documents'", (removed,))
+            return removed
+    def postings(self, term: str) -> np.ndarray:
+        """Sorted doc ids posted under a skill or "category:<name>" term"""
+        return self._postings([term]).get(term, np.empty(0, dtype=np.int64))
+    def _postings(self, terms: List[str]) -> Dict[str, np.ndarray]:
+        """Posting lists of terms that have any, with their delta rows merged in"""
+        placeholders = ','.join('?' * len(terms))
+        with self._lock:
+            rows = self._connection.execute(
+                f"SELECT term, data FROM postings WHERE term IN ({placeholders})", terms
+            ).fetchall()
+            delta_rows = self._connection.execute(
+                f"SELECT term, doc_id FROM postings_delta WHERE term IN ({placeholders}) ORDER BY term, doc_id", terms
+            ).fetchall()
+        postings = {term: decode_postings(data) for term, data in rows}
+        additions: Dict[str, List[int]] = {}
+        for term, doc_id in delta_rows:
+            additions.setdefault(term, []).append(doc_id)
+        for term, new_ids in additions.items():
+            postings[term] = self._merged(postings.get(term), new_ids)
+        return postings
+    def search(self, skills: Iterable[str], required: Iterable[str] = (), weights: Optional[Dict[str, float]] = None,
+               top_k: int = 50) -> List[Dict]:
+        """Top-k resumes for a set of JD skills
+
+        Candidates must have every `required` skill (boolean AND) and at least
+        one of `skills` or `required` (OR). Each matched skill adds its weight,
+        by default its IDF ln(1 + N / df), and each JD skill category a
+        candidate covers adds category_weight times the category's IDF, so
+        related experience ranks above none.
+        """
+        weights = {normalize_skill(skill): weight for skill, weight in (weights or {}).items()}
+        required = list(dict.fromkeys(normalize_skill(skill) for skill in required if skill and skill.strip()))
+        skills = list(dict.fromkeys([*required, *(normalize_skill(skill) for skill in skills if skill and skill.strip())]))
+        if not skills or top_k <= 0:
+            return []
+        categories = list(dict.fromkeys(
+            CATEGORY_PREFIX + category.lower() for category in map(self.category_of, skills) if category
+        ))
+        with self._lock:
+            # A kept counter, so no query scans the documents table
+            total = self._connection.execute("SELECT value FROM counters WHERE name = 'documents'").fetchone()[0]
+            deleted = [doc_id for (doc_id,) in self._connection.execute("SELECT doc_id FROM documents WHERE deleted = 1")]
+        if not total:
+            return []
+        # Posting lengths are the document frequencies; deleted documents count until compact
+        postings = self._postings(skills + categories)
+        empty = np.empty(0, dtype=np.int64)
+        # Scores are kept only for the sorted eligible doc ids: those posted under
+        # every required skill, or else under any skill, that are not deleted
+        if required:
+            candidates = postings.get(required[0], empty)
+            for skill in required[1:]:
+                candidates = np.intersect1d(candidates, postings.get(skill, empty), assume_unique=True)
+        else:
+            candidates = np.unique(np.concatenate([postings.get(skill, empty) for skill in skills]))
+        if deleted:
+            candidates = np.setdiff1d(candidates, np.asarray(deleted, dtype=np.int64), assume_unique=True)
+        if not len(candidates):
+            return []
+        scores = np.zeros(len(candidates))
+        for skill in skills:
+            ids = postings.get(skill, empty)
+            idf = math.log(1 + total / len(ids)) if len(ids) else 0.0
+            scores[self._positions(candidates, ids)] += weights.get(skill, idf)
+        for category in categories:
+            ids = postings.get(category, empty)
+            if len(ids):
+                scores[self._positions(candidates, ids)] += self.category_weight * math.log(1 + total / len(ids))
+        order = np.arange(len(candidates))
+        if len(candidates) > top_k:
+            order = np.argpartition(-scores, top_k - 1)[:top_k]
+        # Highest score first, older documents first among ties
+        order = order[np.lexsort((candidates[order], -scores[order]))]
+        scores = scores[order]
+        candidates = candidates[order]
+        with self._lock:
+            placeholders = ','.join('?' * len(candidates))
+            resume_ids = dict(self._connection.execute(
+                f"SELECT doc_id, resume_id FROM documents WHERE doc_id IN ({placeholders})", candidates.tolist()
+            ).fetchall())
+        results = []
+        for doc_id, score in zip(candidates.tolist(), scores.tolist()):
+            matched = [skill for skill in skills if skill in postings and self._contains(postings[skill], doc_id)]
+            results.append({
+                'resume_id': resume_ids[doc_id],
+                'score': round(score, 4),
+                'matched_skills': matched
+            })
+        return results
+    @staticmethod
+    def _positions(doc_ids: np.ndarray, ids: np.ndarray) -> np.ndarray:
+        """Indexes into sorted doc_ids of the sorted ids it contains, searching the shorter array in the longer"""
+        if len(ids) > len(doc_ids):
+            positions = np.searchsorted(ids, doc_ids)
+            found = positions < len(ids)
+            found[found] = ids[positions[found]] == doc_ids[found]
+            return np.flatnonzero(found)
+        positions = np.searchsorted(doc_ids, ids)
+        found = positions < len(doc_ids)
+        found[found] = doc_ids[positions[found]] == ids[found]
+        return positions[found]
+    @staticmethod
+    def _contains(doc_ids: np.ndarray, doc_id: int) -> bool:
+        position = np.searchsorted(doc_ids, doc_id)
+        return position < len(doc_ids) and doc_ids[position] == doc_id
+    def compact(self) -> None:
+        """Fold the delta table into the posting lists and drop deleted documents from them"""
+        with self._lock, self._connection:
+            self._connection.execute("BEGIN IMMEDIATE")
+            self._merge_delta(self._connection.cursor())
+            deleted = np.asarray(
+                [doc_id for (doc_id,) in self._connection.execute("SELECT doc_id FROM documents WHERE deleted = 1")],
+                dtype=np.int64
+            )
+            if not len(deleted):
+                return
+            for term, data in self._connection.execute("SELECT term, data FROM postings").fetchall():
+                doc_ids = decode_postings(data)
+                kept = doc_ids[~np.isin(doc_ids, deleted)]
+                if not len(kept):
+                    self._connection.execute("DELETE FROM postings WHERE term = ?", (term,))
+                elif len(kept) != len(doc_ids):
+                    self._connection.execute(
+                        "UPDATE postings SET doc_count = ?, last_doc = ?, data = ? WHERE term = ?",
+                        (len(kept), int(kept[-1]), encode_postings(kept), term)
+                    )
+            self._connection.execute("DELETE FROM documents WHERE deleted = 1")
+    def stats(self) -> Dict:
+        with self._lock:
+            documents, deleted = self._connection.execute(
+                "SELECT (SELECT value FROM counters WHERE name = 'documents'), (SELECT COUNT(*) FROM documents WHERE deleted = 1)"
+            ).fetchone()
+            terms, posting_bytes, delta = self._connection.execute(
+                "SELECT COUNT(*), COALESCE(SUM(LENGTH(data)), 0), (SELECT value FROM counters WHERE name = 'delta') FROM postings"
+            ).fetchone()
+        return {
+            'documents': documents,
+            'deleted': deleted,
+            'terms': terms,
+            'posting_bytes': posting_bytes,
+            'delta_rows': delta,
+            'path': self.path
+        }
+    def close(self) -> None:
+        if self._connection_handle is not None and self._connection_pid == os.getpid():
+            self._connection_handle.close()
+        self._connection_handle = None
+def main():
+    parser = argparse.ArgumentParser(description="Index resume skills from JSONL records into a SQLite skill index")
+    parser.add_argument('records', nargs='+', help='JSONL files of {"id", "skills"} or {"id", "text"} records')
+    parser.add_argument('--db', default=os.getenv('SKILL_INDEX_PATH', 'index/skill_index.db'))
+    parser.add_argument('--skills', default=os.getenv('SKILLS_FILE', 'data/skills.json'),
+                        help="Skills JSON used for categories and for records without a skills list")
+    parser.add_argument('--batch-size', type=int, default=1000)
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(name)s %(message)s")
+    from data_structures.skill_trie import SkillTrie
+    skill_trie = SkillTrie()
+    skill_trie.load_skills_from_file(args.skills)
+    index = SkillIndex(args.db, category_of=lambda skill: (skill_trie.get_metadata(skill) or {}).get('category'))
+    batch = []
+    indexed = 0
+    for path in args.records:
+        with open(path, 'r', encoding='utf-8') as f:
+            for line_number, line in enumerate(f, 1):
+                if not line.strip():
+                    continue
+                record = json.loads(line)
+                skills = record.get('skills')
+                if skills is None:
+                    skills = skill_trie.scanner().find_skills(record.get('text', ''))
+                batch.append((str(record.get('id', f"{path}:{line_number}")), skills))
+                if len(batch) >= args.batch_size:
+                    indexed += len(index.add_many(batch))
+                    batch = []
+    if batch:
+        indexed += len(index.add_many(batch))
+    logging.info(f"Indexed {indexed} resumes into {args.db}")
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,365 @@
+import fcntl
+import json
+import logging
+import os
+import threading
+import time
+from datetime import datetime
+from typing import Callable, Dict, List, Optional, Tuple
+from data_structures.skill_trie import SkillTrie
+from services.redis_service import ping_redis
+# Used only when the base taxonomy cannot be loaded when a worker starts
+DEFAULT_SKILLS = ("python", "javascript", "react", "flask", "sql", "machine learning")
+MAX_SKILL_LENGTH = 100
+class InvalidChange(ValueError):
+    """Raised for a taxonomy change that is malformed or names an unknown skill"""
+class ConcurrentChange(Exception):
+    """Raised when other workers keep logging deltas while a change is being validated"""
+# Times a change is validated again after another worker logged a delta first
+SUBMIT_ATTEMPTS = 5
+def normalize_changes(changes: List[Dict], skill_trie) -> List[Dict]:
+    """Validate API changes against the current taxonomy and resolve aliases and categories
+
+    Accepts {"op": "add", "skill", "category"}, {"op": "remove", "skill"} and
+    {"op": "alias", "skill", "alias_of"}. The result is what gets logged, so
+    every worker replays exactly the same delta.
+    """
+    if not isinstance(changes, list) or not changes:
+        raise InvalidChange("changes must be a non-empty list")
+    # Skills added or removed earlier in this delta, by name
+    pending = {}
+    def lookup(skill):
+        """Metadata of a live skill ({} when it has none), or None if it does not exist"""
+        if skill in pending:
+            return pending[skill]
+        return (skill_trie.get_metadata(skill) or {}) if skill_trie.search(skill) else None
+    def name_of(change, field='skill'):
+        skill = change.get(field)
+        if not isinstance(skill, str) or not skill.strip():
+            raise InvalidChange(f"{field} must be a non-empty string")
+        skill = ' '.join(skill.lower().split())
+        if len(skill) > MAX_SKILL_LENGTH:
+            raise InvalidChange(f"{field} is longer than {MAX_SKILL_LENGTH} characters")
+        return skill
+    normalized = []
+    for change in changes:
+        if not isinstance(change, dict):
+            raise InvalidChange("Each change must be an object")
+        operation = change.get('op')
+        skill = name_of(change)
+        if operation == 'add':
+            category = str(change.get('category') or 'general')
+            pending[skill] = {'category': category}
+            normalized.append({'op': 'add', 'skill': skill, 'category': category})
+        elif operation == 'remove':
+            if lookup(skill) is None:
+                raise InvalidChange(f"Unknown skill: {skill}")
+            pending[skill] = None
+            normalized.append({'op': 'remove', 'skill': skill})
+        elif operation == 'alias':
+            target = name_of(change, 'alias_of')
+            metadata = lookup(target)
+            if metadata is None:
+                raise InvalidChange(f"Unknown skill: {target}")
+            # Aliases of aliases point straight at the canonical skill
+            if isinstance(metadata, dict) and metadata.get('alias_of'):
+                target = metadata['alias_of']
+            if target == skill:
+                raise InvalidChange(f"{skill} cannot be an alias of itself")
+            category = metadata.get('category', 'general') if isinstance(metadata, dict) else 'general'
+            pending[skill] = {'category': category, 'alias_of': target}
+            normalized.append({'op': 'alias', 'skill': skill, 'alias_of': target, 'category': category})
+        else:
+            raise InvalidChange(f"Unknown operation: {operation}")
+    return normalized
+def trie_changes(deltas: List[Dict]) -> List[Tuple[str, str, Optional[Dict]]]:
+    """SkillTrie.with_changes operations for a run of logged deltas"""
+    operations = []
+    for delta in deltas:
+        for change in delta['changes']:
+            if change['op'] == 'remove':
+                operations.append(('remove', change['skill'], None))
+            elif change['op'] == 'alias':
+                operations.append(('add', change['skill'], {'category': change['category'], 'alias_of': change['alias_of']}))
+            else:
+                operations.append(('add', change['skill'], {'category': change['category']}))
+    return operations
+class FileTaxonomyLog:
+    """Versioned taxonomy deltas as a JSON-lines file shared by every worker on the host
+
+    Delta n is line n. Writers append under an exclusive flock so versions
+    are never reused; readers keep a cursor and only read what was appended
+    since, and `wait` polls, so a worker notices a new delta within one poll
+    interval.
+    """
+    def __init__(self, path: str):
+        self.path = path
+        self._cursor = (0, 0) # (version, byte offset) of the end of what was read
+        self._lock = threading.Lock()
+    @property
+    def name(self) -> str:
+        return "file"
+    def append(self, changes: List[Dict], expected_version: Optional[int] = None) -> Optional[Dict]:
+        """Log a delta as the next version; None if expected_version is given and the log is past it"""
+        os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+        with open(self.path, 'a+', encoding='utf-8') as f:
+            fcntl.flock(f, fcntl.LOCK_EX)
+            try:
+                f.seek(0)
+                version = sum(1 for line in f if line.endswith('\n'))
+                if expected_version is not None and version != expected_version:
+                    return None
+                delta = {'version': version + 1, 'changes': changes, 'created_at': datetime.now().isoformat()}
+                f.write(json.dumps(delta) + '\n')
+                f.flush()
+                os.fsync(f.fileno())
+            finally:
+                fcntl.flock(f, fcntl.LOCK_UN)
+        return delta
+    def read(self, since: int = 0) -> List[Dict]:
+        """Deltas with a version above since, in order"""
+        if not os.path.exists(self.path):
+            return []
+        with self._lock:
+            version, offset = self._cursor if self._cursor[0] <= since else (0, 0)
+            deltas = []
+            with open(self.path, 'rb') as f:
+                f.seek(offset)
+                for line in iter(f.readline, b''):
+                    # A line without its newline is still being written
+                    if not line.endswith(b'\n'):
+                        break
+                    offset += len(line)
+                    version += 1
+                    if version > since:
+                        deltas.append(json.loads(line))
+            self._cursor = (version, offset)
+        return deltas
+    def version(self) -> int:
+        self.read(self._cursor[0])
+        return self._cursor[0]
+    def wait(self, timeout: float) -> None:
+        time.sleep(timeout)
+# RPUSH only while the list still has ARGV[1] deltas; -1 otherwise
+APPEND_IF_VERSION = """
+if redis.call('LLEN', KEYS[1]) ~= tonumber(ARGV[1]) then
+    return -1
+end
+return redis.call('RPUSH', KEYS[1], ARGV[2])
+"""
+class RedisTaxonomyLog:
+    """Versioned taxonomy deltas in a Redis list, announced on a pub/sub channel
+
+    RPUSH returns the new list length, which is the delta's version, so
+    concurrent writers never collide. `wait` returns as soon as another
+    worker announces a delta, or after the timeout so a missed message only
+    delays a worker until its next poll.
+    """
+    def __init__(self, client, key: str = 'resume-ai:taxonomy'):
+        self.client = client
+        self.deltas_key = f"{key}:deltas"
+        self.channel = f"{key}:events"
+        self._pubsub = None
+        self._pubsub_pid = None
+    @property
+    def name(self) -> str:
+        return "redis"
+    def append(self, changes: List[Dict], expected_version: Optional[int] = None) -> Optional[Dict]:
+        """Log a delta as the next version; None if expected_version is given and the log is past it"""
+        record = {'changes': changes, 'created_at': datetime.now().isoformat()}
+        if expected_version is None:
+            version = self.client.rpush(self.deltas_key, json.dumps(record))
+        else:
+            # Length check and push in one server-side step, so no other writer gets in between
+            version = self.client.eval(APPEND_IF_VERSION, 1, self.deltas_key, expected_version, json.dumps(record))
+            if version < 0:
+                return None
+        self.client.publish(self.channel, version)
+        return {'version': version, **record}
+    def read(self, since: int = 0) -> List[Dict]:
+        return [
+            {'version': since + position, **json.loads(raw)}
+            for position, raw in enumerate(self.client.lrange(self.deltas_key, since, -1), 1)
+        ]
+    def version(self) -> int:
+        return self.client.llen(self.deltas_key)
+    def wait(self, timeout: float) -> None:
+        # Subscriptions do not survive a fork, so each worker subscribes for itself
+        if self._pubsub is None or self._pubsub_pid != os.getpid():
+            self._pubsub = self.client.pubsub(ignore_subscribe_messages=True)
+            self._pubsub.subscribe(self.channel)
+            self._pubsub_pid = os.getpid()
+        self._pubsub.get_message(timeout=timeout)
+def create_taxonomy_log(config):
+    """Delta log selected by TAXONOMY_BACKEND
+
+    "auto" uses Redis when it answers, so workers on every host share one
+    taxonomy, and falls back to the delta file.
+    """
+    backend = config["TAXONOMY_BACKEND"]
+    if backend in ("redis", "auto"):
+        client = ping_redis(config["REDIS_URL"])
+        if client is not None:
+            return RedisTaxonomyLog(client)
+        if backend == "redis":
+            logging.warning("Falling back to the taxonomy delta file")
+    return FileTaxonomyLog(config["TAXONOMY_LOG_PATH"])
+class TaxonomyManager:
+    """Live skill taxonomy: a base skills file plus versioned deltas, hot-swapped without restarts
+
+    Every add, remove or alias is appended to a shared delta log and applied
+    to a path-copied SkillTrie, so the trie in use is never modified. A
+    background thread in each worker follows the log and the base files. It
+    builds the new trie, its scanner and fingerprint off the request path,
+    then publishes it with a single reference assignment. Requests read
+    `trie` without a lock and keep whichever version they started with. A
+    changed base file is reloaded and the whole log replayed on top of it,
+    also in the background; if it fails to load, the current taxonomy stays.
+    """
+    def __init__(self, log, load_base: Callable, base_paths=(), poll_interval: float = 2.0,
+                 on_swap: Optional[Callable] = None):
+        self.log = log
+        self.load_base = load_base
+        self.base_paths = [path for path in base_paths if path]
+        self.poll_interval = poll_interval
+        self.on_swap = on_swap
+        self.trie = None
+        self.version = 0
+        self.base_error = None
+        self.swaps = 0
+        self.last_swap_seconds = None
+        self._base_signature = None
+        self._update_lock = threading.Lock()
+        self._watcher = None
+        self._watcher_pid = None
+        self._stop = threading.Event()
+        self.refresh(reload_base=True)
+    @classmethod
+    def from_config(cls, config, load_base, on_swap=None):
+        return cls(
+            create_taxonomy_log(config),
+            load_base,
+            base_paths=(config["SKILLS_FILE"], config["SKILL_TRIE_SNAPSHOT"]),
+            poll_interval=config["TAXONOMY_POLL_INTERVAL"],
+            on_swap=on_swap
+        )
+    def _signature(self):
+        """Size and modification time of the base files, to notice when they are edited"""
+        signature = []
+        for path in self.base_paths:
+            try:
+                stat = os.stat(path)
+                signature.append((path, stat.st_size, stat.st_mtime_ns))
+            except OSError:
+                signature.append((path, None, None))
+        return tuple(signature)
+    def _base_trie(self):
+        """Freshly loaded base taxonomy, or None if it failed and a taxonomy is already live"""
+        try:
+            base = self.load_base()
+            self.base_error = None
+            return base
+        except Exception as e:
+            self.base_error = str(e)
+            if self.trie is not None:
+                logging.error(f"Could not reload the skill taxonomy, keeping version {self.version}: {e}")
+                return None
+            logging.error(f"Could not load the skill taxonomy, starting from {len(DEFAULT_SKILLS)} default skills: {e}")
+            base = SkillTrie()
+            for skill in DEFAULT_SKILLS:
+                base.insert(skill)
+            return base
+    def submit(self, changes: List[Dict]) -> Dict:
+        """Validate, log and apply one delta; every other worker picks it up from the log
+
+        Validation runs under the update lock against the trie caught up with
+        the log, and the delta is logged only if no other worker logged one
+        since; otherwise it is validated again against the newer taxonomy.
+        """
+        for _ in range(SUBMIT_ATTEMPTS):
+            with self._update_lock:
+                caught_up = self._apply_deltas()
+                delta = self.log.append(normalize_changes(changes, self.trie), expected_version=self.version)
+                applied = self._apply_deltas() if delta is not None else None
+            for trie in (caught_up, applied):
+                if trie is not None:
+                    self._publish(trie)
+            if delta is not None:
+                return delta
+        raise ConcurrentChange("The skill taxonomy kept changing while this change was validated; retry")
+    def refresh(self, reload_base: bool = False) -> bool:
+        """Apply deltas logged since the live version, or rebuild from the base; returns whether it swapped"""
+        with self._update_lock:
+            trie = self._apply_deltas(reload_base)
+        if trie is None:
+            return False
+        self._publish(trie)
+        return True
+    def _apply_deltas(self, reload_base: bool = False) -> Optional[SkillTrie]:
+        """Swap in the trie with new deltas applied, or rebuilt from the base; the caller holds the update lock"""
+        start = time.perf_counter()
+        if reload_base:
+            signature = self._signature()
+            base = self._base_trie()
+            if base is None:
+                self._base_signature = signature
+                return None
+            deltas = self.log.read(0)
+            trie = base.with_changes(trie_changes(deltas)) if deltas else base
+            self._base_signature = signature
+        else:
+            deltas = self.log.read(self.version)
+            if not deltas:
+                return None
+            trie = self.trie.with_changes(trie_changes(deltas))
+        version = deltas[-1]['version'] if deltas else 0
+        # Build what requests would otherwise build on first use, before anyone sees the trie
+        trie.scanner()
+        trie.fingerprint()
+        self.trie = trie
+        self.version = version
+        self.swaps += 1
+        self.last_swap_seconds = round(time.perf_counter() - start, 4)
+        return trie
+    def _publish(self, trie) -> None:
+        logging.info(f"Skill taxonomy version {self.version}: {trie.skill_count} skills in {self.last_swap_seconds}s")
+        if self.on_swap is not None:
+            try:
+                self.on_swap(trie)
+            except Exception as e:
+                logging.error(f"Error publishing skill taxonomy: {e}")
+    def ensure_watching(self) -> None:
+        """Start this process's watcher thread; threads do not survive a fork, so check the pid"""
+        if self.poll_interval <= 0 or (self._watcher_pid == os.getpid() and self._watcher.is_alive()):
+            return
+        with self._update_lock:
+            if self._watcher_pid == os.getpid() and self._watcher.is_alive():
+                return
+            self._stop.clear()
+            self._watcher = threading.Thread(target=self._watch, name="taxonomy-watcher", daemon=True)
+            self._watcher_pid = os.getpid()
+            self._watcher.start()
+    def _watch(self):
+        while not self._stop.is_set():
+            try:
+                self.log.wait(self.poll_interval)
+                if self._stop.is_set():
+                    break
+                self.refresh(reload_base=self._signature() != self._base_signature)
+            except Exception as e:
+                logging.error(f"Error following the skill taxonomy: {e}")
+                self._stop.wait(self.poll_interval)
+    def stop(self) -> None:
+        self._stop.set()
+    def stats(self) -> Dict:
+        return {
+            'version': self.version,
+            'skills': self.trie.skill_count,
+            'fingerprint': self.trie.fingerprint(),
+            'backend': self.log.name,
+            'base_files': self.base_paths,
+            'base_error': self.base_error,
+            'swaps': self.swaps,
+            'last_swap_seconds': self.last_swap_seconds,
+            'watching': self._watcher_pid == os.getpid() and self._watcher.is_alive()
+        }
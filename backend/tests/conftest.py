@@ -0,0 +1,37 @@
+import os
+import sys
+import pytest
+BACKEND = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND)
+from app import create_app
+@pytest.fixture
+def app(tmp_path):
+    """The Flask app on local, in-process backends: no MongoDB, Redis or spaCy model needed"""
+    app = create_app()
+    app.config.update(
+        SKILLS_FILE=os.path.join(BACKEND, "data", "skills.json"),
+        SKILL_TRIE_SNAPSHOT="",
+        TAXONOMY_BACKEND="file",
+        TAXONOMY_LOG_PATH=str(tmp_path / "taxonomy_deltas.jsonl"),
+        TAXONOMY_POLL_INTERVAL=0,
+        NLP_BACKEND="simple",
+        TFIDF_MODEL_PATH=str(tmp_path / "tfidf"),
+        VECTOR_INDEX_PATH=str(tmp_path / "vectors"),
+        EXTRACTION_CACHE_BACKEND="memory",
+        RESUME_STORE="sqlite",
+        RESUME_STORE_PATH=":memory:",
+        JOB_STORE_PATH=":memory:",
+        SKILL_INDEX_PATH=str(tmp_path / "skill_index.db"),
+        INGEST_BACKEND="thread",
+        INGEST_WORKERS=1,
+        INGEST_JOB_STORE="memory",
+        UPLOAD_FOLDER=str(tmp_path),
+        PROFILE_ENABLED=False
+    )
+    yield app
+    if app.models.is_loaded("ingestion_queue"):
+        app.ingestion_queue.shutdown()
+    app.extraction_pool.shutdown()
+@pytest.fixture
+def client(app):
+    return app.test_client()
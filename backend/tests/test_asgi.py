@@ -0,0 +1,60 @@
+import asyncio
+import json
+from asgi import AsyncResumeAI
+RESUME = {
+    "text": "Experience\n2016 - 2022 Python developer using Django and Docker\nEducation\nBachelor of Science\nSkills",
+    "skills": ["Python", "Django", "Docker"],
+    "experience": ["2016 - 2022 Python developer"],
+    "education": ["Bachelor of Science"]
+}
+JOB = "Backend engineer with 3+ years of Python, Django and PostgreSQL. Bachelor's degree."
+async def call(asgi_app, method, path, body=b"", headers=(), chunks=1):
+    """ASGI messages sent back for one request, its body sent in `chunks` messages"""
+    size = -(-len(body) // chunks) if body else 0
+    parts = [body[start:start + size] for start in range(0, len(body), size)] if body else [b""]
+    messages = [{"type": "http.request", "body": part, "more_body": index < len(parts) - 1}
+                for index, part in enumerate(parts)]
+    sent = []
+    async def receive():
+        return messages.pop(0) if messages else {"type": "http.disconnect"}
+    async def send(message):
+        sent.append(message)
+    scope = {
+        "type": "http", "method": method, "path": path, "query_string": b"", "http_version": "1.1",
+        "headers": [(name.encode(), value.encode()) for name, value in headers]
+    }
+    await asgi_app(scope, receive, send)
+    return sent
+def response_of(sent):
+    start = sent[0]
+    body = b"".join(message.get("body", b"") for message in sent[1:])
+    assert not sent[-1].get("more_body", False)
+    return start["status"], dict(start["headers"]), body
+def test_streamed_responses_survive_concurrent_requests(app):
+    asgi_app = AsyncResumeAI(app, max_threads=4, max_pending=64)
+    resumes = [dict(RESUME, id=f"resume-{index}") for index in range(40)]
+    payload = json.dumps({"jobs": [{"id": f"job-{index}", "description": JOB} for index in range(5)],
+                          "resumes": resumes, "top_k": 40}).encode()
+    headers = [("content-type", "application/json"), ("content-length", str(len(payload)))]
+    async def requests():
+        return await asyncio.gather(*(call(asgi_app, "POST", "/api/score/matrix", payload, headers) for _ in range(10)))
+    try:
+        results = asyncio.run(requests())
+    finally:
+        asgi_app.shutdown()
+    for sent in results:
+        status, _, body = response_of(sent)
+        assert status == 200
+        rows = [json.loads(line) for line in body.decode().splitlines()]
+        assert len(rows) == 5 * 40
+def test_chunked_request_body(app):
+    asgi_app = AsyncResumeAI(app, max_threads=2)
+    payload = json.dumps({"resume_data": RESUME, "job_description": JOB}).encode()
+    headers = [("content-type", "application/json"), ("transfer-encoding", "chunked")]
+    try:
+        sent = asyncio.run(call(asgi_app, "POST", "/api/score", payload, headers, chunks=3))
+    finally:
+        asgi_app.shutdown()
+    status, _, body = response_of(sent)
+    assert status == 200
+    assert json.loads(body)["ats_score"]["total_score"] > 0
@@ -0,0 +1,50 @@
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+import pytest
+from algorithms.sections import iter_sections
+from benchmarks.corpus import make_pdf
+from services import extraction_pool
+from services.extraction_pool import ExtractionPool, ExtractionTimeout
+from services.file_service import FileService
+PAGES = [["Jane Doe", "Experience", "Python developer"], [], ["Education", "Bachelor of Science"], [],
+         ["Skills", "Python, Docker"]]
+def test_pooled_lines_number_pages_like_iter_lines():
+    data = make_pdf(PAGES)
+    pool = ExtractionPool(max_workers=1, pages_per_chunk=3, parallel_min_pages=2)
+    try:
+        pooled = list(pool.extract_lines(data, "pdf"))
+    finally:
+        pool.shutdown()
+    streamed = list(FileService.iter_lines(data, "pdf"))
+    assert pooled == streamed
+    assert [line.page for line in pooled] == [0, 0, 0, 2, 2, 4, 4]
+    assert [(section.name, section.page) for section in iter_sections(pooled)] == [
+        ("contact", 0), ("experience", 0), ("education", 2), ("skills", 4)
+    ]
+def test_blank_pages_do_not_change_extracted_text():
+    data = make_pdf(PAGES)
+    assert FileService.extract_pdf_pages(data, 0, 5)[1] == ""
+    pool = ExtractionPool(max_workers=1, pages_per_chunk=3, parallel_min_pages=2)
+    try:
+        assert pool.extract_text(data, "pdf") == FileService.extract_text(data, "pdf")
+    finally:
+        pool.shutdown()
+    assert "Bachelor of Science" in FileService.extract_text(data, "pdf")
+def test_timeout_recycles_a_pool_with_running_ranges(monkeypatch):
+    # A thread pool stands in for the process pool, so the ranges can be held running
+    release = threading.Event()
+    monkeypatch.setattr(extraction_pool, "_extract_page_range", lambda *args: release.wait() and [])
+    data = make_pdf(PAGES)
+    pool = ExtractionPool(max_workers=1, pages_per_chunk=2, parallel_min_pages=2, timeout=0.2)
+    for extract in (pool.extract_text, lambda *args: list(pool.extract_lines(*args))):
+        executor = pool._executor = ThreadPoolExecutor(max_workers=1)
+        pool._executor_pid = os.getpid()
+        try:
+            with pytest.raises(ExtractionTimeout):
+                extract(data, "pdf")
+            assert pool._executor is None
+        finally:
+            release.set()
+            executor.shutdown(wait=True)
+            release.clear()
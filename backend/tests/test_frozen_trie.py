@@ -0,0 +1,32 @@
+import random
+from benchmarks.harness import synthetic_skills, typo
+from data_structures.frozen_trie import FrozenSkillTrie
+from data_structures.skill_trie import SkillTrie
+def build():
+    trie = SkillTrie()
+    for index, skill in enumerate(synthetic_skills(500, seed=3)):
+        trie.insert(skill, {"category": f"group{index % 5}"} if index % 3 else None)
+    trie.insert("C++", {"category": "programming"})
+    trie.insert("py", {"alias_of": "python"})
+    return trie
+def test_frozen_snapshot_answers_like_the_live_trie(tmp_path):
+    trie = build()
+    path = tmp_path / "skills.trie"
+    FrozenSkillTrie.save(trie, str(path))
+    rng = random.Random(0)
+    skills = trie.get_all_skills()
+    queries = [rng.choice(skills) if rng.random() < 0.5 else typo(rng.choice(skills), rng) for _ in range(200)]
+    text = " and ".join(queries) + ", C++ / py."
+    for frozen in (FrozenSkillTrie.freeze(trie), FrozenSkillTrie.load(str(path))):
+        assert frozen.get_all_skills() == skills
+        assert list(frozen.iter_skills()) == list(trie.iter_skills())
+        assert frozen.fingerprint() == trie.fingerprint()
+        for query in queries:
+            assert frozen.search(query) == trie.search(query)
+            assert frozen.get_metadata(query) == trie.get_metadata(query)
+            for max_distance, top_k in ((0, 5), (1, 1), (2, 5), (3, 20)):
+                assert (frozen.fuzzy_search(query, max_distance, top_k) ==
+                        trie.fuzzy_search(query, max_distance, top_k))
+        assert frozen.scanner().scan(text) == trie.scanner().scan(text)
+        assert frozen.scanner().find_skills(text) == trie.scanner().find_skills(text)
+        assert frozen.fuzzy_search("", 2, 5) == trie.fuzzy_search("", 2, 5)
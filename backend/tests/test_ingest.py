@@ -0,0 +1,38 @@
+import io
+import time
+import zipfile
+def archive(count, size):
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w", zipfile.ZIP_DEFLATED) as zf:
+        for index in range(count):
+            zf.writestr(f"resume-{index}.txt", b"Python developer " * (size // 17))
+    return buffer.getvalue()
+def test_archives_count_by_unpacked_size(app, client):
+    app.config["INGEST_MAX_CONTENT_LENGTH"] = 20000
+    data = archive(3, 8000)
+    assert len(data) < 2000
+    response = client.post("/api/ingest", data={"files": (io.BytesIO(data), "resumes.zip")})
+    assert response.status_code == 413
+    response = client.post("/api/ingest", data={"files": (io.BytesIO(archive(2, 8000)), "resumes.zip")})
+    assert response.status_code == 202
+    assert response.get_json()["total"] == 2
+def test_limit_spans_every_uploaded_file(app, client):
+    app.config["INGEST_MAX_CONTENT_LENGTH"] = 20000
+    files = [(io.BytesIO(archive(2, 8000)), "first.zip"), (io.BytesIO(b"x" * 8000), "second.txt")]
+    assert client.post("/api/ingest", data={"files": files}).status_code == 413
+def test_corrupt_member_fails_only_that_file(client):
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w", zipfile.ZIP_STORED) as zf:
+        zf.writestr("good.txt", b"Python developer")
+        zf.writestr("bad.txt", b"Django developer")
+    data = buffer.getvalue().replace(b"Django developer", b"Django develop3r")
+    response = client.post("/api/ingest", data={"files": (io.BytesIO(data), "resumes.zip")})
+    assert response.status_code == 202
+    job_id = response.get_json()["job_id"]
+    for _ in range(100):
+        job = client.get(f"/api/jobs/{job_id}").get_json()
+        if job["queued"] == 0:
+            break
+        time.sleep(0.05)
+    statuses = {record["filename"]: (record["status"], record.get("error")) for record in job["files"]}
+    assert statuses == {"good.txt": ("completed", None), "bad.txt": ("failed", "Corrupt archive member")}
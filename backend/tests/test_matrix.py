@@ -0,0 +1,29 @@
+import json
+from services.resume_store import resume_document
+JOB = "Backend engineer with 3+ years of Python, Django and PostgreSQL. Bachelor's degree."
+ENTITIES = {"SKILL": ["Python", "Django"], "EDUCATION": ["Bachelor of Science"], "EXPERIENCE": ["2016 - 2022 Python developer"]}
+def store_resumes(app, count):
+    app.resume_store.add_many([
+        resume_document(f"resume-{index}", f"resume-{index}.txt", f"Python developer {index}", ENTITIES, f"hash-{index}")
+        for index in range(count)
+    ])
+def test_stored_resumes_are_read_block_by_block(app, client):
+    app.config["MATRIX_BLOCK_SIZE"] = 2
+    store_resumes(app, 5)
+    reads = []
+    get_many = app.resume_store.get_many
+    app.resume_store.get_many = lambda ids, fields=None: reads.append((len(ids), fields)) or get_many(ids, fields)
+    resume_ids = [f"resume-{index}" for index in range(5)] + ["unknown", "resume-0"]
+    response = client.post("/api/score/matrix", json={"jobs": [{"id": "job", "description": JOB}],
+                                                      "resume_ids": resume_ids, "top_k": 10})
+    assert response.status_code == 200
+    assert response.headers["X-Missing-Resumes"] == "1"
+    rows = [json.loads(line) for line in response.get_data(as_text=True).splitlines()]
+    assert sorted(row["resume_id"] for row in rows) == [f"resume-{index}" for index in range(5)]
+    assert reads[0] == (6, ())
+    assert all(size <= 2 and fields for size, fields in reads[1:]) and len(reads) == 4
+def test_invalid_limits_are_rejected(client):
+    for limits in ({"top_k": "ten"}, {"top_k": 0}, {"top_k": 2.5}, {"per_candidate": -1}, {"per_candidate": True}):
+        response = client.post("/api/score/matrix", json={"jobs": [{"description": JOB}],
+                                                          "resumes": [{"text": JOB, "skills": ["Python"]}], **limits})
+        assert response.status_code == 400, limits
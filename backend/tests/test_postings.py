@@ -0,0 +1,37 @@
+JOB = "Backend engineer with 3+ years of Python, Django and PostgreSQL. Bachelor's degree."
+RESUME = {
+    "text": "Experience\n2016 - 2022 Python developer using Django and Docker\nEducation\nBachelor of Science\nSkills",
+    "skills": ["Python", "Django", "Docker"],
+    "experience": ["2016 - 2022 Python developer"],
+    "education": ["Bachelor of Science"]
+}
+def test_registered_posting_is_scored_by_id(client):
+    response = client.post("/api/postings", json={"id": "backend-1", "title": "Backend", "description": JOB})
+    assert response.status_code == 201
+    assert response.get_json()["job_id"] == "backend-1"
+    profile = client.get("/api/postings/backend-1/profile").get_json()
+    assert profile["min_experience"] == 3 and "python" in [skill.lower() for skill in profile["skills"]]
+    assert [posting["job_id"] for posting in client.get("/api/postings").get_json()["jobs"]] == ["backend-1"]
+    score = client.post("/api/score", json={"resume_data": RESUME, "job_id": "backend-1"})
+    assert score.status_code == 200
+    assert client.post("/api/score", json={"resume_data": RESUME, "job_id": "unknown"}).status_code == 404
+def test_postings_do_not_shadow_ingestion_or_stats(client):
+    client.post("/api/postings", json={"id": "backend-1", "description": JOB})
+    assert client.get("/api/jobs/backend-1").status_code == 404
+    assert "hits" in client.get("/api/postings/stats").get_json()
+    for job_id in ("stats", "a/b"):
+        response = client.post("/api/postings", json={"id": job_id, "description": JOB})
+        assert response.status_code == 400
+def test_scoring_by_id_reads_the_store_once(app, client):
+    client.post("/api/postings", json={"id": "backend-1", "description": JOB, "min_experience": 1})
+    store = app.job_profiles.store
+    reads = []
+    original = store.get
+    store.get = lambda *args, **kwargs: reads.append(args) or original(*args, **kwargs)
+    app.job_profiles.postings.discard("backend-1")
+    for _ in range(3):
+        assert app.job_profiles.get("backend-1").min_experience == 1
+    assert len(reads) == 1
+    client.post("/api/postings", json={"id": "backend-1", "description": JOB, "min_experience": 5})
+    assert app.job_profiles.get("backend-1").min_experience == 5
+    assert len(reads) == 1
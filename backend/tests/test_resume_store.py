@@ -0,0 +1,76 @@
+import io
+from services import mongo_service
+from services.job_store import MongoJobStore
+from services.resume_store import SCORING_FIELDS, MongoResumeStore, SQLiteResumeStore, resume_document
+JOB = "Backend engineer with 3+ years of Python, Django and PostgreSQL. Bachelor's degree."
+RESUME = b"Jane Doe\njane@example.com\nExperience\n2016 - 2022 Python developer using Django and Docker\nEducation\nBachelor of Science\n"
+ENTITIES = {"SKILL": ["Python"], "EDUCATION": ["Bachelor of Science"], "EXPERIENCE": ["2016 - 2022 Python developer"],
+            "PERSON": ["Jane Doe"], "EMAIL": ["jane@example.com"]}
+def upload(client, data=RESUME, filename="resume.txt"):
+    response = client.post("/api/upload", data={"resume": (io.BytesIO(data), filename)})
+    assert response.status_code == 200
+    return response.get_json()
+def test_uploaded_resume_is_scored_by_id(client):
+    uploaded = upload(client)
+    assert uploaded["stored"]
+    stored = client.get(f"/api/resumes/{uploaded['resume_id']}").get_json()
+    assert stored["text"] and stored["entities"] == uploaded["entities"]
+    by_id = client.post("/api/score", json={"resume_id": uploaded["resume_id"], "job_description": JOB})
+    assert by_id.status_code == 200
+    resume_data = {"text": stored["text"], "skills": stored["entities"]["SKILL"],
+                   "experience": stored["entities"]["EXPERIENCE"], "education": stored["entities"]["EDUCATION"]}
+    inline = client.post("/api/score", json={"resume_data": resume_data, "job_description": JOB})
+    assert by_id.get_json()["ats_score"]["total_score"] == inline.get_json()["ats_score"]["total_score"]
+    assert client.post("/api/score", json={"resume_id": "unknown", "job_description": JOB}).status_code == 404
+def test_batch_ranks_stored_resumes_and_reports_missing(client):
+    first = upload(client)["resume_id"]
+    second = upload(client, RESUME.replace(b"Django", b"Rust"))["resume_id"]
+    inline = {"id": "inline", "text": "Python", "skills": ["Python"], "experience": [], "education": []}
+    response = client.post("/api/score/batch", json={
+        "resumes": [inline], "resume_ids": [first, "unknown", second], "job_description": JOB
+    })
+    assert response.status_code == 200
+    result = response.get_json()
+    assert result["total"] == 3 and result["missing"] == ["unknown"]
+    assert {ranking["resume_id"] for ranking in result["rankings"]} == {"inline", first, second}
+    assert client.post("/api/score/batch", json={"resume_ids": "unknown", "job_description": JOB}).status_code == 400
+def test_get_many_projects_fields():
+    store = SQLiteResumeStore(":memory:")
+    store.add_many([resume_document(f"resume-{index}", "resume.txt", f"text {index}", ENTITIES, f"hash-{index}")
+                    for index in range(3)])
+    documents = store.get_many(["resume-0", "resume-2", "unknown"], SCORING_FIELDS)
+    assert sorted(documents) == ["resume-0", "resume-2"]
+    assert documents["resume-2"] == {
+        "resume_id": "resume-2",
+        "text": "text 2",
+        "entities": {"SKILL": ["Python"], "EDUCATION": ["Bachelor of Science"],
+                     "EXPERIENCE": ["2016 - 2022 Python developer"]}
+    }
+    assert store.get_many(["resume-1"], ("entities.EMAIL",)) == {
+        "resume-1": {"resume_id": "resume-1", "entities": {"EMAIL": ["jane@example.com"]}}
+    }
+    assert store.get_many(["resume-1"], ())["resume-1"] == {"resume_id": "resume-1"}
+    assert set(store.get("resume-1")) == {"resume_id", "filename", "content_hash", "text", "entities", "created_at"}
+class FakeClient:
+    def __init__(self, uri, **settings):
+        self.collections = {}
+    def get_default_database(self, default=None):
+        return self
+    def __getitem__(self, name):
+        return self.collections.setdefault(name, FakeCollection(self))
+class FakeCollection:
+    def __init__(self, client):
+        self.client = client
+    def create_index(self, key):
+        pass
+def test_mongo_stores_use_the_client_of_the_current_process(monkeypatch):
+    monkeypatch.setattr(mongo_service, "MongoClient", FakeClient)
+    monkeypatch.setattr(mongo_service, "_clients", {})
+    resumes = MongoResumeStore("mongodb://fork-test/resume_ai", "resumes")
+    jobs = MongoJobStore("mongodb://fork-test/resume_ai", "jobs")
+    parent = resumes.collection.client
+    assert jobs.collection.client is parent
+    # A preloading master builds the stores; the forked worker must not reuse its client
+    monkeypatch.setattr(mongo_service.os, "getpid", lambda: -1)
+    assert resumes.collection.client is not parent
+    assert jobs.collection.client is resumes.collection.client
@@ -0,0 +1,37 @@
+import random
+from algorithms.ats_scorer import ATSScorer
+from algorithms.tfidf_model import TfidfModel
+from benchmarks.bench_scoring_engine import synthetic_resumes
+from benchmarks.harness import synthetic_skills
+JOB = "Backend engineer with 3+ years of Python, Django and PostgreSQL. Bachelor's degree."
+RESUMES = [
+    {"id": f"resume-{index}", "text": f"Python developer {index}", "skills": ["Python", "Django"][:index % 2 + 1],
+     "experience": [], "education": []}
+    for index in range(4)
+]
+def test_batch_top_k(client):
+    response = client.post("/api/score/batch", json={"resumes": RESUMES, "job_description": JOB, "top_k": 2})
+    assert response.status_code == 200
+    assert len(response.get_json()["rankings"]) == 2
+    response = client.post("/api/score/batch", json={"resumes": RESUMES, "job_description": JOB})
+    assert len(response.get_json()["rankings"]) == 4
+    for top_k in ("2", 0, -1, 1.5, True):
+        response = client.post("/api/score/batch", json={"resumes": RESUMES, "job_description": JOB, "top_k": top_k})
+        assert response.status_code == 400, top_k
+def test_rank_many_matches_scoring_each_resume():
+    rng = random.Random(5)
+    skills = [skill.title() if rng.random() < 0.2 else skill for skill in synthetic_skills(200, seed=5)]
+    resumes = synthetic_resumes(60, skills, rng)
+    # Fields the engine cannot reduce to features are scored one by one
+    resumes.append({"id": "malformed", "text": "Python", "skills": "Python", "experience": None, "education": []})
+    job_data = {"description": " ".join(skills[:30]), "skills": rng.sample(skills, 8), "min_experience": 5,
+                "required_education": ["bachelor", "degree"]}
+    model = TfidfModel.fit([resume["text"] for resume in resumes], min_df=1)
+    for scorer in (ATSScorer(), ATSScorer(model)):
+        rankings = scorer.rank_many(resumes, job_data)
+        assert [ranking["rank"] for ranking in rankings] == list(range(1, len(resumes) + 1))
+        for ranking in rankings:
+            resume = resumes[ranking.pop("index")]
+            assert ranking.pop("resume_id") == resume["id"]
+            del ranking["rank"]
+            assert ranking == scorer.calculate_ats_score(resume, job_data)
@@ -0,0 +1,22 @@
+from algorithms.tfidf_model import TfidfModel
+from algorithms.vector_index import VectorIndex
+DOCUMENTS = [f"{skill} developer with {other} and {tool} experience" for skill in ("python", "java", "go", "rust")
+             for other in ("django", "spring", "docker") for tool in ("aws", "kubernetes", "linux")]
+def test_candidate_search_rejects_bad_input(app, client):
+    app.skill_index.add("resume-1", ["python", "django"])
+    response = client.post("/api/candidates/search", json={"skills": ["python"], "top_k": 5})
+    assert response.status_code == 200
+    assert [candidate["resume_id"] for candidate in response.get_json()["candidates"]] == ["resume-1"]
+    for body in ({"skills": "python"}, {"skills": ["python"], "required_skills": "django"},
+                 {"skills": ["python"], "top_k": "ten"}, {"skills": ["python"], "top_k": 0}):
+        assert client.post("/api/candidates/search", json=body).status_code == 400, body
+def test_semantic_search_validates_limits(app, client):
+    tfidf_model = TfidfModel.fit(DOCUMENTS, min_df=1)
+    index = VectorIndex.build(tfidf_model, DOCUMENTS, [f"resume-{i}" for i in range(len(DOCUMENTS))], dims=8, lists=4)
+    app.models.set("tfidf_model", tfidf_model)
+    app.models.set("vector_index", index)
+    response = client.post("/api/search", json={"query": "python django aws", "top_k": 3, "nprobe": 1000})
+    assert response.status_code == 200
+    assert len(response.get_json()["results"]) == 3
+    for limits in ({"top_k": "ten"}, {"top_k": 0}, {"nprobe": -1}, {"nprobe": 0}, {"nprobe": "all"}):
+        assert client.post("/api/search", json={"query": "python", **limits}).status_code == 400, limits
@@ -0,0 +1,23 @@
+import spacy
+from algorithms.sections import Line, iter_sections, route_sections
+from data_structures.skill_trie import SkillTrie
+from services import nlp_service
+from services.nlp_service import NLPService
+def routed(text):
+    return route_sections(iter_sections(Line(0, line) for line in text.split("\n")))
+def service():
+    # A blank pipeline stands in for the spaCy model; education is found by keyword either way
+    nlp_service._pipelines.setdefault("blank-en", spacy.blank("en"))
+    skill_trie = SkillTrie()
+    skill_trie.insert("python", {"category": "language"})
+    return NLPService(skill_trie, model_name="blank-en")
+def test_certifications_do_not_replace_education_found_elsewhere():
+    text = "Jane Doe\nExperience\nPython developer 2016 - 2022\nBachelor of Science State University\nCertifications\nAWS Certified Developer"
+    sections = routed(text)
+    assert sections["sections"] == ["contact", "experience", "certifications"]
+    education = service().extract_entities_from_sections(sections)["EDUCATION"]
+    assert education == ["Bachelor of Science State University"]
+def test_education_section_is_used_when_present():
+    text = "Jane Doe\nSummary\nGraduate of a coding school\nEducation\nMaster of Science State University\nCertifications\nDiploma in Cloud Computing"
+    education = service().extract_entities_from_sections(routed(text))["EDUCATION"]
+    assert education == ["Master of Science State University", "Diploma in Cloud Computing"]
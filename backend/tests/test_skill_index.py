@@ -0,0 +1,48 @@
+import random
+from services.skill_index import SkillIndex
+SKILLS = [f"skill{index}" for index in range(40)]
+def category_of(skill):
+    return f"group{int(skill[5:]) % 4}"
+def build(path, delta_limit):
+    rng = random.Random(0)
+    index = SkillIndex(str(path), category_of, delta_limit=delta_limit)
+    for number in range(300):
+        index.add(f"resume-{number}", rng.sample(SKILLS, rng.randint(1, 6)))
+        if number % 37 == 0:
+            index.remove(f"resume-{number // 2}")
+    return index
+def queries():
+    rng = random.Random(1)
+    return [(rng.sample(SKILLS, 5), rng.sample(SKILLS, rng.randint(0, 1))) for _ in range(30)]
+def test_delta_reads_match_merged_postings(tmp_path):
+    appended = build(tmp_path / "appended.db", delta_limit=10 ** 9)
+    merged = build(tmp_path / "merged.db", delta_limit=50)
+    assert appended.stats()["terms"] == 0 and appended.stats()["delta_rows"] > 0
+    assert merged.stats()["delta_rows"] < 50
+    results = [appended.search(skills, required=required, top_k=10) for skills, required in queries()]
+    assert results == [merged.search(skills, required=required, top_k=10) for skills, required in queries()]
+    appended.compact()
+    merged.compact()
+    assert appended.stats()["delta_rows"] == 0
+    for skill in SKILLS:
+        assert appended.postings(skill).tolist() == merged.postings(skill).tolist()
+    # Deleted documents no longer count towards document frequencies, on both
+    assert ([appended.search(skills, required=required, top_k=10) for skills, required in queries()] ==
+            [merged.search(skills, required=required, top_k=10) for skills, required in queries()])
+def test_add_after_compact_extends_postings(tmp_path):
+    index = SkillIndex(str(tmp_path / "index.db"), category_of, delta_limit=10 ** 9)
+    first = index.add("a", ["skill1", "skill2"])
+    index.compact()
+    second = index.add("b", ["Skill1 "])
+    assert index.postings("skill1").tolist() == [first, second]
+    assert index.postings("category:group1").tolist() == [first, second]
+    assert [result["resume_id"] for result in index.search(["skill1"], required=["skill2"])] == ["a"]
+def test_ties_rank_older_documents_first(tmp_path):
+    index = SkillIndex(str(tmp_path / "index.db"), category_of)
+    for name in ("a", "b", "c", "d"):
+        index.add(name, ["skill1", "skill2"])
+    index.add("e", ["skill1"])
+    index.remove("b")
+    assert [result["resume_id"] for result in index.search(["skill1", "skill2"], top_k=2)] == ["a", "c"]
+    assert [result["resume_id"] for result in index.search(["skill1", "skill3"])] == ["a", "c", "d", "e"]
+    assert index.search(["skill1"], required=["skill3"]) == []
@@ -0,0 +1,36 @@
+import random
+from benchmarks.harness import synthetic_skills
+from data_structures.skill_scanner import SkillMatch, SkillScanner, is_word_char
+from data_structures.skill_trie import SkillTrie
+def naive_scan(skill_trie, text):
+    """Every word-bounded occurrence of every skill, found with str.find"""
+    lowered = SkillScanner.normalize(text)
+    matches = []
+    for skill, metadata in skill_trie.iter_skills():
+        alias_of = metadata.get('alias_of') if isinstance(metadata, dict) else None
+        start = lowered.find(skill)
+        while start >= 0:
+            end = start + len(skill)
+            if (start == 0 or not is_word_char(text[start - 1])) and (end == len(text) or not is_word_char(text[end])):
+                matches.append(SkillMatch(alias_of or skill, start, end, metadata))
+            start = lowered.find(skill, start + 1)
+    matches.sort(key=lambda match: (match.start, -match.end))
+    return matches
+def test_scanner_matches_naive_search():
+    trie = SkillTrie()
+    skills = synthetic_skills(300, seed=11)
+    for index, skill in enumerate(skills):
+        trie.insert(skill, {"category": f"group{index % 3}"})
+    # Skills that are prefixes, suffixes and infixes of others, punctuation and an alias
+    for skill in ("c", "c++", "c#", "objective-c", "node.js", "js", "machine learning", "learning", "sql", "nosql"):
+        trie.insert(skill, {"category": "programming"})
+    trie.insert("postgres", {"category": "data", "alias_of": "postgresql"})
+    rng = random.Random(3)
+    words = skills[:60] + ["C++", "c#", "Objective-C", "Node.js", "JS", "Machine\nLearning", "NoSQL", "Postgres",
+                           "xsql", "sql_server", "and", "with", "2019"]
+    scanner = trie.scanner()
+    for _ in range(200):
+        text = rng.choice(["", " ", ", ", "/"]).join(rng.choice(words) + rng.choice(["", ".", ",", " ", "\t", "-"])
+                                                      for _ in range(rng.randint(0, 25)))
+        assert scanner.scan(text) == naive_scan(trie, text), text
+        assert scanner.find_skills(text) == list(dict.fromkeys(match.skill for match in naive_scan(trie, text)))
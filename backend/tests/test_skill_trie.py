@@ -0,0 +1,28 @@
+import random
+from benchmarks.harness import synthetic_skills, typo
+from data_structures.skill_trie import SkillTrie
+def edit_distance(first, second):
+    row = list(range(len(second) + 1))
+    for index, char in enumerate(first, 1):
+        previous, row[0] = row[0], index
+        for column, other in enumerate(second, 1):
+            previous, row[column] = row[column], min(row[column] + 1, row[column - 1] + 1,
+                                                     previous + (char != other))
+    return row[-1]
+def brute_force(distances, max_distance, top_k):
+    """Every skill within max_distance, closest first and in trie order among equals"""
+    ranked = sorted(entry for entry in distances if entry[0] <= max_distance)[:max(top_k, 0)]
+    return [(skill, distance) for distance, _, skill in ranked]
+def test_fuzzy_search_matches_brute_force_edit_distance():
+    trie = SkillTrie()
+    for skill in synthetic_skills(300, seed=7) + ["c", "c++", "c#", "go", "node.js"]:
+        trie.insert(skill)
+    skills = trie.get_all_skills()
+    rng = random.Random(0)
+    terms = [typo(typo(rng.choice(skills), rng), rng) if rng.random() < 0.5 else typo(rng.choice(skills), rng)
+             for _ in range(100)] + ["", "C", "Go", "nodejs", "cpp"]
+    for term in terms:
+        distances = [(edit_distance(term.lower(), skill), order, skill) for order, skill in enumerate(skills)]
+        for max_distance, top_k in ((0, 5), (1, 1), (1, 5), (2, 3), (3, 50), (2, 0), (-1, 5)):
+            assert trie.fuzzy_search(term, max_distance, top_k) == brute_force(distances, max_distance, top_k), \
+                (term, max_distance, top_k)
@@ -0,0 +1,43 @@
+import threading
+import pytest
+from data_structures.skill_trie import SkillTrie
+from services.taxonomy_service import FileTaxonomyLog, InvalidChange, TaxonomyManager
+def base_trie():
+    trie = SkillTrie()
+    for skill in ("python", "javascript"):
+        trie.insert(skill, {"category": "programming"})
+    return trie
+def manager(path):
+    return TaxonomyManager(FileTaxonomyLog(str(path)), base_trie, poll_interval=0)
+def test_changes_need_the_admin_token(app, client):
+    change = {"skill": "rust", "category": "programming"}
+    assert client.post("/api/taxonomy/skills", json=change).status_code == 403
+    app.config["TAXONOMY_ADMIN_TOKEN"] = "secret"
+    assert client.post("/api/taxonomy/skills", json=change, headers={"X-Taxonomy-Token": "wrong"}).status_code == 403
+    assert client.delete("/api/taxonomy/skills/python").status_code == 403
+    response = client.post("/api/taxonomy/skills", json=change, headers={"X-Taxonomy-Token": "secret"})
+    assert response.status_code == 200
+    assert app.taxonomy.trie.search("rust")
+def test_stale_worker_validates_against_the_logged_taxonomy(tmp_path):
+    first, second = manager(tmp_path / "deltas.jsonl"), manager(tmp_path / "deltas.jsonl")
+    first.submit([{"op": "remove", "skill": "javascript"}])
+    # second has not seen the removal yet; its alias must not be logged against the removed skill
+    assert second.version == 0
+    with pytest.raises(InvalidChange):
+        second.submit([{"op": "alias", "skill": "js", "alias_of": "javascript"}])
+    assert second.version == 1 and not second.trie.search("javascript")
+    assert len(second.log.read(0)) == 1
+def test_concurrent_submits_get_distinct_versions(tmp_path):
+    workers = [manager(tmp_path / "deltas.jsonl") for _ in range(4)]
+    threads = [
+        threading.Thread(target=worker.submit, args=([{"op": "add", "skill": f"skill {index}"}],))
+        for index, worker in enumerate(workers * 3)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    deltas = workers[0].log.read(0)
+    assert [delta["version"] for delta in deltas] == list(range(1, 13))
+    workers[0].refresh()
+    assert all(workers[0].trie.search(f"skill {index}") for index in range(12))
@@ -0,0 +1,29 @@
+import random
+import re
+from algorithms.text_patterns import clean_text, contact_info, iter_spans, years_of_experience
+from benchmarks.bench_text_patterns import documents_for, legacy_clean_text, legacy_contact_info, legacy_years
+def test_single_scan_matches_the_separate_passes():
+    documents = documents_for(100, random.Random(0))
+    for document in documents:
+        assert clean_text(document) == legacy_clean_text(document)
+        for line in document.split("\n"):
+            if re.search(r"\d", line):
+                assert years_of_experience(line) == legacy_years(line), line
+        found, legacy = contact_info(document), legacy_contact_info(document)
+        assert found["EMAIL"] == legacy["EMAIL"] and found["LINKEDIN"] == legacy["LINKEDIN"]
+        # Parenthesized numbers after a space are now found as well
+        assert [phone for phone in found["PHONE"] if not phone.startswith("(")] == legacy["PHONE"]
+def test_overlapping_year_spans_count_once():
+    cases = {
+        "2016 - 2021 years": (5, 2026),
+        "2016 to 2021 yrs": (5, 2026),
+        "Engineer 2015-2018, 4 years": (7, 7),
+        "3 years in total, 2010 to 2012": (5, 5),
+        "5yrs": (5, 5),
+        "2012 - 2010": (0, 0),
+    }
+    for text, (years, legacy) in cases.items():
+        assert years_of_experience(text) == years, text
+        assert legacy_years(text) == legacy, text
+    assert [span.kind for span in iter_spans("2016 - 2021 years")] == ["YEAR_RANGE"]
+    assert contact_info("Phone: (555) 123-4567")["PHONE"] == ["(555) 123-4567"]
@@ -55,13 +55,19 @@ function App() {
     setError('');
 
     try {
+      // Stored resumes are scored by id; otherwise send back what the upload returned
+      const resume = resumeData.stored
+        ? { resume_id: resumeData.resume_id }
+        : {
+            resume_data: {
+              text: resumeData.text_preview,
+              skills: resumeData.entities.SKILL || [],
+              experience: resumeData.entities.EXPERIENCE || [],
+              education: resumeData.entities.EDUCATION || [],
+            },
+          };
       const response = await axios.post(`${API_BASE_URL}/score`, {
-        resume_data: {
-          text: resumeData.text_preview,
-          skills: resumeData.entities.SKILL || [],
-          experience: resumeData.entities.EXPERIENCE || [],
-          education: resumeData.entities.EDUCATION || [],
-        },
+        ...resume,
         job_description: jobDescription,
         min_experience: 2,
         required_education: ['bachelor'],